@@ -4,9 +4,14 @@ import logging
 import typing as t
 
 from gladier.base import GladierBaseTool
-from gladier.client import GladierBaseClient, GladierClient
+from gladier.client import AsyncGladierClient, GladierBaseClient, GladierClient
 from gladier.decorators import generate_flow_definition
-from gladier.managers import CallbackLoginManager, FlowsManager, UserAppLoginManager
+from gladier.managers import (
+    AsyncFlowsManager,
+    CallbackLoginManager,
+    FlowsManager,
+    UserAppLoginManager,
+)
 
 from .helpers import JSONList, JSONObject, JSONValue
 from .state_models import (
@@ -23,10 +28,12 @@ _nameables = (
         GladierBaseTool,
         GladierBaseClient,
         GladierClient,
+        AsyncGladierClient,
         generate_flow_definition,
         UserAppLoginManager,
         CallbackLoginManager,
         FlowsManager,
+        AsyncFlowsManager,
         BaseState,
         BaseCompositeState,
         StateWithNextOrEnd,
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import typing as t
 
+import asyncio
+import concurrent.futures
 import logging
 import os
 import pathlib
@@ -9,26 +11,48 @@ from collections.abc import Iterable
 
 import gladier
 import gladier.exc
+import gladier.storage.backends
 import gladier.storage.config
+import gladier.storage.function_cache
+import gladier.storage.gc
+import gladier.storage.profiler
 import gladier.storage.migrations
+import gladier.storage.run_cache
+import gladier.storage.run_index
 import gladier.utils.automate
 import gladier.utils.dynamic_imports
 import gladier.utils.name_generation
 import gladier.utils.tool_alias
+import gladier.utils.transport
 import gladier.version
 from gladier.base import GladierBaseTool
-from gladier.managers import ComputeManager, FlowsManager
+from gladier.managers import AsyncFlowsManager, ComputeManager, FlowsManager
+from gladier.managers.flows_manager import FlowRunResult
 from gladier.managers.login_manager import (
     UserAppLoginManager,
     BaseLoginManager,
     ConfidentialClientLoginManager,
+    logins_disabled,
 )
 from gladier.storage.tokens import GladierSecretsConfig
 
 log = logging.getLogger(__name__)
 
 
-class GladierBaseClient(object):
+class _GladierClientMeta(type):
+    """
+    Start a background flow deployment for clients with ``predeploy_flow`` set, once the
+    client is fully initialized, including any ``__init__`` of a subclass.
+    """
+
+    def __call__(cls, *args, **kwargs):
+        client = super().__call__(*args, **kwargs)
+        if client.predeploy_flow:
+            client.start_predeploy()
+        return client
+
+
+class GladierBaseClient(object, metaclass=_GladierClientMeta):
     """
     The Gladier Client ties together commonly used compute functions
     and basic flows with auto-registration tools to make complex tasks
@@ -83,6 +107,42 @@ class GladierBaseClient(object):
          added to flow_viewers, flow_starters, flow_administrators, run_managers, run_monitors
     * alias_class (default: gladier.utils.tool_alias.StateSuffixVariablePrefix)
        * The default class used to for applying aliases to Tools
+    * storage_backend (default: 'config')
+       * The backend used for storage. Can be 'config' for an INI config file, or 'sqlite'
+         for an SQLite database. Existing config files are automatically migrated when
+         switching to 'sqlite'. 'sharded' keeps one config file per section in a directory.
+         'memory' keeps everything in memory with no disk I/O, and can be exported afterwards
+         with ``client.storage.backend.export()``.
+    * storage_snapshot (default: None)
+       * A dict or JSON string of previously exported storage, used to seed 'memory' storage
+    * auto_collect_storage_garbage (default: False)
+       * Remove stored ids and checksums for compute functions no longer used by any tool,
+         each time new functions are registered. See ``collect_storage_garbage()``.
+    * run_status_cache (default: False)
+       * Keep the status of finished runs in a cache next to storage, so checking them
+         again does not contact the flows service. See
+         :class:`~gladier.storage.run_cache.RunStatusCache`.
+    * index_runs (default: False)
+       * Record each run started in a local index next to storage, which can be searched
+         by tag, label, status or start time with ``find_runs()``. See
+         :class:`~gladier.storage.run_index.RunIndex`.
+    * persist_function_checksums (default: False)
+       * Keep compute function checksums in a cache next to storage, keyed on the
+         identity of each function's code, so functions which have not changed are not
+         serialized again in later processes. Checksums are always cached in memory. See
+         :class:`~gladier.storage.function_cache.FunctionChecksumCache`.
+    * transport_pool_size (default: 10)
+       * The number of connections kept open to each Globus service. A single pooled
+         transport is shared by every service client the Gladier Client creates, so
+         connections are reused between the Flows and Compute services and between runs.
+         Its counters are available from ``client.transport.stats``.
+    * transport_keep_alive (default: True)
+       * Keep connections open between requests. If False, every request makes a new
+         connection.
+    * predeploy_flow (default: False)
+       * Register compute functions and deploy the flow in a background thread as soon as
+         the client is created, so the first ``run_flow()`` only needs to start the run.
+         Logins never happen in the background. See ``start_predeploy()``.
 
     The following Environment variables can be set and are recognized by Gladier Clients:
 
@@ -90,6 +150,8 @@ class GladierBaseClient(object):
         credentials. This is a convenience feature, as an alternative to using a
         custom login_manager
     * GLADIER_CLIENT_SECRET -- Secret used for confidential clients, using with GLADIER_CLIENT_ID
+    * GLADIER_STORAGE_BACKEND -- Overrides the ``storage_backend`` set on the class
+    * GLADIER_STORAGE_SNAPSHOT -- Overrides the ``storage_snapshot`` set on the class
 
     Default options are intended for CLI usage and maximum user convenience.
 
@@ -111,6 +173,15 @@ class GladierBaseClient(object):
     subscription_id: t.Optional[str] = None
     globus_group: t.Optional[str] = None
     alias_class = gladier.utils.tool_alias.StateSuffixVariablePrefix
+    storage_backend: t.Optional[str] = None
+    storage_snapshot: t.Optional[t.Union[dict, str]] = None
+    auto_collect_storage_garbage: bool = False
+    run_status_cache: bool = False
+    index_runs: bool = False
+    predeploy_flow: bool = False
+    persist_function_checksums: bool = False
+    transport_pool_size: int = 10
+    transport_keep_alive: bool = True
     flow_kwargs = None
     run_kwargs = None
 
@@ -123,6 +194,9 @@ class GladierBaseClient(object):
     ):
         self._tools = None
         self.storage = self._determine_storage()
+        self.transport = gladier.utils.transport.PooledTransport(
+            pool_size=self.transport_pool_size, keep_alive=self.transport_keep_alive
+        )
         self.login_manager = login_manager or self._determine_login_manager(
             self.storage
         )
@@ -134,21 +208,118 @@ class GladierBaseClient(object):
             self.flows_manager.globus_group = self.globus_group
         if not self.flows_manager.flow_title:
             self.flows_manager.flow_title = f"{self.__class__.__name__} flow"
+        if self.run_status_cache and self.flows_manager.run_cache is None:
+            self.flows_manager.run_cache = self._determine_run_cache()
+        if self.index_runs and self.flows_manager.run_index is None:
+            self.flows_manager.run_index = self._determine_run_index()
 
         self.compute_manager = compute_manager or ComputeManager(
             auto_registration=auto_registration,
             group=self.globus_group,
         )
+        if (
+            self.persist_function_checksums
+            and self.compute_manager.checksum_cache.filename is None
+        ):
+            self.compute_manager.checksum_cache = self._determine_checksum_cache()
         self.storage.update()
 
         for man in (self.flows_manager, self.compute_manager):
             man.set_storage(self.storage, replace=False)
             man.set_login_manager(self.login_manager, replace=False)
+            man.set_transport(self.transport, replace=False)
             man.register_scopes()
 
+        self._predeploy: t.Optional[concurrent.futures.Future] = None
+
+    def _run_predeploy(self) -> None:
+        with logins_disabled():
+            self.get_input()
+            self.sync_flow()
+            # Authorize the client for running the flow ahead of the first run, unless
+            # a new flow scope needs a login, which is left to the first run.
+            if self.login_manager.is_logged_in():
+                self.flows_manager.specific_flow_client
+
+    def start_predeploy(self) -> concurrent.futures.Future:
+        """
+        Register compute functions and check or deploy the flow in a background thread.
+        Clients with ``predeploy_flow`` set call this once they are created.
+        ``run_flow()`` and ``run_flows()`` wait for this to finish before starting runs.
+
+        Any login needed for the client's current scopes happens here, on the calling
+        thread. Logins are never started in the background, so if deploying a new flow
+        needs one for the new flow scope, it happens on the first run instead. Errors are
+        not raised here, and are instead raised by the first run if they happen again.
+
+        :returns: A future which finishes when the flow is deployed
+        """
+        if self._predeploy is None:
+            try:
+                self.login_manager.get_manager_authorizers()
+            except gladier.exc.AuthException as exc:
+                log.warning(f"Login for background flow deployment failed: {exc}")
+            executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="gladier-predeploy"
+            )
+            self._predeploy = executor.submit(self._run_predeploy)
+            executor.shutdown(wait=False)
+        return self._predeploy
+
+    def wait_for_predeploy(self, timeout: t.Optional[float] = None) -> None:
+        """
+        Wait for a deployment started with ``start_predeploy()``, if one is running.
+        Failures are logged, and left to the caller to retry.
+
+        :param timeout: The longest time in seconds to wait
+        :raises: concurrent.futures.TimeoutError if the timeout is reached
+        """
+        predeploy = self._predeploy
+        if predeploy is None:
+            return
+        if not predeploy.done():
+            log.debug("Waiting for background flow deployment to finish")
+        exc = predeploy.exception(timeout=timeout)
+        if exc is not None:
+            log.warning(f"Background flow deployment failed: {exc}")
+        self._predeploy = None
+
     def _get_confidential_client_credentials(self):
         return os.getenv("GLADIER_CLIENT_ID"), os.getenv("GLADIER_CLIENT_SECRET")
 
+    def _get_storage_database_options(self, suffix: str) -> dict:
+        """
+        Options for a database kept alongside storage, if the storage backend is
+        persistent. Otherwise, the database is only kept in memory.
+        """
+        backend = self.storage.backend
+        if not backend.persistent:
+            return {}
+        filename = pathlib.Path(backend.filename)
+        return {
+            "filename": filename.parent / f"{filename.stem}{suffix}",
+            "permission": GladierSecretsConfig.DEFAULT_PERMISSION,
+        }
+
+    def _determine_run_cache(self):
+        """Determine the cache used for finished runs"""
+        return gladier.storage.run_cache.RunStatusCache(
+            **self._get_storage_database_options(".runs.sqlite")
+        )
+
+    def _determine_run_index(self):
+        """Determine the index used for runs started by this client"""
+        return gladier.storage.run_index.RunIndex(
+            **self._get_storage_database_options(".index.sqlite")
+        )
+
+    def _determine_checksum_cache(self):
+        """Determine the cache used for compute function checksums"""
+        return gladier.storage.function_cache.FunctionChecksumCache(
+            namespace=self.compute_manager.get_checksum_namespace(),
+            **self._get_storage_database_options(".functions.sqlite"),
+        )
+
     def _determine_storage(self):
         """
         Determine the storage location for Gladier. This is typically in the ~/.gladier directory,
@@ -156,16 +327,33 @@ class GladierBaseClient(object):
 
         Setting GLADIER_CLIENT_ID will change the filename to the client id, so that config
         items will not conflict with user details.
+
+        The storage backend is determined by GLADIER_STORAGE_BACKEND, or ``storage_backend``
+        on the class.
         """
         # Storage will automatically change if client credentials are detected.
         CLI_ID, _ = self._get_confidential_client_credentials()
         client_id = CLI_ID or self.client_id
+        backend_cls = gladier.storage.backends.get_backend_class(
+            os.getenv("GLADIER_STORAGE_BACKEND") or self.storage_backend or "config"
+        )
 
         if self.secret_config_filename:
             storage_filename = pathlib.Path(self.secret_config_filename)
         else:
-            storage_filename = pathlib.Path(f"~/.gladier/{client_id}.cfg").expanduser()
-            storage_filename.parent.mkdir(exist_ok=True)
+            storage_filename = pathlib.Path(
+                f"~/.gladier/{client_id}{backend_cls.file_suffix}"
+            ).expanduser()
+            if backend_cls.persistent:
+                storage_filename.parent.mkdir(exist_ok=True)
+
+        if backend_cls.persistent:
+            backend = backend_cls(
+                storage_filename, permission=GladierSecretsConfig.DEFAULT_PERMISSION
+            )
+        else:
+            snapshot = os.getenv("GLADIER_STORAGE_SNAPSHOT") or self.storage_snapshot
+            backend = backend_cls(storage_filename, data=snapshot)
 
         storage_section = gladier.utils.name_generation.get_snake_case(
             self.__class__.__name__
@@ -173,7 +361,10 @@ class GladierBaseClient(object):
         storage_tokens_section = f"tokens_{client_id}"
 
         return GladierSecretsConfig(
-            storage_filename, storage_section, tokens_section=storage_tokens_section
+            storage_filename,
+            storage_section,
+            tokens_section=storage_tokens_section,
+            backend=backend,
         )
 
     def _determine_login_manager(self, storage):
@@ -329,6 +520,7 @@ class GladierBaseClient(object):
             self.flows_manager.flow_schema = schema
         self.flows_manager.sync_flow()
 
+    @gladier.storage.profiler.profiled
     def run_flow(self, flow_input=None, use_defaults=True, **flow_kwargs):
         r"""
         Start a Globus Automate flow. By default, the flow definiton is checked and synced if it
@@ -381,19 +573,85 @@ class GladierBaseClient(object):
         :raises: gladier.exc.AuthException
         :raises: Any globus_sdk.exc.BaseException
         """
-        combine_flow_input = self.get_input() if use_defaults else dict()
+        self.wait_for_predeploy()
+        defaults = self.get_input() if use_defaults else dict()
+        combine_flow_input = self.combine_flow_input(defaults, flow_input)
+        self.sync_flow()
+        return self.flows_manager.run_flow(body=combine_flow_input, **flow_kwargs)
+
+    @gladier.storage.profiler.profiled
+    def run_flows(
+        self,
+        flow_inputs: t.Iterable[dict],
+        use_defaults: bool = True,
+        max_workers: int = 8,
+        max_pending: t.Optional[int] = None,
+        callback: t.Optional[t.Callable] = None,
+        **flow_kwargs,
+    ) -> t.List[FlowRunResult]:
+        r"""
+        Start a run of the flow for each of ``flow_inputs``. Default input is fetched and the
+        flow is synced once for all runs, and runs are then started concurrently. Unlike
+        ``run_flow()``, errors are not raised but returned on the result for each input.
+
+        .. code-block:: python
+
+            inputs = ({"input": {"filename": f}} for f in filenames)
+            for result in my_client.run_flows(inputs, label="Process files"):
+                if not result.ok:
+                    print(f"{filenames[result.index]} failed: {result.error}")
+
+        :param flow_inputs: An iterable of flow input, each in the same form as ``run_flow()``.
+                            Inputs are consumed lazily, so a generator may be used.
+        :param use_defaults: Use the result of self.get_input() as base input for each run
+        :param max_workers: The number of runs to start at once
+        :param max_pending: The number of inputs which may be submitted but not yet started.
+                            Defaults to twice ``max_workers``.
+        :param callback: Called with each ``FlowRunResult``, in order, to report progress
+        :param \**flow_kwargs: Keyed arguments passed to ``run_flow()`` for every run
+        :raises: Any exception raised by ``run_flow()`` before runs are started
+        :returns: A list of ``FlowRunResult`` in the same order as ``flow_inputs``
+        """
+        self.wait_for_predeploy()
+        defaults = self.get_input() if use_defaults else dict()
+        self.sync_flow()
+
+        def prepare(flow_input):
+            body = self.combine_flow_input(defaults, flow_input)
+            return dict(flow_kwargs, body=body)
+
+        return self.flows_manager.run_flows(
+            flow_inputs,
+            max_workers=max_workers,
+            max_pending=max_pending,
+            callback=callback,
+            prepare=prepare,
+        )
+
+    def combine_flow_input(
+        self, defaults: dict, flow_input: t.Optional[dict] = None
+    ) -> dict:
+        """
+        Combine default input with input for a single run, and check the result satisfies
+        each tool. The defaults are not modified.
+
+        :param defaults: Default input, such as the result of ``get_input()``
+        :param flow_input: Input for the run, nested under "input"
+        :raises: gladier.exc.ConfigException on malformed or missing input
+        :returns: The combined input for the run
+        """
+        combine_flow_input = dict(defaults)
         if flow_input is not None:
             if not flow_input.get("input") or len(flow_input.keys()) != 1:
                 raise gladier.exc.ConfigException(
                     f'Malformed input to flow, all input must be nested under "input", got '
                     f"{flow_input.keys()}"
                 )
+            combine_flow_input["input"] = dict(defaults.get("input", {}))
             combine_flow_input["input"].update(flow_input["input"])
         for tool in self.tools:
             self.check_input(tool, combine_flow_input)
-
-        self.sync_flow()
-        return self.flows_manager.run_flow(body=combine_flow_input, **flow_kwargs)
+        return combine_flow_input
 
     def get_compute_function_ids(self):
         """Get all compute function ids for this run, registering them if there are no ids
@@ -406,6 +664,22 @@ class GladierBaseClient(object):
         :returns: a dict of function ids where keys are names and values are compute function ids.
         """
         compute_ids = dict()
+        # Any functions which need registering are saved to storage in a single write.
+        with self.storage.transaction():
+            functions = self.get_compute_functions()
+            for name, val in self.compute_manager.validate_functions(functions):
+                compute_ids[name] = val
+            if self.auto_collect_storage_garbage and self.storage.get_changes():
+                self.collect_storage_garbage()
+        return compute_ids
+
+    def get_compute_functions(self) -> t.List[t.Tuple[GladierBaseTool, t.Callable]]:
+        """
+        Get all compute functions defined on each of the Gladier tools for this client.
+
+        :returns: a list of (tool, function) tuples
+        """
+        functions = []
         for tool in self.tools:
             log.debug(f"Checking functions for {tool}")
             compute_funcs = getattr(tool, "compute_functions", []) + getattr(
@@ -414,15 +688,36 @@ class GladierBaseClient(object):
             if not compute_funcs:
                 log.warning(f"Tool {tool} did not define any compute functions!")
             if not compute_funcs and not isinstance(compute_funcs, Iterable):
-                raise gladier.exc.DeveloperException(
+                raise gladier.exc.DevelopmentException(
                     f'Attribute "compute_functions" on {tool} needs to be an iterable! Found '
                     f"{type(compute_funcs)}"
                 )
+            functions.extend((tool, func) for func in compute_funcs)
+        return functions
 
-            for func in compute_funcs:
-                name, val = self.compute_manager.validate_function(tool, func)
-                compute_ids[name] = val
-        return compute_ids
+    def collect_storage_garbage(
+        self, dry_run: bool = False
+    ) -> gladier.storage.gc.GarbageCollectionReport:
+        """
+        Remove compute function ids and checksums from storage for functions which are no
+        longer used by any of the tools on this client, such as functions which have been
+        renamed or removed. Runs automatically after new functions are registered if
+        ``auto_collect_storage_garbage`` is set on the client.
+
+        :param dry_run: Report stale entries without removing them
+        :returns: a report of the stale entries, and the bytes reclaimed by removing them
+        """
+        referenced = set()
+        for _, func in self.get_compute_functions():
+            referenced.add(
+                gladier.utils.name_generation.get_compute_function_name(func)
+            )
+            referenced.add(
+                gladier.utils.name_generation.get_compute_function_checksum_name(func)
+            )
+        return gladier.storage.gc.collect_garbage(
+            self.storage, referenced, dry_run=dry_run
+        )
 
     def get_flow_id(self) -> t.Optional[str]:
         """
@@ -430,6 +725,7 @@ class GladierBaseClient(object):
         """
         return self.flows_manager.get_flow_id()
 
+    @gladier.storage.profiler.profiled
     def get_input(self) -> dict:
         """
         Get compute function ids, compute endpoints, and each tool's default input. Default
@@ -497,7 +793,7 @@ class GladierBaseClient(object):
         """
         return self.flows_manager.get_status(action_id)
 
-    def progress(self, action_id, callback=None, delay=2):
+    def progress(self, action_id, callback=None, delay=None):
         """
         Continuously call self.get_status() until the flow completes. Each status response is
         used as a parameter to the provided callback, by default will use the builtin callback
@@ -507,9 +803,45 @@ class GladierBaseClient(object):
                           based on the current tool's flow_definition.
         :param callback: The function to call with the result from self.get_status. Must take
                          a single parameter: mycallback(self.get_status())
+        :param delay: A fixed number of seconds to wait between checks. By default, the
+                      time between checks adapts to the state the run is in. Pass
+                      ``delay=2`` to check at the fixed rate used before adaptive polling.
         """
         return self.flows_manager.progress(action_id, callback=callback, delay=delay)
 
+    def iter_run_logs(self, action_id: str, since: t.Optional[str] = None):
+        """
+        Iterate over the event log of a run, only fetching entries logged since the last
+        call for the same run. See ``FlowsManager.iter_run_logs()``.
+
+        :param action_id: The run to fetch logs for
+        :param since: A position to resume from, instead of the last one seen
+        :returns: a generator of log entries, oldest first
+        """
+        return self.flows_manager.iter_run_logs(action_id, since=since)
+
+    def find_runs(self, **query) -> t.List[dict]:
+        """
+        Find runs started by this client, without contacting the flows service. Requires
+        ``index_runs`` to be set on the client.
+
+        :param query: Filters such as tag, label_prefix, status, since and until. See
+            :meth:`gladier.storage.run_index.RunIndex.query`
+        :returns: Matching runs, most recently started first
+        """
+        return self.flows_manager.find_runs(**query)
+
+    def watch_runs(self, action_ids: t.Iterable[str] = (), **kwargs):
+        """
+        Watch many runs at once, with a limited rate of status requests. Iterate the
+        returned watcher to wait for each run to finish.
+
+        :param action_ids: The runs to watch
+        :param kwargs: Options for :class:`gladier.managers.run_watcher.RunWatcher`
+        :returns: a RunWatcher
+        """
+        return self.flows_manager.watch_runs(action_ids, **kwargs)
+
     def get_details(self, action_id, state_name):
         """
         Attempt to extrapolate details from get_status() for a given state_name define in the flow
@@ -520,9 +852,7 @@ class GladierBaseClient(object):
         :param state_name: The state in the automate definition to fetch
         :returns: sub-dict of get_status() describing the :state_name:.
         """
-        return gladier.utils.automate.get_details(
-            self.get_status(action_id), state_name
-        )
+        return self.flows_manager.get_details(action_id, state_name)
 
 
 class GladierClient(GladierBaseClient):
@@ -539,3 +869,113 @@ class GladierClient(GladierBaseClient):
             flows_manager=flows_manager,
         )
         self.flow_definition = flow_definition
+
+
+class AsyncGladierClient(GladierBaseClient):
+    """
+    A Gladier Client with ``async`` methods for running and monitoring flows, for use
+    within an asyncio event loop. Subclass it in the same way as
+    :class:`GladierBaseClient`:
+
+    .. code-block:: python
+
+        @generate_flow_definition
+        class MyAsyncClient(AsyncGladierClient):
+            gladier_tools = [MyTool]
+
+        async def main():
+            client = MyAsyncClient()
+            run = await client.run_flow(flow_input={"input": {"my_field": "foo"}})
+            await client.progress(run["run_id"])
+
+    Preflight work for a run (fetching default input, registering compute functions, and
+    syncing the flow) is shared with the synchronous client, and is done in a worker thread
+    one run at a time. Waiting on runs never holds a thread, so a single event loop can
+    monitor many runs at once.
+
+    :param flows_manager: An AsyncFlowsManager with customized behavior
+    :raises gladier.exc.DevelopmentException: if flows_manager is not an AsyncFlowsManager
+    """
+
+    def __init__(
+        self,
+        auto_registration: bool = True,
+        login_manager: t.Optional[BaseLoginManager] = None,
+        flows_manager: t.Optional[AsyncFlowsManager] = None,
+        compute_manager: t.Optional[ComputeManager] = None,
+    ):
+        if flows_manager is None:
+            flows_manager = AsyncFlowsManager(
+                auto_registration=auto_registration,
+                subscription_id=self.subscription_id,
+            )
+        elif not isinstance(flows_manager, AsyncFlowsManager):
+            raise gladier.exc.DevelopmentException(
+                f"{self.__class__.__name__} requires an AsyncFlowsManager, got "
+                f"{flows_manager}"
+            )
+        self._preflight_lock = asyncio.Lock()
+        super().__init__(
+            auto_registration=auto_registration,
+            login_manager=login_manager,
+            flows_manager=flows_manager,
+            compute_manager=compute_manager,
+        )
+
+    async def _preflight(self, use_defaults: bool) -> dict:
+        async with self._preflight_lock:
+            await asyncio.to_thread(self.wait_for_predeploy)
+            defaults = await asyncio.to_thread(self.get_input) if use_defaults else {}
+            await asyncio.to_thread(self.sync_flow)
+        return defaults
+
+    async def run_flow(self, flow_input=None, use_defaults=True, **flow_kwargs):
+        r"""
+        Start a Globus flow. See ``GladierBaseClient.run_flow()``.
+
+        :param flow_input: A dict of input to be passed to the flow, nested under 'input'
+        :param use_defaults: Use the result of self.get_input() as base input for the flow
+        :param \**flow_kwargs: Keyed arguments for the run, such as the label
+        :raises: Any exception raised by ``GladierBaseClient.run_flow()``
+        """
+        defaults = await self._preflight(use_defaults)
+        combine_flow_input = self.combine_flow_input(defaults, flow_input)
+        return await self.flows_manager.run_flow(body=combine_flow_input, **flow_kwargs)
+
+    async def run_flows(
+        self,
+        flow_inputs: t.Iterable[dict],
+        use_defaults: bool = True,
+        max_workers: int = 8,
+        max_pending: t.Optional[int] = None,
+        callback: t.Optional[t.Callable] = None,
+        **flow_kwargs,
+    ) -> t.List[FlowRunResult]:
+        r"""
+        Start a run of the flow for each of ``flow_inputs``. See
+        ``GladierBaseClient.run_flows()``. The callback may also be a coroutine function.
+        """
+        defaults = await self._preflight(use_defaults)
+
+        def prepare(flow_input):
+            body = self.combine_flow_input(defaults, flow_input)
+            return dict(flow_kwargs, body=body)
+
+        return await self.flows_manager.run_flows(
+            flow_inputs,
+            max_workers=max_workers,
+            max_pending=max_pending,
+            callback=callback,
+            prepare=prepare,
+        )
+
+    async def get_status(self, action_id: str):
+        return await self.flows_manager.get_status(action_id)
+
+    async def progress(self, action_id, callback=None, delay=None):
+        return await self.flows_manager.progress(
+            action_id, callback=callback, delay=delay
+        )
+
+    async def get_details(self, action_id, state_name):
+        return await self.flows_manager.get_details(action_id, state_name)
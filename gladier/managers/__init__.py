@@ -3,13 +3,17 @@ from .login_manager import (
     CallbackLoginManager,
     UserAppLoginManager,
 )
-from .flows_manager import FlowsManager
+from .flows_manager import AsyncFlowsManager, FlowsManager
 from .compute_manager import ComputeManager
+from .run_watcher import AsyncRunWatcher, RunWatcher
 
 __all__ = [
+    "AsyncFlowsManager",
+    "AsyncRunWatcher",
     "BaseLoginManager",
     "CallbackLoginManager",
     "FlowsManager",
     "ComputeManager",
+    "RunWatcher",
     "UserAppLoginManager",
 ]
@@ -1,9 +1,14 @@
 import hashlib
 import logging
+import contextvars
+import concurrent.futures
+import typing as t
 from packaging.version import parse as parse_version
 
 import globus_sdk
 import gladier
+import gladier.storage.function_cache
+import gladier.storage.profiler
 from gladier.base import GladierBaseTool
 from gladier.managers.service_manager import ServiceManager
 from globus_compute_sdk import Client, serialize, version as compute_sdk_version
@@ -12,33 +17,111 @@ log = logging.getLogger(__name__)
 
 
 class ComputeManager(ServiceManager):
-    def __init__(self, auto_registration: bool = True, group: str = None, **kwargs):
+    def __init__(
+        self,
+        auto_registration: bool = True,
+        group: str = None,
+        max_workers: int = 8,
+        checksum_cache: t.Optional[
+            gladier.storage.function_cache.FunctionChecksumCache
+        ] = None,
+        **kwargs,
+    ):
         super().__init__(**kwargs)
         self.auto_registration = auto_registration
         self.group = group
+        self.max_workers = max_workers
+        self.checksum_cache = (
+            checksum_cache
+            or gladier.storage.function_cache.FunctionChecksumCache(
+                namespace=self.get_checksum_namespace()
+            )
+        )
+        self._compute_client = None
+        self._compute_authorizer_key = None
 
     def get_scopes(self):
         return [
             globus_sdk.ComputeClientV3.scopes.all,
         ]
 
+    @staticmethod
+    def _get_authorizer_key(authorizer) -> tuple:
+        """
+        Login managers may load new authorizers each time they are asked, so authorizers
+        are compared by their access token where they have one.
+        """
+        token = getattr(authorizer, "access_token", None)
+        return (type(authorizer), token) if token else (id(authorizer),)
+
     @property
     def compute_client(self):
         """
+        The compute client is kept between uses, and only created again if the compute
+        authorizer changes, such as after a new login.
+
         :return: an authorized compute client
         """
-        if getattr(self, "__compute_client", None) is not None:
-            return self.__compute_client
-
         # Prefer explicit authorizers to avoid SDK-specific login manager behavior.
         authorizer = self.login_manager.get_manager_authorizers().get(
             Client.FUNCX_SCOPE
         )
-        self.__compute_client = Client(
+        authorizer_key = self._get_authorizer_key(authorizer)
+        if (
+            self._compute_client is not None
+            and self._compute_authorizer_key == authorizer_key
+        ):
+            return self._compute_client
+
+        log.debug(f"Creating a new compute client for {self}")
+        self._compute_client = Client(
             code_serialization_strategy=self.get_serialization_strategy(),
             authorizer=authorizer,
         )
-        return self.__compute_client
+        self._compute_authorizer_key = authorizer_key
+        if self.transport is not None:
+            self.use_transport(self._compute_client)
+        return self._compute_client
+
+    def refresh_compute_client(self) -> Client:
+        """
+        Destroy the current compute client and return a new one with updated authorizers.
+        """
+        self._compute_client = None
+        return self.compute_client
+
+    def use_transport(self, compute_client: Client) -> None:
+        """
+        Send requests from a compute client with this manager's transport. The compute
+        client does not accept a transport when created, so the transport of each of its
+        Globus SDK clients is replaced instead. This relies on internals of
+        globus-compute-sdk 4.x (the range allowed by Gladier's requirements). If they
+        aren't found, the compute client keeps its default transport.
+        """
+        web_client = getattr(compute_client, "_compute_web_client", None)
+        sdk_clients = [
+            sdk_client
+            for sdk_client in (
+                getattr(web_client, "v2", None),
+                getattr(web_client, "v3", None),
+            )
+            if isinstance(sdk_client, globus_sdk.BaseClient)
+        ]
+        if not sdk_clients:
+            log.warning(
+                f"Unable to set transport on compute client {compute_client} with "
+                f"globus_compute_sdk v{compute_sdk_version.__version__}, using the "
+                f"default transport instead"
+            )
+            return
+        for sdk_client in sdk_clients:
+            owned = sdk_client.transport
+            resources = getattr(sdk_client, "_resources_to_close", None)
+            if isinstance(resources, list) and owned in resources:
+                # The shared transport must not be closed along with this client
+                resources.remove(owned)
+                owned.close()
+            sdk_client.transport = self.transport
 
     @staticmethod
     def get_compute_function_name(compute_function):
@@ -67,6 +150,26 @@ class ComputeManager(ServiceManager):
             )
             return None
 
+    @classmethod
+    def get_checksum_namespace(cls) -> str:
+        """
+        Checksums depend on the serialization strategy and compute SDK version, so cached
+        checksums are kept separately for each.
+        """
+        strategy = cls.get_serialization_strategy()
+        return f"{type(strategy).__name__}:{compute_sdk_version.__version__}"
+
+    def get_function_checksum(self, compute_function) -> str:
+        """
+        Get the checksum of a compute function from the ``checksum_cache``, only
+        serializing the function if its code changed since its checksum was cached.
+
+        :return: sha256 hex string of a given compute function
+        """
+        return self.checksum_cache.get_checksum(
+            compute_function, self.get_compute_function_checksum
+        )
+
     @staticmethod
     def get_compute_function_checksum(compute_function):
         """
@@ -88,46 +191,176 @@ class ComputeManager(ServiceManager):
         serialized_func = fxs.serialize(compute_function).encode()
         return hashlib.sha256(serialized_func).hexdigest()
 
-    def validate_function(self, tool: GladierBaseTool, function):
+    def _check_function(self, tool: GladierBaseTool, function, fid, checksum):
+        """
+        :raises: gladier.exc.RegistrationException if the function has not been registered
+        :raises: gladier.exc.FunctionObsolete if the function changed since registration
+        """
         fid_name = gladier.utils.name_generation.get_compute_function_name(function)
-        fid = self.storage.get_value(fid_name)
-        checksum = self.get_compute_function_checksum(function)
         checksum_name = (
             gladier.utils.name_generation.get_compute_function_checksum_name(function)
         )
-        try:
-            if not fid_name:
-                raise gladier.exc.RegistrationException(
-                    f"Tool {tool.__class__.__name__} missing compute registration for {fid_name}"
-                )
-            if not self.storage.get_value(checksum_name):
-                raise gladier.exc.RegistrationException(
-                    f"Tool {tool.__class__.__name__} with function {fid_name} "
-                    f"has a function id but no checksum!"
-                )
-            if not self.storage.get_value(checksum_name) == checksum:
-                raise gladier.exc.FunctionObsolete(
-                    f"Tool {tool.__class__.__name__} with function {fid_name} "
-                    f"has changed and needs to be re-registered."
-                )
-        except (gladier.exc.RegistrationException, gladier.exc.FunctionObsolete):
-            if self.auto_registration is True:
+        stored_checksum = self.storage.get_value(checksum_name)
+        if not fid:
+            raise gladier.exc.RegistrationException(
+                f"Tool {tool.__class__.__name__} missing compute registration for {fid_name}",
+                items=(fid_name,),
+            )
+        if not stored_checksum:
+            raise gladier.exc.RegistrationException(
+                f"Tool {tool.__class__.__name__} with function {fid_name} "
+                f"has a function id but no checksum!",
+                items=(fid_name,),
+            )
+        if not stored_checksum == checksum:
+            raise gladier.exc.FunctionObsolete(
+                f"Tool {tool.__class__.__name__} with function {fid_name} "
+                f"has changed and needs to be re-registered.",
+                items=(fid_name,),
+            )
+
+    def _map(
+        self, func, items: t.List
+    ) -> t.List[t.Tuple[t.Any, t.Optional[Exception]]]:
+        """
+        Call ``func`` on each item on a bounded thread pool, and return (result, error)
+        for each item in order. Each call runs in a copy of the caller's context, so
+        context such as the storage profiler's current operation is kept.
+        """
+
+        def call(item):
+            try:
+                return func(*item), None
+            except Exception as exc:
+                return None, exc
+
+        if len(items) <= 1 or self.max_workers <= 1:
+            return [call(item) for item in items]
+        workers = min(self.max_workers, len(items))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(contextvars.copy_context().run, call, item)
+                for item in items
+            ]
+            return [future.result() for future in futures]
+
+    @staticmethod
+    def _raise_errors(errors: t.List[t.Tuple[str, Exception]]):
+        """Raise the only error, or a single error summarizing all of them"""
+        if not errors:
+            return
+        if len(errors) == 1:
+            raise errors[0][1]
+        exc_types = {type(exc) for _, exc in errors}
+        exc_type = exc_types.pop() if len(exc_types) == 1 else None
+        if exc_type is None or not issubclass(
+            exc_type, gladier.exc.RegistrationException
+        ):
+            exc_type = gladier.exc.RegistrationException
+        summary = "\n".join(f"  {name}: {exc}" for name, exc in errors)
+        raise exc_type(
+            f"{len(errors)} compute functions could not be registered:\n{summary}",
+            items=tuple(name for name, _ in errors),
+        ) from errors[0][1]
+
+    @gladier.storage.profiler.profiled
+    def validate_functions(
+        self, functions: t.Iterable[t.Tuple[GladierBaseTool, t.Callable]]
+    ) -> t.List[t.Tuple[str, str]]:
+        """
+        Ensure each function is registered and unchanged since it was registered. Checksums
+        are computed concurrently, and any functions which are missing or out of date are
+        registered concurrently on up to ``max_workers`` threads. Functions which are used
+        by more than one tool are only registered once. All new function ids are saved to
+        storage in a single write.
+
+        :param functions: (tool, function) tuples to check
+        :raises: gladier.exc.RegistrationException
+        :raises: gladier.exc.FunctionObsolete
+        :raises: Any errors from registering functions. If more than one function failed,
+            a single RegistrationException lists them all, and any functions which did
+            register are still saved.
+        :returns: a list of (function id name, function id), in the same order as functions
+        """
+        functions = list(functions)
+        fid_names = [
+            gladier.utils.name_generation.get_compute_function_name(func)
+            for _, func in functions
+        ]
+        fids = [self.storage.get_value(name) for name in fid_names]
+        checksums = self._map(
+            lambda tool, func: self.get_function_checksum(func), functions
+        )
+        self._raise_errors(
+            [(n, exc) for n, (_, exc) in zip(fid_names, checksums) if exc]
+        )
+
+        stale, errors = dict(), list()
+        for (tool, func), fid_name, fid, (checksum, _) in zip(
+            functions, fid_names, fids, checksums
+        ):
+            try:
+                self._check_function(tool, func, fid, checksum)
+            except (
+                gladier.exc.RegistrationException,
+                gladier.exc.FunctionObsolete,
+            ) as exc:
+                if self.auto_registration is not True:
+                    if fid_name not in (name for name, _ in errors):
+                        errors.append((fid_name, exc))
+                    continue
                 log.info(
-                    f"{tool.__class__.__name__}: function {function.__name__} is out of date"
+                    f"{tool.__class__.__name__}: function {func.__name__} is out of date"
                 )
-                fid = self.register_function(tool, function)
-                fx_name = gladier.utils.name_generation.get_compute_function_name(
-                    function
+                checksum_name = (
+                    gladier.utils.name_generation.get_compute_function_checksum_name(
+                        func
+                    )
                 )
-                self.storage.set_value(fx_name, fid)
-                self.storage.set_value(checksum_name, checksum)
-            else:
-                raise
-        return fid_name, fid
+                stale.setdefault(fid_name, (tool, func, checksum_name, checksum))
+        self._raise_errors(errors)
+
+        registered = dict()
+        if stale:
+            # Resolve the client once here, so worker threads never create clients or
+            # start a login of their own
+            compute_client = self.compute_client
+            results = self._map(
+                lambda tool, func: self._register_function(compute_client, tool, func),
+                [(tool, func) for tool, func, _, _ in stale.values()],
+            )
+            with self.storage.transaction():
+                for (fid_name, (_, _, checksum_name, checksum)), (fid, exc) in zip(
+                    stale.items(), results
+                ):
+                    if exc is not None:
+                        errors.append((fid_name, exc))
+                        continue
+                    self.storage.set_value(fid_name, fid)
+                    self.storage.set_value(checksum_name, checksum)
+                    registered[fid_name] = fid
+        self._raise_errors(errors)
+        return [
+            (fid_name, registered.get(fid_name, fid))
+            for fid_name, fid in zip(fid_names, fids)
+        ]
+
+    def validate_function(self, tool: GladierBaseTool, function):
+        """
+        Ensure a single function is registered and up to date. See ``validate_functions()``.
+
+        :returns: a tuple of (function id name, function id)
+        """
+        return self.validate_functions([(tool, function)])[0]
 
     def register_function(self, tool: GladierBaseTool, function):
         """Register the functions with Globus Compute."""
+        return self._register_function(self.compute_client, tool, function)
+
+    def _register_function(
+        self, compute_client: Client, tool: GladierBaseTool, function
+    ):
         log.info(
             f"{tool.__class__.__name__}: registering function {function.__name__} with group {self.group}"
         )
-        return self.compute_client.register_function(function, group=self.group)
+        return compute_client.register_function(function, group=self.group)
@@ -1,5 +1,9 @@
 import hashlib
 import json
+import asyncio
+import inspect
+import collections
+import concurrent.futures
 import time
 import logging
 import copy
@@ -11,12 +15,19 @@ import gladier
 import gladier.exc
 import gladier.storage.config
 import gladier.storage.migrations
+import gladier.storage.profiler
+import gladier.storage.run_cache
+import gladier.storage.run_index
 import gladier.utils.automate
 import gladier.utils.dynamic_imports
+import gladier.utils.flow_checksum
+import gladier.utils.polling
 import gladier.utils.name_generation
 import gladier.utils.tool_alias
 import gladier.version
 import globus_sdk
+from gladier.managers.run_watcher import AsyncRunWatcher, RunWatcher
+from gladier.storage.run_cache import TERMINAL_RUN_STATUSES
 from gladier.managers.service_manager import ServiceManager
 
 log = logging.getLogger(__name__)
@@ -29,6 +40,31 @@ def ensure_flow_registered(
     flows_manager_instance.register_flow()
 
 
+class FlowRunResult:
+    """
+    The result of starting a single run with ``FlowsManager.run_flows()``.
+
+    :param index: The position of the run in the runs which were submitted
+    :param run: The run as returned by ``run_flow()``, or None if it could not be started
+    :param error: The exception raised while starting the run, if any
+    """
+
+    def __init__(
+        self, index: int, run: t.Optional[dict] = None, error: Exception = None
+    ):
+        self.index = index
+        self.run = run
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self):
+        outcome = self.run["run_id"] if self.ok else repr(self.error)
+        return f"<{self.__class__.__name__} {self.index}: {outcome}>"
+
+
 class FlowsManager(ServiceManager):
     """
     The flows manager tracks an externally defined flow_definition and ensures it stays
@@ -64,6 +100,10 @@ class FlowsManager(ServiceManager):
         as a ``flow_kwargs`` will only result in the ``flows_kwargs`` arguments taking effect.
     :param run_kwargs: Additional kwargs to pass in when starting the flow. Only arguments supported
         by the ``sfc.run_flow()`` method are allowed. See the globus_sdk docs for more info.
+    :param run_cache: A cache of finished runs. If set, ``get_status()`` only fetches runs
+        from the flows service until they finish.
+    :param run_index: A local index of runs. If set, each run started is recorded in the
+        index, and can be found again with ``find_runs()``.
 
     When used with a Gladier Client, following items will be auto-configured and should not be
     set explicitly in the constructor:
@@ -78,6 +118,9 @@ class FlowsManager(ServiceManager):
         internal class storage requirements. Doing so will result in an exception.
     """
 
+    #: The class used by ``watch_runs()`` to watch runs
+    run_watcher_class = RunWatcher
+
     AVAILABLE_SCOPES = [
         globus_sdk.FlowsClient.scopes.manage_flows,
         globus_sdk.FlowsClient.scopes.view_flows,
@@ -98,6 +141,8 @@ class FlowsManager(ServiceManager):
         redeploy_on_404: bool = True,
         flow_kwargs: dict = None,
         run_kwargs: dict = None,
+        run_cache: t.Optional[gladier.storage.run_cache.RunStatusCache] = None,
+        run_index: t.Optional[gladier.storage.run_index.RunIndex] = None,
         **kwargs,
     ):
         self.flow_id = flow_id
@@ -111,6 +156,13 @@ class FlowsManager(ServiceManager):
 
         self.flow_kwargs = flow_kwargs or dict()
         self.run_kwargs = run_kwargs or dict()
+        self.run_cache = run_cache
+        self.run_index = run_index
+        self._run_log_positions: t.Dict[str, str] = dict()
+        self._checksum_tree = gladier.utils.flow_checksum.FlowChecksumTree()
+        self._semantic_checksum_tree = (
+            gladier.utils.flow_checksum.SemanticFlowChecksumTree()
+        )
 
         if self.flow_id is not None:
             self.redeploy_on_404 = False
@@ -189,7 +241,9 @@ class FlowsManager(ServiceManager):
         flow_authorizer = self._get_authorizer_for_scope(
             authorizers, globus_sdk.FlowsClient.scopes.manage_flows
         )
-        self._flows_client = globus_sdk.FlowsClient(authorizer=flow_authorizer)
+        self._flows_client = globus_sdk.FlowsClient(
+            authorizer=flow_authorizer, transport=self.transport
+        )
         return self._flows_client
 
     @property
@@ -205,7 +259,7 @@ class FlowsManager(ServiceManager):
         flow_authorizer = self._get_authorizer_for_scope(authorizers, self.flow_scope)
 
         self._specific_flow_client = globus_sdk.SpecificFlowClient(
-            self.get_flow_id(), authorizer=flow_authorizer
+            self.get_flow_id(), authorizer=flow_authorizer, transport=self.transport
         )
         return self._specific_flow_client
 
@@ -234,7 +288,9 @@ class FlowsManager(ServiceManager):
         flow_definition: dict, flow_schema: dict, flow_kwargs: dict = None
     ):
         """
-        Get the SHA256 checksum of the current flow definition.
+        Get the SHA256 checksum of the current flow definition. Flow checksums are now
+        stored as the root of a :class:`gladier.utils.flow_checksum.FlowChecksumTree`, this
+        checksum is only used to upgrade checksums stored by older versions of Gladier.
 
         :return: sha256 hex string of flow definition
         """
@@ -245,6 +301,83 @@ class FlowsManager(ServiceManager):
         data = (flow_def + flow_schema + flow_kwargs).encode()
         return hashlib.sha256(data).hexdigest()
 
+    def get_flow_checksum_tree(self) -> gladier.utils.flow_checksum.FlowChecksumTree:
+        """
+        Get a hash tree of the current flow definition, schema, and flow kwargs, with a
+        digest for each state. States which have not changed since the last call are not
+        re-hashed.
+
+        :return: The checksum tree for the current flow
+        """
+        self._checksum_tree.update(
+            self.flow_definition, self.flow_schema, self.flow_kwargs
+        )
+        return self._checksum_tree
+
+    def get_semantic_checksum_tree(
+        self,
+    ) -> gladier.utils.flow_checksum.SemanticFlowChecksumTree:
+        """
+        Get a hash tree of the current flow which ignores non-executable fields, such as
+        comments.
+
+        :return: The semantic checksum tree for the current flow
+        """
+        self._semantic_checksum_tree.update(
+            self.flow_definition, self.flow_schema, self.flow_kwargs
+        )
+        return self._semantic_checksum_tree
+
+    def get_stored_flow_checksum_tree(
+        self, name: str = "flow_checksum_tree"
+    ) -> t.Optional[dict]:
+        """
+        :param name: The stored tree to get, either ``flow_checksum_tree`` or
+            ``flow_semantic_checksum_tree``
+        :return: The checksum tree for the deployed flow, as stored by ``register_flow()``,
+            or None if no tree was stored
+        """
+        stored = self.storage.get_value(name)
+        return json.loads(stored) if stored else None
+
+    def get_flow_diff(self) -> t.Optional[gladier.utils.flow_checksum.FlowDiff]:
+        """
+        Compare the current flow against the deployed flow.
+
+        :return: The differences between them, or None if the deployed flow is unknown
+        """
+        stored_semantic_tree = self.get_stored_flow_checksum_tree(
+            "flow_semantic_checksum_tree"
+        )
+        if stored_semantic_tree is None:
+            return None
+        return gladier.utils.flow_checksum.FlowDiff.from_trees(
+            self.get_flow_checksum_tree(),
+            self.get_stored_flow_checksum_tree(),
+            self.get_semantic_checksum_tree(),
+            stored_semantic_tree,
+        )
+
+    def save_flow_checksum(
+        self, diff: t.Optional[gladier.utils.flow_checksum.FlowDiff] = None
+    ):
+        """
+        Store checksums for the current flow, after it has been deployed.
+
+        :param diff: The changes since the flow was last deployed, which are stored
+            as ``flow_diff`` so they can be reviewed later.
+        """
+        tree = self.get_flow_checksum_tree()
+        semantic_tree = self.get_semantic_checksum_tree()
+        with self.storage.transaction():
+            self.storage.set_value("flow_checksum", tree.root)
+            self.storage.set_value("flow_checksum_tree", json.dumps(tree.as_dict()))
+            self.storage.set_value(
+                "flow_semantic_checksum_tree", json.dumps(semantic_tree.as_dict())
+            )
+            if diff is not None:
+                self.storage.set_value("flow_diff", json.dumps(diff.as_dict()))
+
     @staticmethod
     def get_globus_urn(uuid, id_type="group"):
         """Convenience method for appending the correct Globus URN prefix on a uuid."""
@@ -311,10 +444,14 @@ class FlowsManager(ServiceManager):
             return True
         return False
 
+    @gladier.storage.profiler.profiled
     def check_flow(self):
         """
         Check if the flow has changed by validating the current flow_definition against
-        the stored checksum. Raises an exception if the checksums do not match.
+        the stored checksum. Raises an exception if the checksums do not match, with the
+        names of any changed states set as ``items`` on the exception.
+
+        Checksums stored by older versions of Gladier are upgraded if they still match.
 
         :raises: gladier.exc.NoFlowRegistered if no flow has been registered
         :raises: gladier.exc.FlowObsolete if the stored flow checksums do not match
@@ -325,14 +462,30 @@ class FlowsManager(ServiceManager):
             message = "No flow_id set on flow manager and no id tracked in storage."
             log.info(message)
             raise gladier.exc.NoFlowRegistered(message)
-        elif flow_checksum != self.get_flow_checksum(
+
+        tree = self.get_flow_checksum_tree()
+        if flow_checksum == tree.root:
+            return
+        elif flow_checksum == self.get_flow_checksum(
             self.flow_definition,
             self.flow_schema,
             self.flow_kwargs,
         ):
-            message = f'"flow_definition" on {self} has changed and needs to be re-registered.'
-            log.info(message)
-            raise gladier.exc.FlowObsolete(message)
+            log.debug("Upgrading stored flow checksum to a checksum tree")
+            self.save_flow_checksum()
+            return
+
+        message = (
+            f'"flow_definition" on {self} has changed and needs to be re-registered.'
+        )
+        changed_states = []
+        stored_tree = self.get_stored_flow_checksum_tree()
+        if stored_tree:
+            changed_states = tree.diff(stored_tree)
+            changes = changed_states + tree.changed_parts(stored_tree)
+            message = f"{message} Changed: {', '.join(changes)}"
+        log.info(message)
+        raise gladier.exc.FlowObsolete(message, items=changed_states)
 
     def sync_flow(self) -> str:
         """
@@ -352,13 +505,17 @@ class FlowsManager(ServiceManager):
             self.on_change(self, exc)
         return self.get_flow_id()
 
+    @gladier.storage.profiler.profiled
     def register_flow(self) -> str:
         """
         Deploy the current flow_definition. If a flow_id exists, the flow is updated
         instead. If the flow does not exist (404) and redeploy_on_404 is set, the flow will
         be automatically re-deployed with a new flow id.
 
-
+        Existing flows are only updated if they run differently than the current flow.
+        Changes to non-executable fields, such as comments, are only recorded in storage.
+        If only flow metadata changed (the subtitle, description, or keywords in
+        ``flow_kwargs``), just the metadata is updated.
 
         Note: If a new flow is deployed, or an existing scope adds unique Action Providers,
         a new login will be needed before the flow can be run.
@@ -382,21 +539,34 @@ class FlowsManager(ServiceManager):
         combine_flow_kwargs = self._combine_kw_args(
             flow_kwargs, self.flow_kwargs, name="Flow"
         )
+        diff = self.get_flow_diff() if flow_id else None
+        metadata_only = diff is not None and not diff.changed
+        if metadata_only and "kwargs" not in diff.ignored_parts:
+            log.info(
+                f"Flow {flow_id} has no behavioral changes, skipping update. "
+                f"Ignored changes: {diff.ignored_states + diff.ignored_parts}"
+            )
+            self.save_flow_checksum(diff)
+            return flow_id
         if flow_id:
             try:
-                log.info(f"Flow checksum failed, updating flow {flow_id}...")
-                self.flows_client.update_flow(
-                    flow_id,
-                    title=self.flow_title,
-                    definition=self.flow_definition,
-                    **combine_flow_kwargs,
-                )
-                self.storage.set_value(
-                    "flow_checksum",
-                    self.get_flow_checksum(
-                        self.flow_definition, self.flow_schema, self.flow_kwargs
-                    ),
-                )
+                if metadata_only:
+                    log.info(f"Flow {flow_id} metadata changed, updating metadata...")
+                    self.flows_client.update_flow(
+                        flow_id, **self.get_flow_metadata(combine_flow_kwargs)
+                    )
+                else:
+                    log.info(f"Flow checksum failed, updating flow {flow_id}...")
+                    if diff is not None:
+                        changes = diff.changed_states + diff.changed_parts
+                        log.info(f"Flow changes: {changes}")
+                    self.flows_client.update_flow(
+                        flow_id,
+                        title=self.flow_title,
+                        definition=self.flow_definition,
+                        **combine_flow_kwargs,
+                    )
+                self.save_flow_checksum(diff)
             except globus_sdk.exc.GlobusAPIError as gapie:
                 if gapie.http_status == 404 and self.redeploy_on_404:
                     flow_id = None
@@ -409,23 +579,40 @@ class FlowsManager(ServiceManager):
                 self.flow_title, self.flow_definition, **combine_flow_kwargs
             ).data
             log.debug(f'Flow deployed with id {flow["id"]}')
-            self.storage.set_value("flow_id", flow["id"])
-            self.storage.set_value(
-                "flow_checksum",
-                self.get_flow_checksum(self.flow_definition, self.flow_schema),
-            )
+            with self.storage.transaction():
+                self.storage.set_value("flow_id", flow["id"])
+                self.save_flow_checksum()
             self.login_manager.add_requirements([flow["globus_auth_scope"]])
             self.refresh_specific_flow_client()
 
         return flow_id
 
-    def purge_flow(self):
+    @staticmethod
+    def get_flow_metadata(flow_kwargs: t.Mapping[str, t.Any]) -> dict:
         """
-        Remove the stored flow_id and flow_checksum.
+        Get the flow kwargs which only describe the flow, such as its description. Any
+        which are not set are given their empty values, so removing them from
+        ``flow_kwargs`` clears them on the deployed flow.
         """
-        self.storage.del_value("flow_id")
-        self.storage.del_value("flow_checksum")
+        return {
+            name: flow_kwargs.get(name, default)
+            for name, default in (
+                gladier.utils.flow_checksum.FLOW_METADATA_DEFAULTS.items()
+            )
+        }
 
+    def purge_flow(self):
+        """
+        Remove the stored flow_id and flow checksums.
+        """
+        with self.storage.transaction():
+            self.storage.del_value("flow_id")
+            self.storage.del_value("flow_checksum")
+            self.storage.del_value("flow_checksum_tree")
+            self.storage.del_value("flow_semantic_checksum_tree")
+            self.storage.del_value("flow_diff")
+
+    @gladier.storage.profiler.profiled
     def run_flow(self, **kwargs):
 
         permissions = {
@@ -470,6 +657,8 @@ class FlowsManager(ServiceManager):
             else:
                 raise
         log.info(f'Started flow {kwargs.get("label")} with run "{flow["run_id"]}"')
+        if self.run_index is not None:
+            self.index_run(flow, kwargs)
 
         if flow["status"] == "FAILED":
             raise gladier.exc.ConfigException(
@@ -477,44 +666,279 @@ class FlowsManager(ServiceManager):
             )
         return flow
 
+    def index_run(self, run: dict, run_kwargs: dict) -> None:
+        """
+        Record a started run in the ``run_index``. Failing to index a run is logged, and
+        does not stop the run from being returned.
+
+        :param run: The response from starting the run
+        :param run_kwargs: The arguments the run was started with
+        """
+        try:
+            checksum = None
+            if self._storage is not None:
+                checksum = self.storage.get_value("flow_checksum")
+            self.run_index.add(
+                run,
+                flow_input=run_kwargs.get("body"),
+                flow_id=self.get_flow_id(),
+                flow_checksum=checksum,
+                tags=run_kwargs.get("tags") or (),
+            )
+        except Exception:
+            log.exception(f'Failed to index run {run.get("run_id")}')
+
+    def find_runs(self, **query) -> t.List[dict]:
+        """
+        Find runs in the local ``run_index``, without contacting the flows service.
+
+        :param query: Filters for :meth:`gladier.storage.run_index.RunIndex.query`, such as
+            tag, label_prefix, status, since and until
+        :raises gladier.exc.ConfigException: if no run_index is set
+        :returns: Matching runs, most recently started first
+        """
+        if self.run_index is None:
+            raise gladier.exc.ConfigException(
+                f"{self.__class__.__name__} has no run_index to search"
+            )
+        return self.run_index.query(**query)
+
+    def run_flows(
+        self,
+        runs: t.Iterable[t.Any],
+        max_workers: int = 8,
+        max_pending: t.Optional[int] = None,
+        callback: t.Optional[t.Callable[[FlowRunResult], None]] = None,
+        prepare: t.Optional[t.Callable[[t.Any], dict]] = None,
+    ) -> t.List[FlowRunResult]:
+        """
+        Start many runs of the flow concurrently. Runs are consumed lazily, and no more than
+        ``max_pending`` are held at once, so large generators of runs can be used without
+        holding them all in memory. The first run is started on its own, so any recovery
+        such as re-deploying a missing flow or logging in for new scopes happens only once.
+
+        Errors starting a run are recorded on its result instead of being raised.
+
+        :param runs: Keyword arguments for each call to ``run_flow()``, for example
+            ``{"body": {"input": {...}}, "label": "my run"}``
+        :param max_workers: The number of runs to start at once
+        :param max_pending: The number of runs which may be submitted but not yet finished.
+            Defaults to twice ``max_workers``.
+        :param callback: Called with each ``FlowRunResult``, in order, as runs are started
+        :param prepare: Called on each item of ``runs`` inside a worker to build the keyword
+            arguments for ``run_flow()``. Any exception raised is recorded for that run.
+        :returns: A list of ``FlowRunResult``, in the same order as ``runs``
+        """
+        prepare = prepare or (lambda run_kwargs: run_kwargs)
+        max_pending = max_pending or max_workers * 2
+        results = list()
+
+        def start(index, item):
+            try:
+                return FlowRunResult(index, run=self.run_flow(**prepare(item)))
+            except Exception as exc:
+                log.debug(f"Failed to start run {index}: {exc}")
+                return FlowRunResult(index, error=exc)
+
+        def finish(result):
+            results.append(result)
+            if callback:
+                callback(result)
+
+        items = enumerate(runs)
+        first = next(items, None)
+        if first is None:
+            return results
+        finish(start(*first))
+
+        pending = collections.deque()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for index, item in items:
+                if len(pending) >= max_pending:
+                    finish(pending.popleft().result())
+                pending.append(pool.submit(start, index, item))
+            while pending:
+                finish(pending.popleft().result())
+
+        errors = len([r for r in results if not r.ok])
+        log.info(f"Started {len(results) - errors} runs, {errors} failed to start")
+        return results
+
+    def watch_runs(self, run_ids: t.Iterable[str] = (), **kwargs) -> RunWatcher:
+        """
+        Watch many runs at once. See :class:`gladier.managers.run_watcher.RunWatcher`
+        for options.
+
+        .. code-block:: python
+
+            for status in flows_manager.watch_runs(run_ids, callback=print):
+                print(f'{status["run_id"]} finished')
+
+        :param run_ids: The runs to watch
+        :param kwargs: Options for the RunWatcher. Unless a schedule or any of
+            ``min_interval``, ``max_interval``, or ``backoff`` are given, runs are polled
+            with ``get_polling_schedule()``.
+        :returns: A RunWatcher, which can be iterated to wait for all runs to finish
+        """
+        interval_options = {"schedule", "min_interval", "max_interval", "backoff"}
+        if not interval_options.intersection(kwargs):
+            schedule = self.get_polling_schedule()
+            kwargs.update(
+                schedule=schedule,
+                min_interval=schedule.min_interval,
+                max_interval=schedule.max_interval,
+            )
+        return self.run_watcher_class(self, run_ids, **kwargs)
+
     def get_status(self, run_id):
         """
         Get the current status of the automate flow. Attempts to do additional work on compute
-        functions to deserialize any exception output.
+        functions to deserialize any exception output. Finished runs are read from the
+        ``run_cache``, if one is set.
 
         :param run_id: The globus action UUID used for this flow. The Automate flow id is
                           always the flow_id configured for this tool.
         :raises: Globus Automate exceptions from self.flows_client.flow_action_status
         :returns: a Globus Automate status object (with varying state structures)
         """
-        status = self.flows_client.get_run(run_id).data
+        status = self._get_run(run_id)
         try:
             return gladier.utils.automate.get_details(status)
         except (KeyError, AttributeError):
             return status
 
+    def _get_run(self, run_id: str) -> dict:
+        """
+        :returns: The run document as returned by the flows service, without any compute
+            output prepared
+        """
+        status = self.run_cache.get(run_id) if self.run_cache is not None else None
+        if status is None:
+            status = self.flows_client.get_run(run_id).data
+            if self.run_cache is not None:
+                self.run_cache.set(run_id, status)
+            if self.run_index is not None and "status" in status:
+                self.run_index.update_status(run_id, status["status"])
+        return status
+
+    def iter_run_logs(
+        self, run_id: str, since: t.Optional[str] = None, page_size: int = 100
+    ) -> t.Iterator[dict]:
+        """
+        Iterate over the event log of a run, fetching one page of entries at a time. The
+        position of the last entry yielded is remembered for each run, so calling this again
+        for the same run only yields entries logged since.
+
+        .. code-block:: python
+
+            while status["status"] not in ("SUCCEEDED", "FAILED", "ENDED"):
+                for entry in flows_manager.iter_run_logs(run_id):
+                    print(entry["code"], entry["description"])
+                time.sleep(5)
+
+        :param run_id: The run to fetch logs for
+        :param since: A position from ``get_run_log_position()`` to resume from, instead
+            of the position remembered for this run. Use "" to start from the beginning.
+        :param page_size: The number of entries to fetch with each request
+        :raises: globus_sdk.FlowsAPIError from ``flows_client.get_run_logs``
+        :returns: a generator of log entries, oldest first
+        """
+        if since is None:
+            since = self._run_log_positions.get(run_id, "")
+        offset, _, marker = since.partition(":")
+        skip = int(offset or 0)
+        while True:
+            kwargs = {"limit": page_size}
+            if marker:
+                kwargs["marker"] = marker
+            page = self.flows_client.get_run_logs(run_id, **kwargs)
+            for entry in page.get("entries", [])[skip:]:
+                skip += 1
+                self._run_log_positions[run_id] = f"{skip}:{marker}"
+                yield entry
+            if not page.get("has_next_page") or not page.get("marker"):
+                return
+            marker, skip = page["marker"], 0
+            self._run_log_positions[run_id] = f"0:{marker}"
+
+    def get_run_log_position(self, run_id: str) -> t.Optional[str]:
+        """
+        :returns: The position after the last log entry yielded by ``iter_run_logs()`` for
+            this run, or None if no entries have been yielded
+        """
+        return self._run_log_positions.get(run_id)
+
     @staticmethod
     def _default_progress_callback(response):
         if response["status"] == "ACTIVE":
             print(f'[{response["status"]}]: {response["details"]["description"]}')
 
-    def progress(self, run_id, callback=None, delay=2):
+    def get_polling_schedule(self, **kwargs) -> gladier.utils.polling.PollingSchedule:
+        """
+        Get a schedule for polling runs of this flow, using the flow definition and state
+        durations observed on previous runs.
+
+        :param kwargs: Options for :class:`gladier.utils.polling.PollingSchedule`
+        """
+        durations = {}
+        if self._storage is not None:
+            value = self.storage.get_value("flow_state_durations")
+            durations = gladier.utils.polling.PollingSchedule.loads(value)
+        return gladier.utils.polling.PollingSchedule(
+            self.flow_definition, durations, **kwargs
+        )
+
+    def save_polling_schedule(
+        self, schedule: gladier.utils.polling.PollingSchedule
+    ) -> None:
+        """
+        Store state durations observed by the schedule, so they can be used to poll
+        future runs.
+        """
+        if schedule.changed and self._storage is not None:
+            self.storage.set_value("flow_state_durations", schedule.dumps())
+            schedule.changed = False
+
+    @staticmethod
+    def _get_poll_interval(schedule, timer, status, delay) -> float:
+        if schedule is None:
+            return delay
+        now = time.monotonic()
+        finished = timer.update(status, now)
+        if finished:
+            schedule.record(*finished)
+        return schedule.get_interval(timer, now)
+
+    def _finish_polling(self, schedule, timer, status) -> None:
+        if schedule is not None:
+            self._get_poll_interval(schedule, timer, status, None)
+            self.save_polling_schedule(schedule)
+
+    def progress(self, run_id, callback=None, delay=None):
         """
         Continuously call self.get_status() until the flow completes. Each status response is
         used as a parameter to the provided callback, by default will use the builtin callback
         to print the current state to stdout.
 
+        By default, the time between checks adapts to the state the run is in. See
+        :class:`gladier.utils.polling.PollingSchedule`.
+
         :param run_id: The action id for a running flow. The flow is automatically pulled
                           based on the current tool's flow_definition.
         :param callback: The function to call with the result from self.get_status. Must take
                          a single parameter: mycallback(self.get_status())
+        :param delay: A fixed number of seconds to wait between checks, instead of adapting.
+            Pass ``delay=2`` to check at the fixed rate used before adaptive polling.
         """
         callback = callback or self._default_progress_callback
+        schedule = self.get_polling_schedule() if delay is None else None
+        timer = gladier.utils.polling.RunTimer()
         status = self.get_status(run_id)
-        while status["status"] not in ["SUCCEEDED", "FAILED"]:
+        while status["status"] not in TERMINAL_RUN_STATUSES:
             status = self.get_status(run_id)
             callback(status)
-            time.sleep(delay)
+            time.sleep(self._get_poll_interval(schedule, timer, status, delay))
+        self._finish_polling(schedule, timer, status)
 
     def get_details(self, run_id, state_name):
         """
@@ -526,4 +950,114 @@ class FlowsManager(ServiceManager):
         :param state_name: The state in the automate definition to fetch
         :returns: sub-dict of get_status() describing the :state_name:.
         """
-        return gladier.utils.automate.get_details(self.get_status(run_id), state_name)
+        # Only the requested state is prepared, not the output of every state
+        return gladier.utils.automate.get_details(self._get_run(run_id), state_name)
+
+
+async def _maybe_await(value):
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
+class AsyncFlowsManager(FlowsManager):
+    """
+    A flows manager with ``async`` methods for running and monitoring flows, for use
+    within an asyncio event loop. Calls to Globus services are made in a worker thread so
+    they don't block the loop, and ``progress()`` waits with ``asyncio.sleep()``. Flow
+    registration and checksums are shared with :class:`FlowsManager`, and ``sync_flow()``
+    remains synchronous.
+
+    .. code-block:: python
+
+        fm = AsyncFlowsManager(flow_id=my_flow_id)
+        run = await fm.run_flow(body={"input": {...}})
+        await fm.progress(run["run_id"])
+
+    ``watch_runs()`` returns an :class:`gladier.managers.run_watcher.AsyncRunWatcher`,
+    which is iterated with ``async for``.
+    """
+
+    run_watcher_class = AsyncRunWatcher
+
+    async def run_flow(self, **kwargs):
+        return await asyncio.to_thread(super().run_flow, **kwargs)
+
+    async def run_flows(
+        self,
+        runs: t.Iterable[t.Any],
+        max_workers: int = 8,
+        max_pending: t.Optional[int] = None,
+        callback: t.Optional[t.Callable[[FlowRunResult], t.Any]] = None,
+        prepare: t.Optional[t.Callable[[t.Any], dict]] = None,
+    ) -> t.List[FlowRunResult]:
+        """
+        Start many runs of the flow concurrently. See ``FlowsManager.run_flows()``. The
+        callback may also be a coroutine function.
+        """
+        prepare = prepare or (lambda run_kwargs: run_kwargs)
+        max_pending = max_pending or max_workers * 2
+        workers = asyncio.Semaphore(max_workers)
+        results = list()
+
+        async def start(index, item):
+            async with workers:
+                try:
+                    return FlowRunResult(
+                        index, run=await self.run_flow(**prepare(item))
+                    )
+                except Exception as exc:
+                    log.debug(f"Failed to start run {index}: {exc}")
+                    return FlowRunResult(index, error=exc)
+
+        async def finish(result):
+            results.append(result)
+            if callback:
+                await _maybe_await(callback(result))
+
+        items = enumerate(runs)
+        first = next(items, None)
+        if first is None:
+            return results
+        await finish(await start(*first))
+
+        pending = collections.deque()
+        for index, item in items:
+            if len(pending) >= max_pending:
+                await finish(await pending.popleft())
+            pending.append(asyncio.ensure_future(start(index, item)))
+        while pending:
+            await finish(await pending.popleft())
+
+        errors = len([r for r in results if not r.ok])
+        log.info(f"Started {len(results) - errors} runs, {errors} failed to start")
+        return results
+
+    async def get_status(self, run_id):
+        return await asyncio.to_thread(super().get_status, run_id)
+
+    async def progress(self, run_id, callback=None, delay=None):
+        """
+        Await self.get_status() until the flow completes, without blocking the event loop.
+        The callback may also be a coroutine function.
+
+        :param run_id: The action id for a running flow
+        :param callback: Called with each status response
+        :param delay: A fixed number of seconds to wait between checks, instead of adapting
+        :returns: The final status of the run
+        """
+        callback = callback or self._default_progress_callback
+        schedule = None
+        if delay is None:
+            schedule = await asyncio.to_thread(self.get_polling_schedule)
+        timer = gladier.utils.polling.RunTimer()
+        status = await self.get_status(run_id)
+        while status["status"] not in TERMINAL_RUN_STATUSES:
+            status = await self.get_status(run_id)
+            await _maybe_await(callback(status))
+            await asyncio.sleep(self._get_poll_interval(schedule, timer, status, delay))
+        await asyncio.to_thread(self._finish_polling, schedule, timer, status)
+        return status
+
+    async def get_details(self, run_id, state_name):
+        return await asyncio.to_thread(super().get_details, run_id, state_name)
@@ -1,5 +1,7 @@
 import logging
 import time
+import contextlib
+import contextvars
 import pathlib
 from typing import Callable, List, Set, Iterable, Union, Any, Mapping
 import typing as t
@@ -25,6 +27,21 @@ AUTHORIZER_MAP: TypeAlias = Mapping[
     str, Union[AccessTokenAuthorizer, RefreshTokenAuthorizer]
 ]
 
+_logins_disabled = contextvars.ContextVar("gladier_logins_disabled", default=False)
+
+
+@contextlib.contextmanager
+def logins_disabled():
+    """
+    Raise an AuthException instead of starting a login within this block. Work done in
+    background threads uses this, so any login happens on the caller's thread instead.
+    """
+    token = _logins_disabled.set(True)
+    try:
+        yield
+    finally:
+        _logins_disabled.reset(token)
+
 
 class BaseLoginManager(abc.ABC):
     def __init__(self, *args, **kwargs):
@@ -78,6 +95,10 @@ class BaseLoginManager(abc.ABC):
         authorizers = self.get_authorizers()
         missing = self.get_missing_authorizers(authorizers)
 
+        if missing and _logins_disabled.get():
+            raise AuthException(
+                f"Login required for missing scopes {missing}, but logins are disabled"
+            )
         if missing:
             log.info("Attempting login to fetch missing authorizers.")
             self.login(missing)
@@ -205,15 +226,11 @@ class ConfidentialClientLoginManager(BaseLoginManager):
         self.storage.write_tokens(response.by_resource_server)
 
     def by_scopes(self, tokens):
-        # Get a flat list of scopes
-        scopes = [tset["scope"].split() for tset in tokens.values()]
-        scopes = [item for sublist in scopes for item in sublist]
-
+        # If more than one token group contains a scope, the last one is used.
         token_group = {}
-        for scope in scopes:
-            for tgroup in tokens.values():
-                if scope in tgroup["scope"].split():
-                    token_group[scope] = tgroup
+        for tgroup in tokens.values():
+            for scope in tgroup["scope"].split():
+                token_group[scope] = tgroup
         return token_group
 
     def get_authorizers(
@@ -287,7 +304,12 @@ class UserAppLoginManager(BaseLoginManager):
     def get_token_storage(self) -> globus_sdk.token_storage.TokenStorage:
         """
         Uses Gladier Secrets Config to derive the filenames and sections for the Globus App Token Storage configuraiton.
+        Tokens are kept in memory if Gladier storage is not persisted to disk.
         """
+        backend = getattr(self.storage, "backend", None)
+        if not getattr(backend, "persistent", True):
+            log.info("Using in-memory Globus Token Storage")
+            return globus_sdk.token_storage.MemoryTokenStorage()
         filepath = self.get_filepath()
         ts = globus_sdk.token_storage.SQLiteTokenStorage(
             filepath, namespace=self.storage_namespace
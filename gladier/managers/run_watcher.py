@@ -0,0 +1,374 @@
+import time
+import asyncio
+import inspect
+import heapq
+import logging
+import itertools
+import concurrent.futures
+import typing as t
+
+from gladier.storage.run_cache import TERMINAL_RUN_STATUSES
+from gladier.utils.polling import PollingSchedule, RunTimer
+
+log = logging.getLogger(__name__)
+
+
+class WatchedRun:
+    """
+    The tracked state of a single run in a :class:`RunWatcher`.
+
+    :param run_id: The id of the run
+    :param callback: Called with each status response which is a transition for this run
+    """
+
+    def __init__(self, run_id: str, callback: t.Optional[t.Callable] = None):
+        self.run_id = run_id
+        self.callback = callback
+        self.status: t.Optional[dict] = None
+        self.checks = 0
+        self.unchanged_checks = 0
+        self.interval: t.Optional[float] = None
+        self.next_check = 0.0
+        self.timer = RunTimer()
+
+    @property
+    def done(self) -> bool:
+        return (
+            self.status is not None and self.status["status"] in TERMINAL_RUN_STATUSES
+        )
+
+    def __repr__(self):
+        status = self.status["status"] if self.status else None
+        return f"<{self.__class__.__name__} {self.run_id} {status}>"
+
+
+class RunWatcher:
+    """
+    Watch many flow runs at once from a single scheduler. Each run is checked when it is
+    next expected to change: runs which were recently seen changing are checked at
+    ``min_interval``, and runs which stay the same are checked less and less often, up to
+    ``max_interval``. Status requests are made in batches, and never faster than
+    ``requests_per_second`` no matter how many runs are watched.
+
+    Callbacks are only called when a run transitions to a new status, and not on every
+    status check.
+
+    Status requests in a batch are made from a pool of at most ``max_workers`` threads,
+    which is kept for the life of the watcher. The pool is shut down once iterating the
+    watcher finishes, or when ``close()`` is called.
+
+    .. code-block:: python
+
+        watcher = my_client.flows_manager.watch_runs(run_ids, requests_per_second=5)
+        for status in watcher:
+            print(f'{status["run_id"]} finished with {status["status"]}')
+
+    :param flows_manager: The flows manager used to fetch status with ``get_status()``
+    :param run_ids: Runs to start watching
+    :param callback: Called with the status response each time a run transitions
+    :param requests_per_second: The maximum rate of status requests
+    :param batch_size: The maximum number of status requests made in each batch
+    :param max_workers: The maximum number of status requests in flight at once
+    :param min_interval: The shortest time in seconds between checks of a single run
+    :param max_interval: The longest time in seconds between checks of a single run
+    :param backoff: The factor the interval for a run grows by each time it is unchanged
+    :param schedule: Decide the interval for each run with a polling schedule instead,
+        based on the state each run is in. Intervals are still kept between
+        ``min_interval`` and ``max_interval``. State durations observed are saved with the
+        flows manager's ``save_polling_schedule()`` once all runs finish.
+    """
+
+    def __init__(
+        self,
+        flows_manager,
+        run_ids: t.Iterable[str] = (),
+        callback: t.Optional[t.Callable[[dict], None]] = None,
+        requests_per_second: float = 5.0,
+        batch_size: int = 10,
+        max_workers: int = 4,
+        min_interval: float = 2.0,
+        max_interval: float = 60.0,
+        backoff: float = 2.0,
+        schedule: t.Optional[PollingSchedule] = None,
+    ):
+        self.flows_manager = flows_manager
+        self.callback = callback
+        self.requests_per_second = requests_per_second
+        self.batch_size = batch_size
+        self.max_workers = max(1, min(max_workers, batch_size))
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.schedule = schedule
+        self.runs: t.Dict[str, WatchedRun] = dict()
+        self.requests = 0
+        self._schedule: t.List[t.Tuple[float, int, str]] = list()
+        self._order = itertools.count()
+        self._next_batch = 0.0
+        self._executor: t.Optional[concurrent.futures.ThreadPoolExecutor] = None
+        for run_id in run_ids:
+            self.watch(run_id)
+
+    def watch(self, run_id: str, callback: t.Optional[t.Callable] = None) -> None:
+        """
+        Start watching a run. It will be checked on the next call to ``poll()``.
+
+        :param run_id: The run to watch
+        :param callback: Called on transitions for this run, in addition to the
+            callback for the watcher
+        """
+        if run_id in self.runs:
+            return
+        run = WatchedRun(run_id, callback=callback)
+        self.runs[run_id] = run
+        self._schedule_check(run, 0.0)
+
+    def unwatch(self, run_id: str) -> None:
+        """Stop watching a run"""
+        self.runs.pop(run_id, None)
+
+    @property
+    def active(self) -> t.List[WatchedRun]:
+        """Runs which have not finished"""
+        return [run for run in self.runs.values() if not run.done]
+
+    def _schedule_check(self, run: WatchedRun, when: float) -> None:
+        run.next_check = when
+        heapq.heappush(self._schedule, (when, next(self._order), run.run_id))
+
+    def get_transition_key(self, status: dict) -> t.Hashable:
+        """
+        Runs only transition when the value returned here changes. By default, this is
+        the run status, such as ACTIVE, INACTIVE, or SUCCEEDED.
+        """
+        return status["status"]
+
+    def get_interval(self, run: WatchedRun, changed: bool) -> float:
+        """
+        Get the time to wait before checking a run again.
+
+        :param run: The run which was just checked
+        :param changed: True if the run transitioned on the last check
+        """
+        if self.schedule is not None:
+            interval = self.schedule.get_interval(run.timer, time.monotonic())
+            return min(max(interval, self.min_interval), self.max_interval)
+        if changed or run.interval is None:
+            return self.min_interval
+        return min(run.interval * self.backoff, self.max_interval)
+
+    def _due_runs(self, now: float) -> t.List[WatchedRun]:
+        due = list()
+        while self._schedule and len(due) < self.batch_size:
+            when, _, run_id = self._schedule[0]
+            run = self.runs.get(run_id)
+            if run is None or run.done or run.next_check != when:
+                # Unwatched, finished, or re-scheduled since this entry was added
+                heapq.heappop(self._schedule)
+                continue
+            if when > now:
+                break
+            heapq.heappop(self._schedule)
+            due.append(run)
+        return due
+
+    def _fetch(self, runs: t.List[WatchedRun]) -> t.List[t.Optional[dict]]:
+        def get_status(run):
+            try:
+                return self.flows_manager.get_status(run.run_id)
+            except Exception as exc:
+                log.warning(f"Failed to get status for run {run.run_id}: {exc}")
+                return None
+
+        self.requests += len(runs)
+        if len(runs) == 1 or self.max_workers == 1:
+            return [get_status(run) for run in runs]
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="gladier-run-watcher"
+            )
+        return list(self._executor.map(get_status, runs))
+
+    def close(self) -> None:
+        """Shut down the threads used for status requests"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _take_batch(self) -> t.List[WatchedRun]:
+        """Take the runs which are due, if the request rate allows another batch"""
+        now = time.monotonic()
+        if now < self._next_batch:
+            return []
+        due = self._due_runs(now)
+        if due:
+            self._next_batch = now + len(due) / self.requests_per_second
+        return due
+
+    def _update_run(self, run: WatchedRun, status: t.Optional[dict]) -> bool:
+        """
+        Record the latest status for a run.
+
+        :returns: True if the run transitioned
+        """
+        run.checks += 1
+        changed = False
+        if status is not None:
+            finished = run.timer.update(status, time.monotonic())
+            if finished and self.schedule is not None:
+                self.schedule.record(*finished)
+            previous = run.status
+            run.status = status
+            changed = previous is None or self.get_transition_key(
+                previous
+            ) != self.get_transition_key(status)
+        run.unchanged_checks = 0 if changed else run.unchanged_checks + 1
+        return changed
+
+    def _notify(self, run: WatchedRun, status: dict) -> None:
+        for callback in (self.callback, run.callback):
+            if callback:
+                callback(status)
+
+    def _reschedule(self, run: WatchedRun, changed: bool) -> None:
+        run.interval = self.get_interval(run, changed)
+        self._schedule_check(run, time.monotonic() + run.interval)
+
+    def _handle_statuses(
+        self, runs: t.List[WatchedRun], statuses: t.List[t.Optional[dict]]
+    ) -> t.List[dict]:
+        completed = list()
+        for run, status in zip(runs, statuses):
+            if run.run_id not in self.runs:
+                continue
+            changed = self._update_run(run, status)
+            if changed:
+                self._notify(run, status)
+            if run.done:
+                completed.append(status)
+            else:
+                self._reschedule(run, changed)
+        return completed
+
+    def poll(self) -> t.List[dict]:
+        """
+        Check the status of runs which are due, if the request rate allows it.
+
+        :returns: The final status of any runs which finished
+        """
+        due = self._take_batch()
+        if not due:
+            return []
+        return self._handle_statuses(due, self._fetch(due))
+
+    def get_wait_time(self) -> t.Optional[float]:
+        """
+        :returns: Seconds until the next status check can be made, or None if no runs are
+            left to check
+        """
+        active = [run.next_check for run in self.runs.values() if not run.done]
+        if not active:
+            return None
+        return max(min(active), self._next_batch) - time.monotonic()
+
+    def __iter__(self) -> t.Iterator[dict]:
+        """
+        Wait for all watched runs to finish, yielding the final status of each as it does.
+        """
+        try:
+            while True:
+                yield from self.poll()
+                wait = self.get_wait_time()
+                if wait is None:
+                    if self.schedule is not None:
+                        self.flows_manager.save_polling_schedule(self.schedule)
+                    return
+                if wait > 0:
+                    time.sleep(wait)
+        finally:
+            self.close()
+
+
+class AsyncRunWatcher(RunWatcher):
+    """
+    A :class:`RunWatcher` for use within an asyncio event loop, with a flows manager
+    whose ``get_status()`` is a coroutine, such as
+    :class:`gladier.managers.flows_manager.AsyncFlowsManager`. Each batch of status
+    requests is awaited together, with at most ``max_workers`` in flight, and waiting
+    between batches never blocks the loop. Callbacks may also be coroutine functions.
+
+    .. code-block:: python
+
+        watcher = my_async_client.watch_runs(run_ids)
+        async for status in watcher:
+            print(f'{status["run_id"]} finished with {status["status"]}')
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._callback_results: t.List[t.Awaitable] = list()
+        super().__init__(*args, **kwargs)
+
+    async def _fetch(self, runs: t.List[WatchedRun]) -> t.List[t.Optional[dict]]:
+        workers = asyncio.Semaphore(self.max_workers)
+
+        async def get_status(run):
+            try:
+                async with workers:
+                    return await self.flows_manager.get_status(run.run_id)
+            except Exception as exc:
+                log.warning(f"Failed to get status for run {run.run_id}: {exc}")
+                return None
+
+        self.requests += len(runs)
+        return list(await asyncio.gather(*[get_status(run) for run in runs]))
+
+    def _notify(self, run: WatchedRun, status: dict) -> None:
+        for callback in (self.callback, run.callback):
+            if callback:
+                result = callback(status)
+                if inspect.isawaitable(result):
+                    self._callback_results.append(result)
+
+    async def poll(self) -> t.List[dict]:
+        """
+        Check the status of runs which are due, if the request rate allows it.
+
+        :returns: The final status of any runs which finished
+        """
+        due = self._take_batch()
+        if not due:
+            return []
+        completed = self._handle_statuses(due, await self._fetch(due))
+        results, self._callback_results = self._callback_results, list()
+        for result in results:
+            await result
+        return completed
+
+    def __iter__(self):
+        raise TypeError(
+            f"{self.__class__.__name__} must be iterated with 'async for' "
+            f"within an event loop"
+        )
+
+    async def __aiter__(self) -> t.AsyncIterator[dict]:
+        """
+        Wait for all watched runs to finish, yielding the final status of each as it does.
+        """
+        while True:
+            for status in await self.poll():
+                yield status
+            wait = self.get_wait_time()
+            if wait is None:
+                if self.schedule is not None:
+                    await asyncio.to_thread(
+                        self.flows_manager.save_polling_schedule, self.schedule
+                    )
+                return
+            if wait > 0:
+                await asyncio.sleep(wait)
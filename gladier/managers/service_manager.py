@@ -3,7 +3,7 @@ from typing import List, Optional
 import abc
 from gladier.managers.login_manager import BaseLoginManager
 from gladier.storage.config import GladierConfig
-
+from gladier.utils.transport import PooledTransport
 
 log = logging.getLogger(__name__)
 
@@ -13,9 +13,11 @@ class ServiceManager(abc.ABC):
         self,
         storage: Optional[GladierConfig] = None,
         login_manager: Optional[BaseLoginManager] = None,
+        transport: Optional[PooledTransport] = None,
         **kwargs,
     ):
         self._storage = storage
+        self.transport = transport
 
         self.login_manager = login_manager
         self.register_scopes()
@@ -51,6 +53,18 @@ class ServiceManager(abc.ABC):
         self.login_manager.add_requirements(self.get_scopes())
         log.debug(f"Login Manager for {self} set to {self.login_manager}")
 
+    def set_transport(self, transport: PooledTransport, replace: bool = True) -> None:
+        """
+        Set the transport used by service clients this manager creates. Clients which
+        were already created keep their transport.
+        """
+        if replace:
+            log.info(f"Replacing transport {self.transport} with {transport}")
+            self.transport = transport
+        else:
+            self.transport = self.transport or transport
+        log.debug(f"Transport for {self} set to {self.transport}")
+
     def register_scopes(self):
         """
         Register scopes returned by `get_scopes()` with the login manager"""
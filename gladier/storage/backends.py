@@ -0,0 +1,585 @@
+import os
+import re
+import abc
+import copy
+import json
+import logging
+import pathlib
+import sqlite3
+import tempfile
+import threading
+import contextlib
+import configparser
+import typing as t
+
+import gladier.exc
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    # Advisory locking is not available on Windows, writes are still atomic.
+    fcntl = None
+
+log = logging.getLogger(__name__)
+
+# Section data by name, ex: {"my_section": {"flow_id": "my_flow_id"}}
+StorageData = t.Dict[str, t.Dict[str, str]]
+# Changes by section name. A value of None means the option was removed, and a section
+# of None means the whole section was removed.
+StorageChanges = t.Dict[str, t.Optional[t.Dict[str, t.Optional[str]]]]
+
+
+class SectionUpdate(dict):
+    """
+    Changes to a section which already existed when the writer loaded it. If another
+    writer has removed the section since, the changes are dropped instead of adding the
+    section back. Changes given as a plain dict always create the section.
+    """
+
+
+def get_data_size(data: t.Union[StorageData, StorageChanges]) -> int:
+    """
+    :returns: The size of storage data in bytes, as it would be serialized in a config file
+    """
+    return sum(
+        len(f"{name} = {value}\n".encode())
+        for values in data.values()
+        for name, value in (values or {}).items()
+        if value is not None
+    )
+
+
+def apply_changes(data: StorageData, changes: StorageChanges) -> StorageData:
+    """
+    Apply changes to storage data in place.
+
+    :returns: The updated storage data
+    """
+    for section, values in changes.items():
+        if values is None:
+            data.pop(section, None)
+            continue
+        if isinstance(values, SectionUpdate) and section not in data:
+            log.debug(f"Section {section} was removed, dropping changes to it")
+            continue
+        section_data = data.setdefault(section, {})
+        for name, value in values.items():
+            if value is None:
+                section_data.pop(name, None)
+            else:
+                section_data[name] = value
+    return data
+
+
+# Files SQLite keeps next to a database in WAL mode
+SQLITE_SIDECAR_SUFFIXES = ("-wal", "-shm")
+
+
+def create_database_file(filename, permission: int) -> None:
+    """
+    Create an empty SQLite database file with restricted permissions, if it does not
+    already exist. SQLite creates the WAL sidecar files with the same permissions as the
+    database, so they are restricted too.
+    """
+    try:
+        fd = os.open(filename, os.O_CREAT | os.O_EXCL | os.O_WRONLY, permission)
+    except FileExistsError:
+        return
+    os.close(fd)
+    os.chmod(filename, permission)
+
+
+def restrict_database_files(filename, permission: int) -> None:
+    """Set permissions on an SQLite database and any WAL sidecar files it has"""
+    for name in [str(filename)] + [f"{filename}{s}" for s in SQLITE_SIDECAR_SUFFIXES]:
+        with contextlib.suppress(FileNotFoundError):
+            os.chmod(name, permission)
+
+
+class StorageBackend(abc.ABC):
+    """
+    A storage backend persists Gladier storage data, and is used by a
+    :class:`gladier.storage.config.GladierConfig` to load and save values. Backends may
+    choose to only operate on the sections requested, or return every section available.
+
+    :param filename: The location for storage
+    :param permission: File permissions to set on storage, if any
+    """
+
+    #: The file suffix used by this backend, when Gladier chooses a default filename
+    file_suffix = ".cfg"
+    #: Whether this backend keeps data on disk
+    persistent = True
+
+    def __init__(self, filename, permission: t.Optional[int] = None):
+        self.filename = filename
+        self.permission = permission
+        self._bytes_read = 0
+        self._bytes_written = 0
+
+    def get_io_bytes(self) -> t.Tuple[int, int]:
+        """
+        :returns: A tuple of the total (bytes_read, bytes_written) by this backend
+        """
+        return self._bytes_read, self._bytes_written
+
+    @abc.abstractmethod
+    def get_signature(self, sections: t.Iterable[str]) -> t.Optional[t.Hashable]:
+        """
+        Get a cheap signature for the current version of storage. The signature must
+        change any time the data for ``sections`` changes.
+
+        :returns: A hashable signature, or None if storage does not exist yet
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def read(
+        self, sections: t.Optional[t.Iterable[str]]
+    ) -> t.Tuple[StorageData, t.Optional[t.Hashable]]:
+        """
+        Read the data for ``sections`` from storage, or every section if ``sections``
+        is None.
+
+        :returns: A tuple of (data, signature) for the data that was read
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def write(
+        self, changes: StorageChanges, sections: t.Iterable[str]
+    ) -> t.Tuple[StorageData, t.Optional[t.Hashable]]:
+        """
+        Merge ``changes`` into storage. Changes must be applied all at once, on top of the
+        latest version of storage, such that concurrent writers do not lose each others updates.
+
+        :returns: A tuple of (data, signature) for ``sections`` after the write
+        """
+        raise NotImplementedError()
+
+
+class ConfigFileBackend(StorageBackend):
+    """
+    Store data in a configparser INI file. Every section is kept in a single file. Writes
+    take an advisory lock, merge changes into the latest version of the file on disk, and
+    then atomically replace it.
+    """
+
+    def get_signature(self, sections=None):
+        try:
+            stat = os.stat(self.filename)
+        except (OSError, TypeError, ValueError):
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def read(self, sections=None):
+        signature = self.get_signature()
+        parser = configparser.ConfigParser(interpolation=None)
+        parser.read(self.filename)
+        if signature is not None:
+            self._bytes_read += signature[1]
+        return {s: dict(parser.items(s)) for s in parser.sections()}, signature
+
+    def write(self, changes, sections=None):
+        with self.lock():
+            data, _ = self.read()
+            apply_changes(data, changes)
+            self._write_atomic(data)
+            signature = self.get_signature()
+        self._bytes_written += signature[1]
+        return data, signature
+
+    @contextlib.contextmanager
+    def lock(self):
+        """
+        Hold an exclusive advisory lock on the config file. The lock is held on a separate
+        ``.lock`` file, since the config file itself is replaced on each write.
+        """
+        if fcntl is None:  # pragma: no cover
+            yield
+            return
+        with open(f"{self.filename}.lock", "a") as lockfile:
+            fcntl.flock(lockfile.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lockfile.fileno(), fcntl.LOCK_UN)
+
+    def _write_atomic(self, data: StorageData) -> None:
+        parser = configparser.ConfigParser(interpolation=None)
+        parser.read_dict(data)
+        dirname, basename = os.path.split(os.path.abspath(self.filename))
+        fd, tmp_filename = tempfile.mkstemp(prefix=f".{basename}.", dir=dirname)
+        try:
+            with os.fdopen(fd, "w") as configfile:
+                parser.write(configfile)
+            if self.permission is not None:
+                os.chmod(tmp_filename, self.permission)
+            elif os.path.exists(self.filename):
+                os.chmod(tmp_filename, os.stat(self.filename).st_mode)
+            else:
+                umask = os.umask(0)
+                os.umask(umask)
+                os.chmod(tmp_filename, 0o666 & ~umask)
+            os.replace(tmp_filename, self.filename)
+        except BaseException:
+            os.unlink(tmp_filename)
+            raise
+
+
+class SQLiteBackend(StorageBackend):
+    """
+    Store data in an SQLite database, with one row per section and option. Only requested
+    sections are read, and writes only touch the rows that changed, so storage stays fast
+    no matter how many client sections share the same database. The database uses WAL mode,
+    so readers are not blocked by concurrent writers. Removed sections keep their row in
+    ``gladier_sections`` with a negative version, so their version keeps increasing if
+    they are added again.
+    """
+
+    file_suffix = ".sqlite"
+    #: The first bytes of every SQLite database file
+    file_header = b"SQLite format 3\x00"
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS gladier_sections ("
+        "section TEXT PRIMARY KEY, version INTEGER NOT NULL DEFAULT 0)",
+        "CREATE TABLE IF NOT EXISTS gladier_storage ("
+        "section TEXT NOT NULL, name TEXT NOT NULL, value TEXT NOT NULL, "
+        "PRIMARY KEY (section, name)) WITHOUT ROWID",
+    )
+
+    def __init__(self, *args, timeout: float = 30.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.timeout = timeout
+        self._connection = None
+        self._connection_lock = threading.RLock()
+        self._check_database_file()
+
+    def _check_database_file(self) -> None:
+        """
+        :raises: gladier.exc.ConfigException if the filename is an existing file which is
+            not an SQLite database, such as an INI config file
+        """
+        try:
+            with open(self.filename, "rb") as f:
+                header = f.read(len(self.file_header))
+        except FileNotFoundError:
+            return
+        if header and header != self.file_header:
+            raise gladier.exc.ConfigException(
+                f"Storage file {self.filename} is not an SQLite database. Use a "
+                f"{self.file_suffix} filename with the sqlite storage backend, and "
+                f"existing config files will be migrated into it."
+            )
+
+    @property
+    def legacy_config_filename(self) -> t.Optional[pathlib.Path]:
+        """The INI config file this database replaces, which may be migrated into it"""
+        legacy = pathlib.Path(self.filename).with_suffix(ConfigFileBackend.file_suffix)
+        return None if legacy == pathlib.Path(self.filename) else legacy
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            exists = os.path.exists(self.filename)
+            if not exists and self.permission is not None:
+                create_database_file(self.filename, self.permission)
+            conn = sqlite3.connect(
+                self.filename,
+                timeout=self.timeout,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            for statement in self.SCHEMA:
+                conn.execute(statement)
+            if not exists and self.permission is not None:
+                restrict_database_files(self.filename, self.permission)
+            self._connection = conn
+        return self._connection
+
+    @staticmethod
+    def _placeholders(sections: t.Sequence[str]) -> str:
+        return ", ".join("?" for _ in sections)
+
+    def _get_signature(self, sections: t.Sequence[str]):
+        rows = self.connection.execute(
+            "SELECT section, version FROM gladier_sections "
+            f"WHERE section IN ({self._placeholders(sections)}) ORDER BY section",
+            sections,
+        ).fetchall()
+        return tuple(rows)
+
+    def _read(self, sections: t.Sequence[str]) -> StorageData:
+        placeholders = self._placeholders(sections)
+        data = {
+            section: {}
+            for section, in self.connection.execute(
+                "SELECT section FROM gladier_sections "
+                f"WHERE section IN ({placeholders}) AND version >= 0",
+                sections,
+            )
+        }
+        for section, name, value in self.connection.execute(
+            "SELECT section, name, value FROM gladier_storage "
+            f"WHERE section IN ({placeholders})",
+            sections,
+        ):
+            data[section][name] = value
+        return data
+
+    def get_signature(self, sections):
+        with self._connection_lock:
+            return self._get_signature(list(sections))
+
+    def _get_sections(self) -> t.List[str]:
+        return [
+            section
+            for section, in self.connection.execute(
+                "SELECT section FROM gladier_sections WHERE version >= 0"
+            )
+        ]
+
+    def read(self, sections):
+        with self._connection_lock, self.transaction():
+            sections = self._get_sections() if sections is None else list(sections)
+            data = self._read(sections)
+            self._bytes_read += get_data_size(data)
+            return data, self._get_signature(sections)
+
+    def write(self, changes, sections):
+        sections = list(sections)
+        with self._connection_lock, self.transaction(immediate=True):
+            for section, values in changes.items():
+                self._write_section(section, values)
+            self._bytes_written += get_data_size(changes)
+            data = self._read(sections)
+            self._bytes_read += get_data_size(data)
+            return data, self._get_signature(sections)
+
+    def _write_section(
+        self, section: str, values: t.Optional[t.Dict[str, t.Optional[str]]]
+    ) -> None:
+        conn = self.connection
+        row = conn.execute(
+            "SELECT version FROM gladier_sections WHERE section = ?", (section,)
+        ).fetchone()
+        exists = row is not None and row[0] >= 0
+        if values is None:
+            conn.execute("DELETE FROM gladier_storage WHERE section = ?", (section,))
+            conn.execute(
+                "UPDATE gladier_sections SET version = -(ABS(version) + 1) "
+                "WHERE section = ?",
+                (section,),
+            )
+            return
+        if isinstance(values, SectionUpdate) and not exists:
+            log.debug(f"Section {section} was removed, dropping changes to it")
+            return
+        conn.execute(
+            "INSERT OR IGNORE INTO gladier_sections (section) VALUES (?)", (section,)
+        )
+        conn.execute(
+            "UPDATE gladier_sections SET version = ABS(version) + 1 WHERE section = ?",
+            (section,),
+        )
+        conn.executemany(
+            "DELETE FROM gladier_storage WHERE section = ? AND name = ?",
+            [(section, k) for k, v in values.items() if v is None],
+        )
+        conn.executemany(
+            "INSERT INTO gladier_storage (section, name, value) VALUES (?, ?, ?) "
+            "ON CONFLICT (section, name) DO UPDATE SET value = excluded.value",
+            [(section, k, v) for k, v in values.items() if v is not None],
+        )
+
+    @contextlib.contextmanager
+    def transaction(self, immediate: bool = False):
+        conn = self.connection
+        conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def close(self):
+        with self._connection_lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+class ShardedConfigFileBackend(StorageBackend):
+    """
+    Store each section in its own INI config file inside a directory, along with a small
+    index of all sections. Lookups and writes only touch the shards for the sections involved,
+    so large numbers of clients sharing a client id don't contend over one file. Each shard
+    is written like a :class:`ConfigFileBackend`, but changes spanning multiple sections are
+    not applied atomically.
+    """
+
+    file_suffix = ".d"
+    index_section = "sections"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._shards = dict()
+        self._index = None
+
+    @property
+    def legacy_config_filename(self) -> pathlib.Path:
+        """The INI config file these shards replace, which may be migrated into them"""
+        return pathlib.Path(self.filename).with_suffix(ConfigFileBackend.file_suffix)
+
+    @property
+    def index(self) -> ConfigFileBackend:
+        """The index of all sections, and the shard filenames they are stored in"""
+        if self._index is None:
+            self._index = ConfigFileBackend(os.path.join(self.filename, "index.cfg"))
+        return self._index
+
+    def get_shard(self, section: str) -> ConfigFileBackend:
+        if section not in self._shards:
+            shard_name = re.sub(r"[^A-Za-z0-9_.-]", "_", section)
+            self._shards[section] = ConfigFileBackend(
+                os.path.join(self.filename, f"{shard_name}.cfg"),
+                permission=self.permission,
+            )
+        return self._shards[section]
+
+    def get_io_bytes(self):
+        backends = list(self._shards.values()) + [self.index]
+        io_bytes = [backend.get_io_bytes() for backend in backends]
+        return sum(r for r, _ in io_bytes), sum(w for _, w in io_bytes)
+
+    def get_sections(self) -> t.List[str]:
+        """
+        :returns: The names of all sections in storage
+        """
+        data, _ = self.index.read()
+        return list(data.get(self.index_section, {}))
+
+    def get_signature(self, sections):
+        signatures = tuple(self.get_shard(s).get_signature() for s in sections)
+        if all(signature is None for signature in signatures):
+            return None
+        return signatures
+
+    def read(self, sections):
+        sections = self.get_sections() if sections is None else list(sections)
+        data, signatures = dict(), list()
+        for section in sections:
+            shard_data, signature = self.get_shard(section).read()
+            if section in shard_data:
+                data[section] = shard_data[section]
+            signatures.append(signature)
+        if all(signature is None for signature in signatures):
+            return data, None
+        return data, tuple(signatures)
+
+    def write(self, changes, sections):
+        os.makedirs(self.filename, exist_ok=True)
+        index_changes = dict()
+        for section, values in changes.items():
+            shard = self.get_shard(section)
+            shard_data, _ = shard.write({section: values})
+            if not isinstance(values, SectionUpdate):
+                # The section was added or removed, so the index needs updating
+                index_changes[section] = (
+                    os.path.basename(shard.filename) if section in shard_data else None
+                )
+        if index_changes:
+            self.index.write({self.index_section: index_changes})
+        return self.read(sections)
+
+
+class MemoryBackend(StorageBackend):
+    """
+    Keep all data in memory, for stateless workers where the home directory is read-only
+    or thrown away. Nothing is read from or written to disk. Storage can be seeded with a
+    snapshot of previously exported data, and exported again afterwards so any changes
+    (such as newly deployed flow ids) can be persisted elsewhere.
+
+    .. code-block:: python
+
+        backend = MemoryBackend(data=os.environ["GLADIER_STORAGE_SNAPSHOT"])
+        ...
+        # Persist changes to a config file
+        ConfigFileBackend("gladier.cfg").write(backend.export(), [])
+
+    :param data: A snapshot to seed storage, as a dict or JSON string
+    """
+
+    persistent = False
+
+    def __init__(
+        self,
+        filename=None,
+        permission: t.Optional[int] = None,
+        data: t.Union[StorageData, str, None] = None,
+    ):
+        super().__init__(filename, permission=permission)
+        if isinstance(data, str):
+            data = json.loads(data)
+        self.data: StorageData = {
+            section: {str(k): str(v) for k, v in values.items()}
+            for section, values in (data or {}).items()
+        }
+        self.version = 0
+        self._lock = threading.Lock()
+
+    def _select(self, sections: t.Optional[t.Iterable[str]]) -> StorageData:
+        sections = self.data if sections is None else sections
+        return {s: dict(self.data[s]) for s in sections if s in self.data}
+
+    def get_signature(self, sections=None):
+        return self.version
+
+    def read(self, sections):
+        with self._lock:
+            return self._select(sections), self.version
+
+    def write(self, changes, sections):
+        with self._lock:
+            apply_changes(self.data, changes)
+            self.version += 1
+            return self._select(sections), self.version
+
+    def export(self) -> StorageData:
+        """
+        :returns: A copy of all data in storage, which can be used to seed a new backend
+        """
+        with self._lock:
+            return copy.deepcopy(self.data)
+
+    def export_json(self) -> str:
+        """
+        :returns: All data in storage as a JSON string
+        """
+        return json.dumps(self.export(), sort_keys=True)
+
+
+BACKENDS = {
+    "config": ConfigFileBackend,
+    "sqlite": SQLiteBackend,
+    "sharded": ShardedConfigFileBackend,
+    "memory": MemoryBackend,
+}
+
+
+def get_backend_class(name: str) -> t.Type[StorageBackend]:
+    """
+    Get a storage backend class by name
+
+    :raises gladier.exc.ConfigException: If no backend exists by that name
+    """
+    try:
+        return BACKENDS[name]
+    except KeyError:
+        raise gladier.exc.ConfigException(
+            f'Unknown storage backend "{name}", must be one of {list(BACKENDS)}'
+        ) from None
@@ -1,34 +1,208 @@
+import copy
 import logging
+import functools
+import threading
+import contextlib
 import configparser
-from gladier.storage.migrations import needs_migration, migrate_gladier
+import typing as t
+from gladier.storage import profiler
+from gladier.storage.backends import StorageBackend, ConfigFileBackend, SectionUpdate
+from gladier.storage.migrations import (
+    is_current_version,
+    needs_migration,
+    migrate_gladier,
+)
 
 log = logging.getLogger(__name__)
 
 
+def synchronized(method):
+    """Hold the config lock while calling a method"""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
 class GladierConfig(configparser.ConfigParser):
-    def __init__(self, filename, section="default"):
+    """
+    Gladier storage for a single section, with a configparser interface. Values are
+    persisted through a :class:`gladier.storage.backends.StorageBackend`, which defaults
+    to an INI config file. Saved changes are merged into the latest version of storage,
+    so multiple processes can safely share the same config. Loading, saving, and
+    transactions hold a lock, so threads can also share the same config.
+
+    :param filename: The storage location
+    :param section: The section used by ``get_value()``, ``set_value()``, and ``del_value()``
+    :param backend: The storage backend to use. Defaults to a ``ConfigFileBackend``
+    """
+
+    DEFAULT_PERMISSION = None
+
+    def __init__(
+        self,
+        filename,
+        section: str = "default",
+        backend: t.Optional[StorageBackend] = None,
+    ):
+        self._lock = threading.RLock()
         super().__init__()
         self.section = section
         self.filename = filename
+        self.backend = backend or ConfigFileBackend(
+            filename, permission=self.DEFAULT_PERMISSION
+        )
+        self._signature = None
+        self._baseline = dict()
+        self._transaction_depth = 0
         self.load()
 
+    @property
+    def tracked_sections(self) -> t.List[str]:
+        """Sections which are loaded from storage"""
+        return ["general", self.section]
+
+    def get_snapshot(self) -> dict:
+        """
+        :returns: a dict copy of all sections and values currently in the config
+        """
+        return {s: dict(self.items(s, raw=True)) for s in self.sections()}
+
+    def get_changes(self) -> dict:
+        """
+        Get all changes made to this config since it was last loaded or saved. Values of
+        None denote an option which was removed, and sections of None denote a section
+        which was removed. Changes to sections which were loaded are given as a
+        :class:`gladier.storage.backends.SectionUpdate`, so they don't add the section
+        back if another writer removed it in the meantime.
+
+        :returns: a dict of changed options by section
+        """
+        current = self.get_snapshot()
+        changes = dict()
+        for section in set(self._baseline) | set(current):
+            if section not in current:
+                changes[section] = None
+                continue
+            old, new = self._baseline.get(section, {}), current[section]
+            changed = {k: v for k, v in new.items() if old.get(k) != v}
+            changed.update({k: None for k in old if k not in new})
+            if section not in self._baseline:
+                changes[section] = changed
+            elif changed:
+                changes[section] = SectionUpdate(changed)
+        return changes
+
+    def _set_state(self, data: dict, signature, replace: bool = True) -> None:
+        if replace:
+            for section in self.sections():
+                self.remove_section(section)
+        self.read_dict(data)
+        self._signature = signature
+        self._baseline = self.get_snapshot()
+
+    @property
+    def in_transaction(self) -> bool:
+        return self._transaction_depth > 0
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        Collect all changes made within the block, and save them to storage in a single
+        write when the outermost transaction exits. Storage is not re-loaded while the
+        transaction is open, and other threads wait for it to exit before using this
+        config. Changes are still saved if an exception is raised, since they
+        typically track things which were already registered with Globus services.
+
+        .. code-block:: python
+
+            with storage.transaction():
+                storage.set_value("flow_id", flow_id)
+                storage.set_value("flow_checksum", flow_checksum)
+        """
+        with self._lock:
+            if not self.in_transaction:
+                self.load()
+            self._transaction_depth += 1
+            try:
+                yield self
+            finally:
+                self._transaction_depth -= 1
+                if not self.in_transaction:
+                    self.save()
+
+    @synchronized
     def load(self):
-        self.read(self.filename)
+        if self.in_transaction:
+            profiler.record(loads=1)
+            return
+        reads, bytes_read = 0, self.backend.get_io_bytes()[0]
+        with profiler.Timer() as timer:
+            signature = self.backend.get_signature(self.tracked_sections)
+            if signature is None or signature != self._signature:
+                data, signature = self.backend.read(self.tracked_sections)
+                # Storage was changed by someone else, drop anything that may have been
+                # removed from it. If nothing was stored yet, keep anything that may have
+                # been set.
+                replace = signature is not None and self._signature is not None
+                self._set_state(data, signature, replace=replace)
+                reads = 1
+        profiler.record(
+            loads=1,
+            reads=reads,
+            bytes_read=self.backend.get_io_bytes()[0] - bytes_read,
+            seconds=timer.seconds,
+        )
         if self.section not in self.sections():
             log.debug(f"Section {self.section} missing, adding to config.")
             self[self.section] = {}
             self.save()
 
+    @synchronized
     def save(self):
-        with open(self.filename, "w") as configfile:
-            self.write(configfile)
-            log.debug(f"Saved local gladier config to {configfile}")
+        """
+        Save changes made to this config. Changes are merged into the latest version of
+        storage, so values written by other processes since this config was loaded are kept.
+        Saves within a ``transaction()`` are deferred until the transaction exits.
+        """
+        changes = self.get_changes()
+        if self.in_transaction or not changes:
+            return
+        bytes_read, bytes_written = self.backend.get_io_bytes()
+        with profiler.Timer() as timer:
+            data, signature = self.backend.write(changes, self.tracked_sections)
+            self._set_state(data, signature)
+        io_bytes = self.backend.get_io_bytes()
+        profiler.record(
+            saves=1,
+            bytes_read=io_bytes[0] - bytes_read,
+            bytes_written=io_bytes[1] - bytes_written,
+            seconds=timer.seconds,
+        )
+        log.debug(f"Saved local gladier config to {self.filename}")
 
+    @synchronized
     def update(self):
-        if needs_migration(self):
-            self = migrate_gladier(self)
-            self.save()
+        """
+        Apply any migrations storage needs. Migrations see every section in storage, not
+        only ``tracked_sections``, so they behave the same with every backend.
+        """
+        if is_current_version(self):
+            return
+        with self.transaction():
+            data, _ = self.backend.read(None)
+            untracked = {s: v for s, v in data.items() if s not in self.sections()}
+            self.read_dict(untracked)
+            self._baseline.update(copy.deepcopy(untracked))
+            if needs_migration(self):
+                migrate_gladier(self)
+        # Only keep tracked sections loaded
+        self._set_state(*self.backend.read(self.tracked_sections))
 
+    @synchronized
     def get_value(self, name: str) -> str:
         try:
             self.load()
@@ -36,11 +210,13 @@ class GladierConfig(configparser.ConfigParser):
         except configparser.NoOptionError:
             return None
 
+    @synchronized
     def set_value(self, name: str, value: str):
         self.load()
         self.set(self.section, name, value)
         self.save()
 
+    @synchronized
     def del_value(self, name: str) -> None:
         self.load()
         self.remove_option(self.section, name)
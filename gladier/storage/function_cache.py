@@ -0,0 +1,219 @@
+import os
+import types
+import sqlite3
+import hashlib
+import inspect
+import logging
+import threading
+import typing as t
+
+from gladier.storage.backends import create_database_file, restrict_database_files
+
+log = logging.getLogger(__name__)
+
+
+def get_const_repr(const: t.Any) -> str:
+    """
+    :returns: A repr of a code constant which is the same in every process. Sets are
+        ordered by hash, which differs between processes for strings, so the items of
+        frozensets are sorted, including those nested in tuples.
+    """
+    if isinstance(const, frozenset):
+        return f"frozenset({{{', '.join(sorted(get_const_repr(c) for c in const))}}})"
+    if isinstance(const, tuple):
+        return f"({''.join(f'{get_const_repr(c)}, ' for c in const)})"
+    return repr(const)
+
+
+def get_code_digest(code: types.CodeType) -> str:
+    """
+    :returns: A SHA-256 digest of a code object's bytecode, names, and constants, including
+        any nested code objects such as inner functions
+    """
+    sha = hashlib.sha256()
+
+    def update(code):
+        sha.update(code.co_code)
+        sha.update(repr((code.co_names, code.co_varnames, code.co_freevars)).encode())
+        for const in code.co_consts:
+            if isinstance(const, types.CodeType):
+                update(const)
+            else:
+                sha.update(get_const_repr(const).encode())
+
+    update(code)
+    return sha.hexdigest()
+
+
+CodeIdentity = t.Tuple[str, int, str, str, str]
+
+
+def get_code_identity(function: t.Callable) -> t.Optional[CodeIdentity]:
+    """
+    Identify the code of a function by the file it was defined in, when that file was last
+    modified, its qualified name and name, and a digest of its code. Any change to the
+    function's source changes its identity.
+
+    :returns: A tuple of (path, mtime_ns, qualname, name, code digest), or None if the
+        function was not defined in a file, such as in an interactive session
+    """
+    code = getattr(function, "__code__", None)
+    if code is None:
+        return None
+    try:
+        path = inspect.getsourcefile(function)
+        if path is None:
+            return None
+        path = os.path.abspath(path)
+        mtime = os.stat(path).st_mtime_ns
+    except (TypeError, OSError):
+        return None
+    return (
+        path,
+        mtime,
+        function.__qualname__,
+        function.__name__,
+        get_code_digest(code),
+    )
+
+
+class FunctionChecksumCache:
+    """
+    A cache of compute function checksums, keyed on the identity of each function's code.
+    Computing a checksum requires serializing the function, while checking its identity
+    only needs a ``stat()`` of its source file, so functions which have not changed since
+    they were last seen skip serialization entirely.
+
+    Checksums are always kept in memory. If a filename is given they are also stored in an
+    SQLite database, so they are kept between processes.
+
+    :param filename: The database file. If None, checksums are only kept in memory.
+    :param namespace: Included in every key, such as the serialization strategy, so that
+        checksums made different ways are never mixed up
+    :param permission: File permissions to set on a new database, if any
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS gladier_function_checksums ("
+        "key TEXT PRIMARY KEY, path TEXT NOT NULL, qualname TEXT NOT NULL, "
+        "checksum TEXT NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS gladier_function_checksums_function "
+        "ON gladier_function_checksums (path, qualname)",
+    )
+
+    def __init__(
+        self,
+        filename: t.Optional[t.Union[str, os.PathLike]] = None,
+        namespace: str = "",
+        permission: t.Optional[int] = None,
+    ):
+        self.filename = os.path.expanduser(filename) if filename else None
+        self.namespace = namespace
+        self.permission = permission
+        self.hits = 0
+        self.misses = 0
+        self._memory: t.Dict[str, str] = dict()
+        self._connection = None
+        self._lock = threading.RLock()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            exists = os.path.exists(self.filename)
+            if not exists and self.permission is not None:
+                create_database_file(self.filename, self.permission)
+            conn = sqlite3.connect(
+                self.filename, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            for statement in self.SCHEMA:
+                conn.execute(statement)
+            if not exists and self.permission is not None:
+                restrict_database_files(self.filename, self.permission)
+            self._connection = conn
+        return self._connection
+
+    def get_key(self, identity: CodeIdentity) -> str:
+        return hashlib.sha256(repr((self.namespace,) + identity).encode()).hexdigest()
+
+    def get_checksum(
+        self, function: t.Callable, compute: t.Callable[[t.Callable], str]
+    ) -> str:
+        """
+        Get the checksum of a function from the cache, or compute and cache it.
+
+        :param function: The function to get a checksum for
+        :param compute: Called with the function to compute its checksum on a cache miss
+        :returns: The function checksum
+        """
+        identity = get_code_identity(function)
+        if identity is None:
+            return compute(function)
+        key = self.get_key(identity)
+        checksum = self._get(key)
+        if checksum is not None:
+            self.hits += 1
+            return checksum
+        self.misses += 1
+        checksum = compute(function)
+        self._set(key, identity, checksum)
+        return checksum
+
+    def _get(self, key: str) -> t.Optional[str]:
+        with self._lock:
+            checksum = self._memory.get(key)
+            if checksum is None and self.filename is not None:
+                row = self.connection.execute(
+                    "SELECT checksum FROM gladier_function_checksums WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                if row is not None:
+                    checksum = self._memory[key] = row[0]
+            return checksum
+
+    def _set(self, key: str, identity: CodeIdentity, checksum: str):
+        path, _, qualname, name, _ = identity
+        qualname = f"{qualname}:{name}"
+        with self._lock:
+            self._memory[key] = checksum
+            if self.filename is None:
+                return
+            conn = self.connection
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Older versions of the same function will never be seen again
+                conn.execute(
+                    "DELETE FROM gladier_function_checksums "
+                    "WHERE path = ? AND qualname = ?",
+                    (path, qualname),
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO gladier_function_checksums "
+                    "(key, path, qualname, checksum) VALUES (?, ?, ?, ?)",
+                    (key, path, qualname, checksum),
+                )
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def __len__(self):
+        with self._lock:
+            if self.filename is None:
+                return len(self._memory)
+            return self.connection.execute(
+                "SELECT COUNT(*) FROM gladier_function_checksums"
+            ).fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self.filename is not None:
+                self.connection.execute("DELETE FROM gladier_function_checksums")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
@@ -0,0 +1,64 @@
+import logging
+import typing as t
+
+from gladier.storage.config import GladierConfig
+
+log = logging.getLogger(__name__)
+
+# Keys written by the compute manager for each registered function
+COLLECTABLE_SUFFIXES = ("_function_id", "_function_id_checksum")
+
+
+class GarbageCollectionReport:
+    """
+    The result of collecting garbage from storage.
+
+    :param section: The storage section garbage was collected from
+    :param removed: The stale keys and their values which were (or would be) removed
+    :param dry_run: True if nothing was actually removed from storage
+    """
+
+    def __init__(self, section: str, removed: t.Mapping[str, str], dry_run: bool):
+        self.section = section
+        self.removed = dict(removed)
+        self.dry_run = dry_run
+
+    @property
+    def bytes_reclaimed(self) -> int:
+        """The size of the removed entries, as they are serialized in a config file"""
+        return sum(len(f"{k} = {v}\n".encode()) for k, v in self.removed.items())
+
+    def __repr__(self):
+        return (
+            f"<{self.__class__.__name__} section={self.section} "
+            f"removed={len(self.removed)} bytes_reclaimed={self.bytes_reclaimed} "
+            f"dry_run={self.dry_run}>"
+        )
+
+
+def collect_garbage(
+    storage: GladierConfig, referenced: t.Iterable[str], dry_run: bool = False
+) -> GarbageCollectionReport:
+    """
+    Remove compute function ids and checksums from the storage section which are not in
+    ``referenced``. Other keys, such as the flow id or input overrides, are never removed.
+
+    :param storage: The storage to collect garbage from
+    :param referenced: The names of function ids and checksums which are still in use
+    :param dry_run: Report stale keys without removing them
+    :returns: A report of the stale keys
+    """
+    referenced = set(referenced)
+    storage.load()
+    stale = {
+        k: v
+        for k, v in storage.items(storage.section, raw=True)
+        if k.endswith(COLLECTABLE_SUFFIXES) and k not in referenced
+    }
+    if stale and not dry_run:
+        with storage.transaction():
+            for name in stale:
+                storage.del_value(name)
+    report = GarbageCollectionReport(storage.section, stale, dry_run)
+    log.info(f"Collected storage garbage: {report}")
+    return report
@@ -59,6 +59,9 @@ class MigrateOldConfigFile(ConfigMigration):
     old_cfg = pathlib.Path("~/.gladier-secrets.cfg").expanduser()
 
     def is_applicable(self):
+        # Never migrate (and remove) the old config into storage that isn't kept on disk
+        if not getattr(getattr(self.config, "backend", None), "persistent", True):
+            return False
         if not self.old_cfg.exists():
             return False
         log.warning(
@@ -118,6 +121,38 @@ class MigrateOldConfigFile(ConfigMigration):
             )
 
 
+class MigrateConfigFileToDatabase(ConfigMigration):
+    """Copies values from an existing INI config file into new storage, when a storage
+    backend which replaces config files (such as sqlite or sharded) is used for the first
+    time. The config file is left in place, in case the config file backend is used again.
+    """
+
+    @property
+    def legacy_cfg(self):
+        backend = getattr(self.config, "backend", None)
+        return getattr(backend, "legacy_config_filename", None)
+
+    def is_applicable(self):
+        # Only fresh databases are migrated, which have not yet been given a version.
+        return (
+            self.config_version is None
+            and self.legacy_cfg is not None
+            and self.legacy_cfg.exists()
+        )
+
+    def migrate(self):
+        log.info(f"Migrating config {self.legacy_cfg} to {self.config.filename}")
+        old_cfg = configparser.ConfigParser(interpolation=None)
+        old_cfg.read(self.legacy_cfg)
+        for section in old_cfg.sections():
+            if section not in self.config.sections():
+                self.config.add_section(section)
+            for k, v in old_cfg.items(section):
+                if self.config[section].get(k) is None:
+                    self.config.set(section, k, v)
+        log.info(f"Successfully migrated {self.legacy_cfg} to {self.config.filename}")
+
+
 class UpdateFuncXFunctions(ConfigMigration):
     """Updates from old functions which were named: my_thing_funcx_id to
     the newer compute function names named my_thing_function_id"""
@@ -172,13 +207,26 @@ class UpdateFuncXFunctions(ConfigMigration):
 
 MIGRATIONS = [
     MigrateOldConfigFile,
+    MigrateConfigFileToDatabase,
     AddVersionToConfig,
     UpdateConfigVersion,
     UpdateFuncXFunctions,
 ]
 
 
+def is_current_version(config):
+    """Check if the config was last migrated by the running version of Gladier"""
+    try:
+        return config.get("general", "version") == gladier.version.__version__
+    except configparser.Error:
+        return False
+
+
 def needs_migration(config):
+    # All migrations have already run if the config is at the current version. Skip
+    # checking each of them, since some look for files outside the config.
+    if is_current_version(config):
+        return False
     return any(m(config).is_applicable() for m in MIGRATIONS)
 
 
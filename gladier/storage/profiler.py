@@ -0,0 +1,173 @@
+"""
+Opt-in profiling for Gladier storage. Profiling is enabled for the duration of a
+``StorageProfiler`` block, and records every storage load and save along with the Gladier
+operation which caused it:
+
+.. code-block:: python
+
+    with StorageProfiler() as profiler:
+        my_client.run_flow()
+    report = profiler.report
+    assert report.total.reads <= 1
+    print(report.operations["FlowsManager.check_flow"].loads)
+
+Operations are attributed to the innermost profiled Gladier method on the call stack, or
+"other" if storage was accessed outside of one.
+"""
+
+import time
+import logging
+import functools
+import threading
+import contextvars
+import typing as t
+
+log = logging.getLogger(__name__)
+
+_profilers: t.List["StorageProfiler"] = []
+_profilers_lock = threading.Lock()
+_operation: contextvars.ContextVar = contextvars.ContextVar(
+    "gladier_storage_operation", default="other"
+)
+
+
+class StorageStats:
+    """
+    Storage access counters for a single operation.
+
+    * loads -- Number of times storage was loaded, including loads satisfied by cache
+    * reads -- Number of loads which had to read from the storage backend
+    * saves -- Number of times changes were written to the storage backend
+    * bytes_read -- Bytes read from the storage backend
+    * bytes_written -- Bytes written to the storage backend
+    * seconds -- Time spent loading and saving
+    """
+
+    fields = ("loads", "reads", "saves", "bytes_read", "bytes_written", "seconds")
+
+    def __init__(self, **kwargs):
+        for field in self.fields:
+            setattr(self, field, kwargs.get(field, 0))
+
+    def add(self, other: "StorageStats") -> None:
+        for field in self.fields:
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+
+    def as_dict(self) -> t.Dict[str, float]:
+        return {field: getattr(self, field) for field in self.fields}
+
+    def __repr__(self):
+        values = " ".join(f"{k}={v}" for k, v in self.as_dict().items())
+        return f"<{self.__class__.__name__} {values}>"
+
+
+class StorageProfileReport:
+    """
+    Storage access for each profiled operation.
+
+    :param operations: Storage stats keyed by operation name
+    """
+
+    def __init__(self, operations: t.Mapping[str, StorageStats]):
+        self.operations = dict(operations)
+
+    @property
+    def total(self) -> StorageStats:
+        """Combined stats for all operations"""
+        total = StorageStats()
+        for stats in self.operations.values():
+            total.add(stats)
+        return total
+
+    def as_dict(self) -> t.Dict[str, t.Dict[str, float]]:
+        report = {name: stats.as_dict() for name, stats in self.operations.items()}
+        report["total"] = self.total.as_dict()
+        return report
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.as_dict()}>"
+
+
+class StorageProfiler:
+    """
+    Record storage access for all Gladier storage while the profiler is active.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._operations: t.Dict[str, StorageStats] = dict()
+
+    def __enter__(self):
+        with _profilers_lock:
+            _profilers.append(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        with _profilers_lock:
+            _profilers.remove(self)
+
+    def record(self, operation: str, stats: StorageStats) -> None:
+        with self._lock:
+            self._operations.setdefault(operation, StorageStats()).add(stats)
+
+    @property
+    def report(self) -> StorageProfileReport:
+        with self._lock:
+            return StorageProfileReport(
+                {
+                    name: StorageStats(**stats.as_dict())
+                    for name, stats in self._operations.items()
+                }
+            )
+
+
+def is_profiling() -> bool:
+    return bool(_profilers)
+
+
+def record(**stats) -> None:
+    """
+    Record storage access against the current operation for any active profilers.
+    Accepts any of the fields on ``StorageStats``.
+    """
+    if not _profilers:
+        return
+    operation = _operation.get()
+    with _profilers_lock:
+        profilers = list(_profilers)
+    for profiler in profilers:
+        profiler.record(operation, StorageStats(**stats))
+
+
+class Timer:
+    """Time a block of code, only if profiling is active"""
+
+    def __enter__(self):
+        self.start = time.perf_counter() if _profilers else None
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.start is not None:
+            self.seconds = time.perf_counter() - self.start
+        else:
+            self.seconds = 0
+
+
+def profiled(func: t.Callable) -> t.Callable:
+    """
+    Attribute any storage access within the decorated method to it, named by its
+    qualified name (such as ``FlowsManager.check_flow``).
+    """
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _profilers:
+            return func(*args, **kwargs)
+        token = _operation.set(name)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _operation.reset(token)
+
+    return wrapper
@@ -0,0 +1,167 @@
+import os
+import json
+import time
+import zlib
+import sqlite3
+import logging
+import threading
+import typing as t
+
+from gladier.storage.backends import create_database_file, restrict_database_files
+
+log = logging.getLogger(__name__)
+
+# Runs in these states will never change again
+TERMINAL_RUN_STATUSES = ("SUCCEEDED", "FAILED", "ENDED")
+
+
+class RunStatusCache:
+    """
+    A cache of run documents for runs which have finished, and so will never change.
+    Documents are stored compressed in an SQLite database, and the least recently used runs
+    are evicted once the cache holds more than ``max_entries`` runs or ``max_bytes`` of
+    compressed documents.
+
+    .. code-block:: python
+
+        cache = RunStatusCache("~/.gladier/runs.sqlite")
+        status = cache.get(run_id)
+        if status is None:
+            status = flows_client.get_run(run_id).data
+            cache.set(run_id, status)
+
+    :param filename: The database file. If None, runs are only cached in memory.
+    :param max_entries: The maximum number of runs to keep
+    :param max_bytes: The maximum size of compressed run documents to keep
+    :param permission: File permissions to set on a new database, if any
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS gladier_run_statuses ("
+        "run_id TEXT PRIMARY KEY, data BLOB NOT NULL, size INTEGER NOT NULL, "
+        "accessed INTEGER NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS gladier_run_statuses_accessed "
+        "ON gladier_run_statuses (accessed)",
+    )
+
+    def __init__(
+        self,
+        filename: t.Optional[t.Union[str, os.PathLike]] = None,
+        max_entries: int = 10000,
+        max_bytes: int = 64 * 1024 * 1024,
+        permission: t.Optional[int] = None,
+    ):
+        self.filename = os.path.expanduser(filename) if filename else None
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.permission = permission
+        self.hits = 0
+        self.misses = 0
+        self._connection = None
+        self._connection_lock = threading.RLock()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            filename = self.filename or ":memory:"
+            exists = self.filename is None or os.path.exists(filename)
+            if not exists and self.permission is not None:
+                create_database_file(filename, self.permission)
+            conn = sqlite3.connect(
+                filename, isolation_level=None, check_same_thread=False
+            )
+            if self.filename is not None:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+            for statement in self.SCHEMA:
+                conn.execute(statement)
+            if not exists and self.permission is not None:
+                restrict_database_files(filename, self.permission)
+            self._connection = conn
+        return self._connection
+
+    @staticmethod
+    def is_terminal(status: t.Mapping) -> bool:
+        return status.get("status") in TERMINAL_RUN_STATUSES
+
+    def get(self, run_id: str) -> t.Optional[dict]:
+        """
+        :returns: A copy of the cached run document, or None if the run is not cached
+        """
+        with self._connection_lock:
+            row = self.connection.execute(
+                "SELECT data FROM gladier_run_statuses WHERE run_id = ?", (run_id,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.connection.execute(
+                "UPDATE gladier_run_statuses SET accessed = ? WHERE run_id = ?",
+                (time.time_ns(), run_id),
+            )
+        self.hits += 1
+        return json.loads(zlib.decompress(row[0]))
+
+    def set(self, run_id: str, status: t.Mapping) -> bool:
+        """
+        Cache a run document, if the run has finished.
+
+        :returns: True if the run was cached
+        """
+        if not self.is_terminal(status):
+            return False
+        data = zlib.compress(json.dumps(status).encode())
+        with self._connection_lock:
+            conn = self.connection
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO gladier_run_statuses "
+                    "(run_id, data, size, accessed) VALUES (?, ?, ?, ?)",
+                    (run_id, data, len(data), time.time_ns()),
+                )
+                self._evict(conn)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        return True
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        evicted = conn.execute(
+            "DELETE FROM gladier_run_statuses WHERE run_id IN ("
+            "SELECT run_id FROM ("
+            "SELECT run_id, "
+            "ROW_NUMBER() OVER (ORDER BY accessed DESC) AS position, "
+            "SUM(size) OVER (ORDER BY accessed DESC) AS total "
+            "FROM gladier_run_statuses"
+            ") WHERE position > ? OR total > ?)",
+            (self.max_entries, self.max_bytes),
+        ).rowcount
+        if evicted:
+            log.debug(f"Evicted {evicted} runs from the run status cache")
+
+    def __len__(self):
+        with self._connection_lock:
+            return self.connection.execute(
+                "SELECT COUNT(*) FROM gladier_run_statuses"
+            ).fetchone()[0]
+
+    def get_size(self) -> int:
+        """
+        :returns: The total size of compressed run documents in the cache
+        """
+        with self._connection_lock:
+            return self.connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM gladier_run_statuses"
+            ).fetchone()[0]
+
+    def clear(self) -> None:
+        with self._connection_lock:
+            self.connection.execute("DELETE FROM gladier_run_statuses")
+
+    def close(self) -> None:
+        with self._connection_lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
@@ -0,0 +1,271 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import datetime
+import logging
+import threading
+import typing as t
+
+from gladier.storage.backends import create_database_file, restrict_database_files
+
+log = logging.getLogger(__name__)
+
+Timestamp = t.Union[datetime.datetime, float]
+
+
+def get_input_hash(flow_input: t.Any) -> str:
+    """
+    :returns: A SHA-256 digest of the flow input, which is the same for equal input
+    """
+    encoded = json.dumps(flow_input, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def get_timestamp(value: t.Optional[t.Union[Timestamp, str]]) -> t.Optional[float]:
+    """
+    :param value: A datetime, ISO 8601 string, or seconds since the epoch
+    :returns: Seconds since the epoch
+    """
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        value = datetime.datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return value.timestamp()
+
+
+class RunIndex:
+    """
+    A local index of flow runs started by Gladier, which can be searched without making
+    any requests to the flows service. Each run records the flow it ran, the flow checksum
+    at the time, its label, tags, a hash of its input, when it started, and the last status
+    seen for it.
+
+    .. code-block:: python
+
+        index = RunIndex("~/.gladier/runs.index.sqlite")
+        for run in index.query(tag="dataset-x", status="FAILED"):
+            print(run["run_id"], run["label"])
+
+    :param filename: The database file. If None, runs are only indexed in memory.
+    :param permission: File permissions to set on a new database, if any
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS gladier_runs ("
+        "run_id TEXT PRIMARY KEY, flow_id TEXT, flow_checksum TEXT, label TEXT, "
+        "input_hash TEXT, start_time REAL NOT NULL, status TEXT)",
+        "CREATE TABLE IF NOT EXISTS gladier_run_tags ("
+        "run_id TEXT NOT NULL REFERENCES gladier_runs (run_id) ON DELETE CASCADE, "
+        "tag TEXT NOT NULL, PRIMARY KEY (tag, run_id))",
+        "CREATE INDEX IF NOT EXISTS gladier_runs_label ON gladier_runs (label)",
+        "CREATE INDEX IF NOT EXISTS gladier_runs_start_time ON gladier_runs (start_time)",
+        "CREATE INDEX IF NOT EXISTS gladier_runs_status ON gladier_runs (status)",
+        "CREATE INDEX IF NOT EXISTS gladier_runs_input_hash "
+        "ON gladier_runs (input_hash)",
+    )
+
+    FIELDS = (
+        "run_id",
+        "flow_id",
+        "flow_checksum",
+        "label",
+        "input_hash",
+        "start_time",
+        "status",
+    )
+
+    def __init__(
+        self,
+        filename: t.Optional[t.Union[str, os.PathLike]] = None,
+        permission: t.Optional[int] = None,
+    ):
+        self.filename = os.path.expanduser(filename) if filename else None
+        self.permission = permission
+        self._connection = None
+        self._connection_lock = threading.RLock()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            filename = self.filename or ":memory:"
+            exists = self.filename is None or os.path.exists(filename)
+            if not exists and self.permission is not None:
+                create_database_file(filename, self.permission)
+            conn = sqlite3.connect(
+                filename, isolation_level=None, check_same_thread=False
+            )
+            if self.filename is not None:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            for statement in self.SCHEMA:
+                conn.execute(statement)
+            if not exists and self.permission is not None:
+                restrict_database_files(filename, self.permission)
+            self._connection = conn
+        return self._connection
+
+    def add(
+        self,
+        run: t.Mapping,
+        flow_input: t.Any = None,
+        flow_id: t.Optional[str] = None,
+        flow_checksum: t.Optional[str] = None,
+        tags: t.Iterable[str] = (),
+    ) -> None:
+        """
+        Record a run which was just started.
+
+        :param run: The response from starting the run
+        :param flow_input: The input the run was started with
+        :param flow_id: The flow which was run, if not included in the run response
+        :param flow_checksum: The checksum of the flow when the run was started
+        :param tags: Tags for the run, if not included in the run response
+        """
+        start_time = get_timestamp(run.get("start_time")) or time.time()
+        tags = set(run.get("tags") or tags)
+        with self._connection_lock:
+            conn = self.connection
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO gladier_runs "
+                    f"({', '.join(self.FIELDS)}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        run["run_id"],
+                        run.get("flow_id") or flow_id,
+                        flow_checksum,
+                        run.get("label"),
+                        get_input_hash(flow_input),
+                        start_time,
+                        run.get("status"),
+                    ),
+                )
+                conn.execute(
+                    "DELETE FROM gladier_run_tags WHERE run_id = ?", (run["run_id"],)
+                )
+                conn.executemany(
+                    "INSERT INTO gladier_run_tags (run_id, tag) VALUES (?, ?)",
+                    [(run["run_id"], tag) for tag in sorted(tags)],
+                )
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def update_status(self, run_id: str, status: str) -> bool:
+        """
+        Record the last known status of a run.
+
+        :returns: True if the run is in the index
+        """
+        with self._connection_lock:
+            return bool(
+                self.connection.execute(
+                    "UPDATE gladier_runs SET status = ? WHERE run_id = ?",
+                    (status, run_id),
+                ).rowcount
+            )
+
+    def get(self, run_id: str) -> t.Optional[dict]:
+        """
+        :returns: The indexed run, or None if the run is not in the index
+        """
+        runs = self._select("WHERE r.run_id = ?", [run_id])
+        return runs[0] if runs else None
+
+    def query(
+        self,
+        tag: t.Optional[str] = None,
+        label_prefix: t.Optional[str] = None,
+        status: t.Optional[t.Union[str, t.Iterable[str]]] = None,
+        since: t.Optional[Timestamp] = None,
+        until: t.Optional[Timestamp] = None,
+        flow_id: t.Optional[str] = None,
+        input_hash: t.Optional[str] = None,
+        limit: t.Optional[int] = None,
+    ) -> t.List[dict]:
+        """
+        Find indexed runs. All given filters must match.
+
+        :param tag: Only runs with this tag
+        :param label_prefix: Only runs with a label starting with this prefix
+        :param status: Only runs last seen with this status, or any of these statuses
+        :param since: Only runs started at or after this time
+        :param until: Only runs started before this time
+        :param flow_id: Only runs of this flow
+        :param input_hash: Only runs started with input matching this hash. See
+            :func:`get_input_hash`
+        :param limit: The maximum number of runs to return
+        :returns: Matching runs, most recently started first
+        """
+        clauses, params = [], []
+        if tag is not None:
+            clauses.append(
+                "r.run_id IN (SELECT run_id FROM gladier_run_tags WHERE tag = ?)"
+            )
+            params.append(tag)
+        if label_prefix is not None:
+            # A range rather than LIKE, so the label index is used and no characters
+            # in the prefix need escaping
+            clauses.append("r.label >= ? AND r.label < ?")
+            params.extend([label_prefix, label_prefix + chr(0x10FFFF)])
+        if status is not None:
+            statuses = [status] if isinstance(status, str) else list(status)
+            clauses.append(f"r.status IN ({', '.join('?' * len(statuses))})")
+            params.extend(statuses)
+        if since is not None:
+            clauses.append("r.start_time >= ?")
+            params.append(get_timestamp(since))
+        if until is not None:
+            clauses.append("r.start_time < ?")
+            params.append(get_timestamp(until))
+        for field, value in (("flow_id", flow_id), ("input_hash", input_hash)):
+            if value is not None:
+                clauses.append(f"r.{field} = ?")
+                params.append(value)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        order = "ORDER BY r.start_time DESC"
+        if limit is not None:
+            order += " LIMIT ?"
+            params.append(limit)
+        return self._select(f"{where} {order}", params)
+
+    def _select(self, query: str, params: t.List) -> t.List[dict]:
+        with self._connection_lock:
+            rows = self.connection.execute(
+                f"SELECT {', '.join(f'r.{f}' for f in self.FIELDS)}, "
+                "(SELECT json_group_array(tag) FROM gladier_run_tags "
+                "WHERE run_id = r.run_id) "
+                f"FROM gladier_runs r {query}",
+                params,
+            ).fetchall()
+        runs = list()
+        for row in rows:
+            run = dict(zip(self.FIELDS, row))
+            run["tags"] = sorted(json.loads(row[-1]))
+            runs.append(run)
+        return runs
+
+    def remove(self, run_id: str) -> None:
+        with self._connection_lock:
+            self.connection.execute(
+                "DELETE FROM gladier_runs WHERE run_id = ?", (run_id,)
+            )
+
+    def __len__(self):
+        with self._connection_lock:
+            return self.connection.execute(
+                "SELECT COUNT(*) FROM gladier_runs"
+            ).fetchone()[0]
+
+    def close(self) -> None:
+        with self._connection_lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
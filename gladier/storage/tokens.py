@@ -1,9 +1,7 @@
-import os
 import stat
 import logging
 from gladier.storage.serialization import flat_pack, flat_unpack
-from gladier.storage.config import GladierConfig
-
+from gladier.storage.config import GladierConfig, synchronized
 
 log = logging.getLogger(__name__)
 
@@ -13,31 +11,49 @@ class GladierSecretsConfig(GladierConfig):
 
     def __init__(self, *args, tokens_section="tokens", **kwargs):
         self.tokens_section = tokens_section
+        # Decoded tokens, along with the storage signature they were decoded from
+        self._tokens_cache = None
         super().__init__(*args, **kwargs)
 
-    def save(self):
-        super().save()
-        os.chmod(self.filename, self.DEFAULT_PERMISSION)
+    @property
+    def tracked_sections(self):
+        return super().tracked_sections + [self.tokens_section]
 
+    @synchronized
     def load(self):
         super().load()
         if self.tokens_section not in self.sections():
             self[self.tokens_section] = {}
             self.save()
 
+    @synchronized
     def write_tokens(self, tokens):
         self.load()
+        self._tokens_cache = None
         for name, value in flat_pack(tokens).items():
             self.set(self.tokens_section, name, value)
         log.debug(f"Wrote tokens to {self.filename}")
         self.save()
 
+    @synchronized
     def read_tokens(self):
+        """
+        Read tokens from storage. Decoded tokens are cached until storage changes, or tokens
+        are written or cleared.
+
+        :returns: A dict of token sets keyed by resource server
+        """
         self.load()
-        return flat_unpack(dict(self.items(self.tokens_section)))
+        cached = self._tokens_cache
+        if cached is None or cached[0] is None or cached[0] != self._signature:
+            tokens = flat_unpack(dict(self.items(self.tokens_section)))
+            cached = self._tokens_cache = (self._signature, tokens)
+        return {rs: dict(tset) for rs, tset in cached[1].items()}
 
+    @synchronized
     def clear_tokens(self):
         self.load()
+        self._tokens_cache = None
         self.remove_section(self.tokens_section)
         self.add_section(self.tokens_section)
         log.debug(f"Tokens cleared from {self.filename}")
@@ -6,14 +6,29 @@ from unittest.mock import Mock, PropertyMock
 import pytest
 from gladier.storage import config, tokens
 import globus_sdk
+from globus_compute_sdk import Client
 
-from gladier.tests.test_data.gladier_mocks import mock_automate_flow_scope
+from gladier.tests.test_data.gladier_mocks import (
+    MockGladierClient,
+    mock_automate_flow_scope,
+)
 from gladier.managers import ComputeManager
 from gladier.managers.login_manager import CallbackLoginManager, UserAppLoginManager
-from gladier import GladierClient
+from gladier import GladierBaseTool, GladierClient
 
 data_dir = os.path.join(os.path.dirname(__file__), "test_data")
 
+# Keep references to the real storage methods, which are replaced by the in-memory
+# ``storage`` fixture below for most tests.
+_real_storage_methods = [
+    (configparser.ConfigParser, "read", configparser.ConfigParser.read),
+    (configparser.ConfigParser, "write", configparser.ConfigParser.write),
+    (config.GladierConfig, "save", config.GladierConfig.save),
+    (tokens.GladierSecretsConfig, "save", tokens.GladierSecretsConfig.save),
+]
+
+_real_compute_client = ComputeManager.compute_client
+
 ALL_FLOW_SCOPES = [
     globus_sdk.FlowsClient.scopes.manage_flows,
     globus_sdk.FlowsClient.scopes.view_flows,
@@ -61,6 +76,14 @@ def mock_secrets_config(monkeypatch):
     return tokens.GladierSecretsConfig
 
 
+@pytest.fixture
+def disk_storage(monkeypatch, storage, mock_secrets_config, tmp_path):
+    """Restore real file I/O for storage, and return a config filename to use with it"""
+    for cls, name, method in _real_storage_methods:
+        monkeypatch.setattr(cls, name, method)
+    return str(tmp_path / "gladier.cfg")
+
+
 @pytest.fixture(autouse=True)
 def mock_flows_client(monkeypatch, globus_response):
     """Ensure there are no calls out to the Globus Automate Client"""
@@ -90,6 +113,11 @@ def mock_flows_client(monkeypatch, globus_response):
     monkeypatch.setattr(globus_sdk.FlowsClient, "create_flow", mock_create_flow)
     monkeypatch.setattr(globus_sdk.FlowsClient, "update_flow", mock_update_flow)
     monkeypatch.setattr(globus_sdk.FlowsClient, "get_run", mock_update_flow)
+    monkeypatch.setattr(
+        globus_sdk.FlowsClient,
+        "get_run_logs",
+        Mock(return_value={"entries": [], "has_next_page": False}),
+    )
     return globus_sdk.FlowsClient
 
 
@@ -119,6 +147,48 @@ def mock_compute_client(monkeypatch):
     return mock_compute_cli
 
 
+@pytest.fixture
+def mock_compute_client_class(monkeypatch, mock_compute_client):
+    """
+    Restore the real ComputeManager.compute_client property, and return a mock of the
+    compute Client class it creates clients with.
+    """
+    monkeypatch.setattr(ComputeManager, "compute_client", _real_compute_client)
+    mock_client_cls = Mock(return_value=mock_compute_client)
+    mock_client_cls.FUNCX_SCOPE = Client.FUNCX_SCOPE
+    monkeypatch.setattr("gladier.managers.compute_manager.Client", mock_client_cls)
+    return mock_client_cls
+
+
+@pytest.fixture
+def many_function_client():
+    """
+    Return a factory for client classes with a single tool of ``count`` compute functions,
+    named func_0 through func_<count - 1>. The tool is listed ``tool_copies`` times, and
+    any other keyword arguments are set on the client class.
+    """
+
+    def make_function(i):
+        def func():
+            return i
+
+        func.__name__ = f"func_{i}"
+        return func
+
+    def make_client(count, tool_copies=1, **attrs):
+        class ManyFunctionTool(GladierBaseTool):
+            compute_functions = [make_function(i) for i in range(count)]
+
+        class ManyFunctionClient(MockGladierClient):
+            gladier_tools = [ManyFunctionTool] * tool_copies
+
+        for name, value in attrs.items():
+            setattr(ManyFunctionClient, name, value)
+        return ManyFunctionClient
+
+    return make_client
+
+
 @pytest.fixture
 def logged_out():
     return CallbackLoginManager({})
@@ -0,0 +1,116 @@
+import copy
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from gladier.utils import automate
+from gladier.tests.test_data.gladier_mocks import MockGladierClient
+
+
+class RemoteError:
+    def __init__(self, message):
+        self.message = message
+
+    def reraise(self):
+        raise ValueError(self.message)
+
+
+@pytest.fixture
+def mock_serializer(monkeypatch):
+    serializer = Mock()
+    serializer.deserialize.side_effect = RemoteError
+    monkeypatch.setattr(automate, "_serializer", serializer)
+    monkeypatch.setattr(
+        automate, "_exception_cache", automate.collections.OrderedDict()
+    )
+    return serializer
+
+
+def failed_run(states):
+    return {
+        "status": "FAILED",
+        "details": {
+            "output": {
+                name: {
+                    "action_id": name,
+                    "state_name": name,
+                    "status": "FAILED",
+                    "details": {"exception": encoded},
+                }
+                for name, encoded in states.items()
+            }
+        },
+    }
+
+
+def test_exceptions_deserialized_once(mock_serializer):
+    response = automate.get_details(
+        failed_run({f"State{i}": "oops" for i in range(100)})
+    )
+    for state in response["details"]["output"].values():
+        assert isinstance(state["details"]["exception"], str)
+        assert "ValueError: oops" in state["details"]["exception"]
+    # The same encoded exception is only deserialized once
+    assert mock_serializer.deserialize.call_count == 1
+
+    # Output which was already prepared is left alone
+    automate.get_details(response)
+    automate.get_details(response, "State3")
+    assert mock_serializer.deserialize.call_count == 1
+
+
+def test_get_details_only_prepares_requested_state(mock_serializer):
+    response = failed_run({"First": "first", "Second": "second"})
+    details = automate.get_details(response, "Second")
+    assert "ValueError: second" in details["details"]["exception"]
+    assert response["details"]["output"]["First"]["details"]["exception"] == "first"
+    assert mock_serializer.deserialize.call_count == 1
+
+
+def test_exception_cache_is_bounded(mock_serializer, monkeypatch):
+    monkeypatch.setattr(automate, "EXCEPTION_CACHE_SIZE", 2)
+    for encoded in ("a", "b", "c", "a"):
+        automate.deserialize_exception(encoded)
+    assert len(automate._exception_cache) == 2
+    assert mock_serializer.deserialize.call_count == 4
+
+
+def test_get_status_is_json_serializable(
+    logged_in, mock_serializer, mock_flows_client, globus_response
+):
+    mock_flows_client.get_run = Mock(
+        return_value=globus_response(mock_data=failed_run({"MockFunc": "oops"}))
+    )
+    status = MockGladierClient(login_manager=logged_in).get_status("run_id")
+    output = json.loads(json.dumps(status))["details"]["output"]
+    assert "ValueError: oops" in output["MockFunc"]["details"]["exception"]
+
+
+def test_exceptions_deserialized_on_access(mock_serializer):
+    response = automate.get_details(failed_run({"First": "first", "Second": "second"}))
+    assert mock_serializer.deserialize.call_count == 0
+
+    details = response["details"]["output"]["First"]["details"]
+    assert "ValueError: first" in details["exception"]
+    assert mock_serializer.deserialize.call_count == 1
+
+    second = response["details"]["output"]["Second"]["details"]
+    for plain in (dict(second), copy.deepcopy(second), json.loads(json.dumps(second))):
+        assert type(plain) is dict
+        assert "ValueError: second" in plain["exception"]
+    assert mock_serializer.deserialize.call_count == 2
+
+
+def test_get_details_only_deserializes_requested_state(
+    logged_in, mock_serializer, mock_flows_client, globus_response
+):
+    mock_flows_client.get_run = Mock(
+        return_value=globus_response(
+            mock_data=failed_run({"StateA": "a", "StateB": "b", "StateC": "c"})
+        )
+    )
+    cli = MockGladierClient(login_manager=logged_in)
+    details = cli.get_details("run_id", "StateA")
+    assert "ValueError: a" in details["details"]["exception"]
+    mock_serializer.deserialize.assert_called_once_with("a")
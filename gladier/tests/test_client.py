@@ -1,5 +1,23 @@
+import asyncio
+import copy
+import threading
+import time
 from unittest.mock import Mock
-from gladier.tests.test_data.gladier_mocks import MockGladierClient, mock_func
+
+import globus_sdk
+import pytest
+
+import gladier.exc
+import gladier.storage.profiler
+from gladier import AsyncGladierClient
+from gladier.managers import AsyncFlowsManager, ComputeManager, FlowsManager
+from gladier.managers.login_manager import CallbackLoginManager
+from gladier.storage.profiler import StorageProfiler
+from gladier.tests.test_data.gladier_mocks import (
+    MockGladierClient,
+    MockTool,
+    mock_func,
+)
 
 
 def test_get_input(logged_in):
@@ -57,6 +75,242 @@ def test_run_flow(logged_in):
     cli.run_flow()
 
 
+def test_flow_definition_modified_in_place(logged_in, mock_flows_client):
+    class InPlaceClient(MockGladierClient):
+        flow_definition = copy.deepcopy(MockTool.flow_definition)
+
+    cli = InPlaceClient(login_manager=logged_in)
+    cli.sync_flow()
+    cli.flows_manager.check_flow()
+
+    state = cli.get_flow_definition()["States"]["MockFunc"]
+    state["Parameters"]["tasks"][0]["payload.$"] = "$.input.changed"
+    with pytest.raises(gladier.exc.FlowObsolete) as exc:
+        cli.flows_manager.check_flow()
+    assert exc.value.items == ["MockFunc"]
+
+
+def test_compute_client_created_once(
+    logged_in, mock_compute_client_class, many_function_client
+):
+    cli = many_function_client(3)(login_manager=logged_in)
+    cli.get_compute_function_ids()
+    assert mock_compute_client_class.call_count == 1
+    assert cli.compute_manager.compute_client.register_function.call_count == 3
+
+
+def test_compute_client_created_once_by_concurrent_registration(
+    logged_in, mock_compute_client_class, many_function_client, monkeypatch
+):
+    threads = set()
+
+    def slow_client(*args, **kwargs):
+        time.sleep(0.01)
+        return mock_compute_client_class.return_value
+
+    def get_manager_authorizers(original=logged_in.get_manager_authorizers):
+        threads.add(threading.get_ident())
+        return original()
+
+    mock_compute_client_class.side_effect = slow_client
+    monkeypatch.setattr(logged_in, "get_manager_authorizers", get_manager_authorizers)
+    cli = many_function_client(6)(login_manager=logged_in)
+    cli.compute_manager.max_workers = 6
+    cli.get_compute_function_ids()
+    assert mock_compute_client_class.call_count == 1
+    # Authorizers are only loaded by the calling thread
+    assert threads == {threading.get_ident()}
+
+
+def test_compute_functions_registered_concurrently(
+    logged_in, mock_compute_client, disk_storage, many_function_client
+):
+    lock, active, operations = threading.Lock(), [0, 0], set()
+
+    def register_function(function, group=None):
+        operations.add(gladier.storage.profiler._operation.get())
+        with lock:
+            active[0] += 1
+            active[1] = max(active)
+        time.sleep(0.01)
+        with lock:
+            active[0] -= 1
+        return f"{function.__name__}_id"
+
+    mock_compute_client.register_function.side_effect = register_function
+    client_cls = many_function_client(
+        12, tool_copies=2, secret_config_filename=disk_storage
+    )
+    cli = client_cls(login_manager=logged_in)
+    cli.compute_manager.max_workers = 4
+    with StorageProfiler() as profiler:
+        ids = cli.get_compute_function_ids()
+
+    assert list(ids) == [f"func_{i}_function_id" for i in range(12)]
+    assert ids["func_3_function_id"] == "func_3_id"
+    # Functions shared by both tools are only registered once
+    assert mock_compute_client.register_function.call_count == 12
+    assert 1 < active[1] <= 4
+    assert profiler.report.total.saves == 1
+    # Worker threads keep the profiler context of the caller
+    assert operations == {"ComputeManager.validate_functions"}
+
+
+def test_compute_function_errors_aggregated(
+    logged_in, mock_compute_client, many_function_client
+):
+    def register_function(function, group=None):
+        if function.__name__ in ("func_1", "func_3"):
+            raise ValueError(f"{function.__name__} is broken")
+        return f"{function.__name__}_id"
+
+    mock_compute_client.register_function.side_effect = register_function
+
+    cli = many_function_client(5)(login_manager=logged_in)
+    with pytest.raises(gladier.exc.RegistrationException) as exc_info:
+        cli.get_compute_function_ids()
+    assert exc_info.value.items == ("func_1_function_id", "func_3_function_id")
+    # Functions which registered are kept, and are not registered again
+    assert cli.storage.get_value("func_2_function_id") == "func_2_id"
+    mock_compute_client.register_function.side_effect = None
+    mock_compute_client.register_function.reset_mock()
+    cli.get_compute_function_ids()
+    assert mock_compute_client.register_function.call_count == 2
+
+
+def test_compute_function_obsolete_errors_aggregated(logged_in, many_function_client):
+    cli = many_function_client(3, tool_copies=2)(login_manager=logged_in)
+    cli.compute_manager.auto_registration = False
+    with pytest.raises(gladier.exc.RegistrationException) as exc_info:
+        cli.get_compute_function_ids()
+    # Functions shared by both tools are only reported once
+    assert exc_info.value.items == (
+        "func_0_function_id",
+        "func_1_function_id",
+        "func_2_function_id",
+    )
+
+
+def test_compute_function_checksums_cached(
+    logged_in, monkeypatch, many_function_client
+):
+    serialize = Mock(wraps=ComputeManager.get_compute_function_checksum)
+    monkeypatch.setattr(ComputeManager, "get_compute_function_checksum", serialize)
+
+    cli = many_function_client(3)(login_manager=logged_in)
+    first = cli.get_compute_function_ids()
+    assert serialize.call_count == 3
+    assert cli.get_compute_function_ids() == first
+    cli.run_flow()
+    assert serialize.call_count == 3
+
+
+def test_client_persists_function_checksums(logged_in, disk_storage):
+    class DiskClient(MockGladierClient):
+        secret_config_filename = disk_storage
+        persist_function_checksums = True
+
+    cache = DiskClient(login_manager=logged_in).compute_manager.checksum_cache
+    assert cache.filename == disk_storage.replace(".cfg", ".functions.sqlite")
+
+
+def test_compute_client_follows_authorizer(logged_in, mock_compute_client_class):
+    cm = MockGladierClient(login_manager=logged_in).compute_manager
+    scope = mock_compute_client_class.FUNCX_SCOPE
+    logged_in.authorizers[scope] = globus_sdk.AccessTokenAuthorizer("token")
+    cm.compute_client
+    # Login managers may load a new authorizer with the same token each time
+    logged_in.authorizers[scope] = globus_sdk.AccessTokenAuthorizer("token")
+    cm.compute_client
+    assert mock_compute_client_class.call_count == 1
+
+    logged_in.authorizers[scope] = globus_sdk.AccessTokenAuthorizer("new_token")
+    cm.compute_client
+    assert mock_compute_client_class.call_count == 2
+    cm.refresh_compute_client()
+    assert mock_compute_client_class.call_count == 3
+
+
+def test_predeploy_flow(
+    logged_in, mock_flows_client, mock_specific_flow_client, mock_compute_client
+):
+    class PredeployClient(MockGladierClient):
+        predeploy_flow = True
+
+    release = threading.Event()
+    create_flow = mock_flows_client.create_flow.side_effect
+
+    def slow_create_flow(*args, **kwargs):
+        release.wait(5)
+        return mock_flows_client.create_flow.return_value
+
+    mock_flows_client.create_flow.side_effect = slow_create_flow
+    cli = PredeployClient(login_manager=logged_in)
+    # The client is usable while the flow is still being deployed
+    assert not cli.start_predeploy().done()
+    release.set()
+    mock_flows_client.create_flow.side_effect = create_flow
+
+    cli.run_flow()
+    assert mock_flows_client.create_flow.call_count == 1
+    assert mock_specific_flow_client.run_flow.call_count == 1
+    # Only starting the run needs to contact a service after deployment finishes
+    registrations = mock_compute_client.register_function.call_count
+    cli.run_flow()
+    assert mock_flows_client.create_flow.call_count == 1
+    assert mock_flows_client.update_flow.call_count == 0
+    assert mock_compute_client.register_function.call_count == registrations
+
+
+def test_predeploy_flow_failure_retried_by_run(logged_in, mock_flows_client):
+    class PredeployClient(MockGladierClient):
+        predeploy_flow = True
+
+    create_flow = mock_flows_client.create_flow.return_value
+    mock_flows_client.create_flow.side_effect = [ValueError("Unavailable"), create_flow]
+    cli = PredeployClient(login_manager=logged_in)
+    cli.wait_for_predeploy()
+    cli.run_flow()
+    assert mock_flows_client.create_flow.call_count == 2
+
+
+def test_predeploy_flow_starts_after_init(logged_in, monkeypatch):
+    started_with = []
+
+    def start_predeploy(self):
+        started_with.append(self.flow_definition)
+
+    class LateDefinitionClient(MockGladierClient):
+        predeploy_flow = True
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.flow_definition = copy.deepcopy(MockTool.flow_definition)
+
+    monkeypatch.setattr(LateDefinitionClient, "start_predeploy", start_predeploy)
+    cli = LateDefinitionClient(login_manager=logged_in)
+    assert started_with == [cli.flow_definition]
+
+
+def test_predeploy_flow_logs_in_on_caller_thread():
+    login_threads = []
+
+    def login(scopes):
+        login_threads.append(threading.get_ident())
+        return {str(s): globus_sdk.AccessTokenAuthorizer("token") for s in scopes}
+
+    class PredeployClient(MockGladierClient):
+        predeploy_flow = True
+
+    cli = PredeployClient(login_manager=CallbackLoginManager({}, login))
+    assert login_threads == [threading.get_ident()]
+    # The new flow scope needs a login, which is left to the first run
+    cli.wait_for_predeploy()
+    cli.run_flow()
+    assert len(login_threads) == 2
+    assert set(login_threads) == {threading.get_ident()}
+
+
 def test_propagated_group_uuid(monkeypatch, logged_in, storage, mock_secrets_config):
     class MockGladierClientShared(MockGladierClient):
         globus_group = "my-globus-group"
@@ -73,3 +327,153 @@ def test_propagated_group_uuid(monkeypatch, logged_in, storage, mock_secrets_con
     cli.compute_manager.compute_client.register_function.assert_called_with(
         mock_func, group="my-globus-group"
     )
+
+
+def test_collect_storage_garbage(logged_in):
+    cli = MockGladierClient(login_manager=logged_in)
+    cli.get_input()
+    cli.storage.set_value("old_func_function_id", "old_function_uuid")
+    cli.storage.set_value("old_func_function_id_checksum", "old_checksum")
+    cli.storage.set_value("compute_endpoint", "my_ep_uuid")
+
+    report = cli.collect_storage_garbage(dry_run=True)
+    assert set(report.removed) == {
+        "old_func_function_id",
+        "old_func_function_id_checksum",
+    }
+    assert report.bytes_reclaimed == len(
+        "old_func_function_id = old_function_uuid\n"
+        "old_func_function_id_checksum = old_checksum\n"
+    )
+    assert cli.storage.get_value("old_func_function_id") == "old_function_uuid"
+
+    cli.collect_storage_garbage()
+    assert cli.storage.get_value("old_func_function_id") is None
+    assert cli.storage.get_value("old_func_function_id_checksum") is None
+    assert cli.storage.get_value("mock_func_function_id") == "mock_compute_function"
+    assert cli.storage.get_value("compute_endpoint") == "my_ep_uuid"
+
+
+def test_auto_collect_storage_garbage(logged_in, mock_secrets_config):
+    class MockGladierClientGC(MockGladierClient):
+        auto_collect_storage_garbage = True
+
+    cli = MockGladierClientGC(login_manager=logged_in)
+    cli.storage.set_value("old_func_function_id", "old_function_uuid")
+    cli.get_input()
+    assert cli.storage.get_value("old_func_function_id") is None
+
+
+def test_client_index_runs(
+    logged_in, mock_specific_flow_client, globus_response, disk_storage
+):
+    class IndexedClient(MockGladierClient):
+        secret_config_filename = disk_storage
+        index_runs = True
+
+    def run_flow(**kwargs):
+        run = {"run_id": kwargs["label"], "status": "ACTIVE", "tags": kwargs["tags"]}
+        return globus_response(mock_data=dict(run, label=kwargs["label"]))
+
+    mock_specific_flow_client.run_flow.side_effect = run_flow
+    cli = IndexedClient(login_manager=logged_in)
+    cli.run_flow(label="sample-1", tags=["dataset-a"])
+    cli.run_flow(label="sample-2", tags=["dataset-b"])
+    cli.run_flow(label="other", tags=["dataset-a"])
+
+    assert [r["run_id"] for r in cli.find_runs(tag="dataset-a")] == [
+        "other",
+        "sample-1",
+    ]
+    assert len(cli.find_runs(label_prefix="sample")) == 2
+    assert cli.find_runs(tag="dataset-b")[0]["flow_id"] == cli.get_flow_id()
+
+
+def test_find_runs_requires_index(logged_in):
+    cli = MockGladierClient(login_manager=logged_in)
+    with pytest.raises(gladier.exc.ConfigException):
+        cli.find_runs(tag="dataset-a")
+
+
+def test_run_flows(logged_in, mock_specific_flow_client, monkeypatch):
+    cli = MockGladierClient(login_manager=logged_in)
+    get_input = Mock(wraps=cli.get_input)
+    monkeypatch.setattr(cli, "get_input", get_input)
+    progress = []
+
+    def inputs():
+        for i in range(20):
+            yield {"input": {"my_value": i}}
+        yield {"malformed": True}
+
+    results = cli.run_flows(
+        inputs(), max_workers=4, callback=progress.append, label="my runs"
+    )
+    assert get_input.call_count == 1
+    assert [r.index for r in results] == list(range(21))
+    assert progress == results
+    assert all(r.ok for r in results[:20])
+    assert isinstance(results[20].error, gladier.exc.ConfigException)
+
+    run_flow = mock_specific_flow_client.run_flow
+    assert run_flow.call_count == 20
+    bodies = [c.kwargs["body"]["input"]["my_value"] for c in run_flow.call_args_list]
+    assert sorted(bodies) == list(range(20))
+    assert all(c.kwargs["label"] == "my runs" for c in run_flow.call_args_list)
+
+
+def test_run_flows_bounds_pending_runs(logged_in):
+    cli = MockGladierClient(login_manager=logged_in)
+    consumed, started = [], []
+
+    def inputs():
+        for i in range(10):
+            consumed.append(i)
+            yield {"input": {"my_value": i}}
+
+    def callback(result):
+        started.append(result.index)
+        # Never more than max_pending inputs are consumed ahead of the started runs
+        assert len(consumed) - len(started) <= 2
+
+    cli.run_flows(inputs(), max_workers=1, max_pending=2, callback=callback)
+    assert started == list(range(10))
+
+
+class MockAsyncGladierClient(AsyncGladierClient):
+    secret_config_filename = MockGladierClient.secret_config_filename
+    gladier_tools = MockGladierClient.gladier_tools
+    flow_definition = MockGladierClient.flow_definition
+
+
+def test_async_run_flow(logged_in, mock_specific_flow_client):
+    cli = MockAsyncGladierClient(login_manager=logged_in)
+    assert isinstance(cli.flows_manager, AsyncFlowsManager)
+
+    async def run():
+        return await asyncio.gather(
+            *[cli.run_flow({"input": {"my_value": i}}) for i in range(5)]
+        )
+
+    runs = asyncio.run(run())
+    assert [r["run_id"] for r in runs] == ["mock_flow_id"] * 5
+    assert mock_specific_flow_client.run_flow.call_count == 5
+
+
+def test_async_run_flows(logged_in, mock_specific_flow_client):
+    cli = MockAsyncGladierClient(login_manager=logged_in)
+    progress = []
+
+    async def callback(result):
+        progress.append(result.index)
+
+    inputs = [{"input": {"my_value": i}} for i in range(10)] + [{"bad": "input"}]
+    results = asyncio.run(cli.run_flows(inputs, max_workers=3, callback=callback))
+    assert progress == list(range(11))
+    assert all(r.ok for r in results[:10])
+    assert not results[10].ok
+
+
+def test_async_client_requires_async_flows_manager(logged_in):
+    with pytest.raises(gladier.exc.DevelopmentException):
+        MockAsyncGladierClient(login_manager=logged_in, flows_manager=FlowsManager())
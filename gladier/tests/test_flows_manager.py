@@ -1,11 +1,14 @@
 import sys
+import json
+import asyncio
 import uuid
 import pytest
 import time
 import globus_sdk
 from unittest.mock import Mock
 from gladier.exc import ConfigException
-from gladier.managers.flows_manager import FlowsManager
+from gladier.managers.flows_manager import AsyncFlowsManager, FlowsManager
+from gladier.storage.run_cache import RunStatusCache
 
 from gladier.tests.test_data.gladier_mocks import MockGladierClient, mock_flow_id
 import gladier
@@ -304,6 +307,69 @@ def test_get_status(
     fm.get_status("run_id")
 
 
+def test_get_status_run_cache(
+    auto_login,
+    mock_flow_status_active,
+    mock_flow_status_succeeded,
+    mock_flows_client,
+    globus_response,
+):
+    fm = FlowsManager(
+        flow_id=mock_flow_id, login_manager=auto_login, run_cache=RunStatusCache()
+    )
+    mock_flows_client.get_run.return_value = globus_response(
+        mock_data=mock_flow_status_active
+    )
+    fm.get_status("run_id")
+    fm.get_status("run_id")
+    assert mock_flows_client.get_run.call_count == 2
+
+    # Once the run finishes, it is only fetched once more
+    mock_flows_client.get_run.return_value = globus_response(
+        mock_data=mock_flow_status_succeeded
+    )
+    first = fm.get_status("run_id")
+    assert fm.get_status("run_id") == first
+    assert mock_flows_client.get_run.call_count == 3
+
+
+def test_iter_run_logs(auto_login, mock_flows_client):
+    log = [{"code": f"Event{i}"} for i in range(5)]
+
+    def get_run_logs(run_id, limit, marker=None):
+        start = int(marker or 0)
+        end = start + limit
+        page = {"entries": log[start:end], "has_next_page": end < len(log)}
+        if page["has_next_page"]:
+            page["marker"] = str(end)
+        return page
+
+    mock_flows_client.get_run_logs.side_effect = get_run_logs
+    fm = FlowsManager(flow_id=mock_flow_id, login_manager=auto_login)
+    entries = fm.iter_run_logs("run_id", page_size=2)
+    assert [e["code"] for e in entries] == [f"Event{i}" for i in range(5)]
+    assert mock_flows_client.get_run_logs.call_count == 3
+    position = fm.get_run_log_position("run_id")
+
+    # Only new entries are yielded, starting from the last page seen
+    mock_flows_client.get_run_logs.reset_mock()
+    assert list(fm.iter_run_logs("run_id", page_size=2)) == []
+    log.extend({"code": f"Event{i}"} for i in range(5, 8))
+    assert [e["code"] for e in fm.iter_run_logs("run_id", page_size=2)] == [
+        "Event5",
+        "Event6",
+        "Event7",
+    ]
+    assert mock_flows_client.get_run_logs.call_args_list[0].kwargs["marker"] == "4"
+
+    # Stopping early keeps the position of the last entry consumed
+    entries = fm.iter_run_logs("run_id", since=position, page_size=2)
+    assert next(entries)["code"] == "Event5"
+    entries.close()
+    assert next(fm.iter_run_logs("run_id", page_size=2))["code"] == "Event6"
+    assert len(list(fm.iter_run_logs("run_id", since="", page_size=2))) == 8
+
+
 def test_progress(
     auto_login,
     mock_flow_status_active,
@@ -332,6 +398,32 @@ def test_progress(
     assert mock_flows_client.get_run.call_count == 3
 
 
+def test_progress_stops_on_ended(
+    auto_login, mock_flow_status_active, mock_flows_client, globus_response, monkeypatch
+):
+    monkeypatch.setattr(time, "sleep", Mock())
+
+    async def mock_sleep(delay):
+        pass
+
+    monkeypatch.setattr(asyncio, "sleep", mock_sleep)
+    ended = dict(mock_flow_status_active, status="ENDED")
+    for fm in (
+        FlowsManager(flow_id=mock_flow_id, login_manager=auto_login),
+        AsyncFlowsManager(flow_id=mock_flow_id, login_manager=auto_login),
+    ):
+        mock_flows_client.get_run = Mock(
+            side_effect=[
+                globus_response(mock_data=mock_flow_status_active),
+                globus_response(mock_data=ended),
+            ]
+        )
+        result = fm.progress("run_id", callback=Mock())
+        if asyncio.iscoroutine(result):
+            asyncio.run(result)
+        assert mock_flows_client.get_run.call_count == 2
+
+
 def test_get_details(
     auto_login, mock_flow_status_succeeded, mock_flows_client, globus_response
 ):
@@ -379,3 +471,228 @@ def test_flow_manager_run_permissions(
     assert mock_specific_flow_client.run_flow.call_args.kwargs["run_managers"] == [
         "urn:globus:auth:identity:mock-user"
     ]
+
+
+def test_flow_checksum_tree_reuses_state_digests(monkeypatch):
+    from gladier.utils.flow_checksum import FlowChecksumTree
+
+    states = {f"State{i}": {"Type": "Pass", "Next": f"State{i + 1}"} for i in range(5)}
+    definition = {"StartAt": "State0", "States": states}
+    tree = FlowChecksumTree()
+    root = tree.update(definition, {})
+    stored = tree.as_dict()
+
+    hashed = []
+
+    def digest(value, original=FlowChecksumTree.digest):
+        hashed.append(value)
+        return original(value)
+
+    monkeypatch.setattr(FlowChecksumTree, "digest", staticmethod(digest))
+    assert tree.update(definition, {}) == root
+    # Only the definition, schema, kwargs, and root are re-hashed
+    assert len(hashed) == 4
+
+    changed = dict(states, State3={"Type": "Pass", "End": True})
+    hashed.clear()
+    assert tree.update(dict(definition, States=changed), {}) != root
+    assert len(hashed) == 5
+    assert tree.diff(stored) == ["State3"]
+    assert tree.changed_parts(stored) == []
+
+
+def test_flow_checksum_tree_detects_states_modified_in_place():
+    from gladier.utils.flow_checksum import FlowChecksumTree, SemanticFlowChecksumTree
+
+    states = {"A": {"Type": "Pass", "Parameters": {"value": 1}, "End": True}}
+    definition = {"StartAt": "A", "States": states}
+    for tree in (FlowChecksumTree(), SemanticFlowChecksumTree()):
+        root = tree.update(definition, {})
+        stored = tree.as_dict()
+        states["A"]["Parameters"]["value"] = 2
+        assert tree.update(definition, {}) != root
+        assert tree.diff(stored) == ["A"]
+        states["A"]["Parameters"]["value"] = 1
+
+
+def test_semantic_checksum_ignores_nested_choice_comments():
+    from gladier.utils.flow_checksum import SemanticFlowChecksumTree
+
+    def choice_state(comment):
+        rule = {"Variable": "$.x", "NumericEquals": 1, "Comment": comment}
+        return {
+            "Type": "Choice",
+            "Choices": [
+                {"And": [rule, {"Not": rule}], "Next": "B", "Comment": comment},
+                {"Or": [rule], "Next": "B"},
+            ],
+            "Default": "B",
+        }
+
+    tree = SemanticFlowChecksumTree()
+    root = tree.update({"States": {"A": choice_state("old")}}, {})
+    assert tree.update({"States": {"A": choice_state("new")}}, {}) == root
+
+
+def test_check_flow_reports_changed_states(auto_login, storage):
+    states = {"A": {"Type": "Pass", "Next": "B"}, "B": {"Type": "Pass", "End": True}}
+    fm = FlowsManager(
+        flow_id=mock_flow_id,
+        login_manager=auto_login,
+        flow_definition={"StartAt": "A", "States": states},
+    )
+    fm.storage = storage
+    fm.sync_flow()
+    assert fm.flow_changed() is False
+
+    fm.flow_definition = {
+        "StartAt": "A",
+        "States": dict(states, B={"Type": "Pass", "Result": 1, "End": True}),
+    }
+    fm.flow_schema = {"bar": "baz"}
+    with pytest.raises(gladier.exc.FlowObsolete) as exc:
+        fm.check_flow()
+    assert exc.value.items == ["B"]
+    assert "Changed: B, schema" in str(exc.value)
+
+
+def test_legacy_flow_checksum_is_upgraded(auto_login, storage, mock_flows_client):
+    definition = {"StartAt": "A", "States": {"A": {"Type": "Pass", "End": True}}}
+    fm = FlowsManager(
+        flow_id=mock_flow_id, login_manager=auto_login, flow_definition=definition
+    )
+    fm.storage = storage
+    legacy = FlowsManager.get_flow_checksum(definition, fm.flow_schema, fm.flow_kwargs)
+    storage.set_value("flow_checksum", legacy)
+
+    assert fm.flow_changed() is False
+    assert storage.get_value("flow_checksum") == fm.get_flow_checksum_tree().root
+    assert fm.get_stored_flow_checksum_tree() == fm.get_flow_checksum_tree().as_dict()
+    assert not mock_flows_client.update_flow.called
+
+
+def test_new_flow_checksum_includes_flow_kwargs(auto_login, storage, mock_flows_client):
+    fm = FlowsManager(
+        login_manager=auto_login,
+        flow_definition={"foo": "bar"},
+        flow_kwargs={"keywords": ["gladier"]},
+    )
+    fm.storage = storage
+    fm.sync_flow()
+    assert mock_flows_client.create_flow.call_count == 1
+    assert fm.flow_changed() is False
+
+
+def test_comment_changes_skip_update_flow(auto_login, storage, mock_flows_client):
+    states = {"A": {"Type": "Pass", "Comment": "Old comment", "End": True}}
+    fm = FlowsManager(
+        flow_id=mock_flow_id,
+        login_manager=auto_login,
+        flow_definition={"Comment": "My flow", "StartAt": "A", "States": states},
+        flow_kwargs={"keywords": ["gladier"]},
+    )
+    fm.storage = storage
+    fm.sync_flow()
+    assert mock_flows_client.update_flow.call_count == 1
+
+    fm.flow_definition = {
+        "Comment": "My updated flow",
+        "StartAt": "A",
+        "States": {"A": dict(states["A"], Comment="New comment")},
+    }
+    assert fm.flow_changed() is True
+    fm.sync_flow()
+    assert mock_flows_client.update_flow.call_count == 1
+    assert fm.flow_changed() is False
+    assert json.loads(storage.get_value("flow_diff")) == {
+        "changed_states": [],
+        "changed_parts": [],
+        "ignored_states": ["A"],
+        "ignored_parts": ["definition"],
+    }
+
+
+def test_metadata_changes_update_only_metadata(auto_login, storage, mock_flows_client):
+    fm = FlowsManager(
+        flow_id=mock_flow_id,
+        login_manager=auto_login,
+        flow_definition={
+            "StartAt": "A",
+            "States": {"A": {"Type": "Pass", "End": True}},
+        },
+        flow_kwargs={"keywords": ["gladier"], "description": "My flow"},
+    )
+    fm.storage = storage
+    fm.sync_flow()
+    assert mock_flows_client.update_flow.call_count == 1
+
+    fm.flow_kwargs = {"keywords": ["gladier", "flows"]}
+    fm.sync_flow()
+    assert mock_flows_client.update_flow.call_count == 2
+    mock_flows_client.update_flow.assert_called_with(
+        mock_flow_id, subtitle="", description="", keywords=["gladier", "flows"]
+    )
+    assert fm.flow_changed() is False
+    fm.sync_flow()
+    assert mock_flows_client.update_flow.call_count == 2
+
+
+def test_behavioral_changes_update_flow(auto_login, storage, mock_flows_client):
+    states = {"A": {"Type": "Pass", "End": True}, "B": {"Type": "Pass", "End": True}}
+    fm = FlowsManager(
+        flow_id=mock_flow_id,
+        login_manager=auto_login,
+        flow_definition={"StartAt": "A", "States": states},
+    )
+    fm.storage = storage
+    fm.sync_flow()
+    assert mock_flows_client.update_flow.call_count == 1
+
+    fm.flow_definition = {
+        "StartAt": "A",
+        "States": {
+            "A": {"Type": "Pass", "Result": "foo", "End": True},
+            "B": {"Type": "Pass", "Comment": "foo", "End": True},
+        },
+    }
+    fm.sync_flow()
+    assert mock_flows_client.update_flow.call_count == 2
+    diff = json.loads(storage.get_value("flow_diff"))
+    assert diff["changed_states"] == ["A"]
+    assert diff["ignored_states"] == ["B"]
+
+
+def test_async_progress(
+    auto_login,
+    mock_flow_status_active,
+    mock_flow_status_succeeded,
+    mock_flows_client,
+    monkeypatch,
+):
+    sleep = Mock()
+
+    async def mock_sleep(delay):
+        sleep(delay)
+
+    monkeypatch.setattr(time, "sleep", Mock(side_effect=AssertionError))
+    monkeypatch.setattr(asyncio, "sleep", mock_sleep)
+    fm = AsyncFlowsManager(flow_id=mock_flow_id, login_manager=auto_login)
+
+    class GlobusResponse(object):
+        _data = [
+            mock_flow_status_active,
+            mock_flow_status_active,
+            mock_flow_status_succeeded,
+        ]
+
+        @property
+        def data(self):
+            return self._data.pop(0)
+
+    mock_flows_client.get_run.return_value = GlobusResponse()
+    statuses = []
+    status = asyncio.run(fm.progress("run_id", callback=statuses.append, delay=5))
+    assert status["status"] == "SUCCEEDED"
+    assert mock_flows_client.get_run.call_count == 3
+    assert len(statuses) == 2
+    sleep.assert_called_with(5)
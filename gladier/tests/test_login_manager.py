@@ -1,5 +1,11 @@
+import time
+from unittest.mock import Mock
+
 import pytest
 from gladier.managers import CallbackLoginManager
+from gladier.managers.login_manager import ConfidentialClientLoginManager
+from gladier.storage import tokens
+from gladier.storage.tokens import GladierSecretsConfig
 from gladier.exc import AuthException
 
 
@@ -12,3 +18,34 @@ def test_callback_manager_login():
 def test_callback_manager_no_callback_set():
     with pytest.raises(AuthException):
         CallbackLoginManager({}, callback=None).login(["foo"])
+
+
+def test_confidential_client_authorizers_decode_tokens_once(disk_storage, monkeypatch):
+    storage = GladierSecretsConfig(disk_storage, "my_section")
+    expires = int(time.time()) + 3600
+    storage.write_tokens(
+        {
+            f"resource_server_{n}": {
+                "scope": f"https://auth.globus.org/scopes/rs_{n}/all",
+                "access_token": f"access_token_{n}",
+                "refresh_token": f"refresh_token_{n}",
+                "token_type": "Bearer",
+                "expires_at_seconds": expires,
+                "resource_server": f"resource_server_{n}",
+            }
+            for n in range(60)
+        }
+    )
+    mock_unpack = Mock(wraps=tokens.flat_unpack)
+    monkeypatch.setattr(tokens, "flat_unpack", mock_unpack)
+
+    clm = ConfidentialClientLoginManager("client_id", "client_secret", storage)
+    for _ in range(20):
+        authorizers = clm.get_authorizers()
+    assert len(authorizers) == 60
+    assert mock_unpack.call_count == 1
+
+    # Clearing tokens invalidates the cache
+    storage.clear_tokens()
+    assert clm.get_authorizers() == {}
+    assert mock_unpack.call_count == 2
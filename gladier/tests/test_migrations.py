@@ -1,6 +1,11 @@
+import os
+import pathlib
+from unittest.mock import Mock
+
 from gladier.tests.test_data.gladier_mocks import MockGladierClient
+from gladier.storage.backends import SQLiteBackend
 from gladier.storage.tokens import GladierSecretsConfig
-from gladier.storage.migrations import needs_migration
+from gladier.storage.migrations import needs_migration, MIGRATIONS
 
 from gladier.version import __version__
 
@@ -32,3 +37,72 @@ def test_funcx_migration(storage, logged_in):
     cfg.update()
 
     assert not cfg["my_client_section"].get("foo_funcx_id")
+
+
+def test_config_file_to_sqlite_migration(disk_storage):
+    cfg = GladierSecretsConfig(disk_storage, "my_client_section")
+    cfg.set_value("flow_id", "my_flow_id")
+    cfg.update()
+
+    sqlite_filename = disk_storage.replace(".cfg", ".sqlite")
+    db_cfg = GladierSecretsConfig(
+        sqlite_filename, "my_client_section", backend=SQLiteBackend(sqlite_filename)
+    )
+    assert needs_migration(db_cfg)
+    db_cfg.update()
+    assert db_cfg.get_value("flow_id") == "my_flow_id"
+    assert db_cfg.get("general", "version") == __version__
+    assert not needs_migration(db_cfg)
+
+    # Values are never migrated over ones which already exist in the database
+    cfg.set_value("flow_id", "changed_flow_id")
+    db_cfg.update()
+    assert db_cfg.get_value("flow_id") == "my_flow_id"
+
+
+def test_steady_state_client_init_skips_migrations(
+    disk_storage, logged_in, monkeypatch
+):
+    class DiskClient(MockGladierClient):
+        secret_config_filename = disk_storage
+
+    # The first client migrates the config to the current version
+    DiskClient(login_manager=logged_in)
+
+    mock_stat, mock_exists = Mock(wraps=os.stat), Mock()
+    monkeypatch.setattr(os, "stat", mock_stat)
+
+    def exists(self, *args, original=pathlib.Path.exists, **kwargs):
+        mock_exists()
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(pathlib.Path, "exists", exists)
+    for migration in MIGRATIONS:
+        monkeypatch.setattr(migration, "is_applicable", Mock(return_value=False))
+
+    DiskClient(login_manager=logged_in)
+    assert all(m.is_applicable.call_count == 0 for m in MIGRATIONS)
+    assert mock_exists.call_count == 0
+    # The only filesystem probes are signature checks for loading storage
+    assert {str(c.args[0]) for c in mock_stat.call_args_list} == {disk_storage}
+
+
+def test_sqlite_migrations_see_untracked_sections(disk_storage):
+    sqlite_filename = disk_storage.replace(".cfg", ".sqlite")
+    backend = SQLiteBackend(sqlite_filename)
+    backend.write(
+        {"other_client": {"foo_funcx_id": "foo_id", "foo_funcx_id_checksum": "ck"}},
+        [],
+    )
+
+    cfg = GladierSecretsConfig(sqlite_filename, "my_client_section", backend=backend)
+    cfg.update()
+
+    data, _ = backend.read(["other_client"])
+    assert data["other_client"] == {
+        "foo_function_id": "foo_id",
+        "foo_function_id_checksum": "ck",
+    }
+    # Sections which are not tracked are not kept loaded after migrating
+    assert "other_client" not in cfg.sections()
+    assert not needs_migration(cfg)
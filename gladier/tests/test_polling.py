@@ -0,0 +1,94 @@
+import time
+from unittest.mock import Mock
+
+from gladier.managers.flows_manager import FlowsManager
+from gladier.utils.polling import PollingSchedule, RunTimer
+from gladier.tests.test_data.gladier_mocks import mock_flow_id
+
+definition = {
+    "StartAt": "Eval",
+    "States": {
+        "Eval": {"Type": "ExpressionEval", "Next": "Wait"},
+        "Wait": {"Type": "Wait", "Seconds": 30, "Next": "Transfer"},
+        "Transfer": {"Type": "Action", "WaitTime": 600, "End": True},
+    },
+}
+
+
+def status_in(state, status="ACTIVE"):
+    return {
+        "status": status,
+        "details": {"code": "ActionStarted", "details": {"state_name": state}},
+    }
+
+
+def intervals(schedule, state, checks):
+    timer, now, result = RunTimer(), 0, []
+    for _ in range(checks):
+        timer.update(status_in(state), now)
+        interval = schedule.get_interval(timer, now)
+        result.append(interval)
+        now += interval
+    return result
+
+
+def test_polling_schedule_by_state_type():
+    schedule = PollingSchedule(definition, jitter=0)
+    assert intervals(schedule, "Eval", 5) == [1] * 5
+    assert intervals(schedule, "Wait", 2) == [30, 2]
+    # Backoff is capped at a tenth of the WaitTime
+    assert intervals(schedule, "Transfer", 8) == [1, 2, 4, 8, 16, 32, 60, 60]
+
+
+def test_polling_schedule_uses_history():
+    schedule = PollingSchedule(definition, durations={"Transfer": 200}, jitter=0)
+    assert intervals(schedule, "Transfer", 3) == [200, 2, 4]
+
+    schedule.record("Transfer", 100)
+    assert schedule.durations["Transfer"] == 170
+    assert schedule.changed
+
+
+def test_polling_schedule_jitter():
+    schedule = PollingSchedule(definition, jitter=0.2)
+    values = intervals(schedule, "Transfer", 20)
+    assert all(48 <= v <= 72 for v in values[-5:])
+    assert len(set(values)) > 1
+
+
+def test_adaptive_progress(auto_login, storage, mock_flows_client, monkeypatch):
+    clock = Mock(now=0.0)
+
+    def sleep(seconds):
+        clock.now += seconds
+
+    monkeypatch.setattr(time, "sleep", sleep)
+    monkeypatch.setattr(time, "monotonic", lambda: clock.now)
+
+    def get_run(run_id):
+        if clock.now < 2:
+            return Mock(data=status_in("Eval"))
+        elif clock.now < 32:
+            return Mock(data=status_in("Wait"))
+        elif clock.now < 3600:
+            return Mock(data=status_in("Transfer"))
+        return Mock(data={"status": "SUCCEEDED", "details": {}})
+
+    mock_flows_client.get_run.side_effect = get_run
+    fm = FlowsManager(
+        flow_id=mock_flow_id, flow_definition=definition, login_manager=auto_login
+    )
+    fm.storage = storage
+    fm.progress("run_id", callback=Mock())
+
+    # A fixed two second delay would have checked the run 1800 times
+    assert mock_flows_client.get_run.call_count < 120
+    durations = fm.get_polling_schedule().durations
+    assert set(durations) == {"Eval", "Wait", "Transfer"}
+    assert 3500 < durations["Transfer"] < 3700
+
+    # Later runs use the observed durations
+    mock_flows_client.get_run.reset_mock()
+    clock.now = 0.0
+    fm.progress("run_id", callback=Mock())
+    assert mock_flows_client.get_run.call_count < 20
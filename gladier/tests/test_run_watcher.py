@@ -0,0 +1,189 @@
+import asyncio
+import threading
+
+import pytest
+
+from gladier.managers import run_watcher
+from gladier.managers.run_watcher import AsyncRunWatcher, RunWatcher
+from gladier.tests.test_data.gladier_mocks import MockGladierClient
+from gladier.tests.test_client import MockAsyncGladierClient
+from gladier.utils.polling import PollingSchedule
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class FakeFlowsManager:
+    """Runs go ACTIVE -> INACTIVE -> SUCCEEDED, changing every ``duration`` seconds"""
+
+    def __init__(self, clock, durations):
+        self.clock = clock
+        self.durations = durations
+        self.requests = []
+
+    def get_status(self, run_id):
+        self.requests.append((self.clock.now, run_id))
+        step = int(self.clock.now // self.durations[run_id])
+        status = ["ACTIVE", "INACTIVE", "SUCCEEDED"][min(step, 2)]
+        return {"run_id": run_id, "status": status}
+
+    def save_polling_schedule(self, schedule):
+        pass
+
+
+class FakeAsyncFlowsManager(FakeFlowsManager):
+    async def get_status(self, run_id):
+        return super().get_status(run_id)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeTime()
+    monkeypatch.setattr(run_watcher, "time", clock)
+
+    async def sleep(seconds):
+        clock.sleep(seconds)
+
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+    return clock
+
+
+async def collect(watcher):
+    return [status async for status in watcher]
+
+
+def test_run_watcher_callbacks_on_transitions(clock):
+    fm = FakeFlowsManager(clock, {"fast": 5, "slow": 100})
+    transitions = []
+    watcher = RunWatcher(
+        fm, ["fast", "slow"], callback=lambda s: transitions.append(s["status"])
+    )
+    completed = [status["run_id"] for status in watcher]
+
+    assert completed == ["fast", "slow"]
+    assert transitions.count("ACTIVE") == 2
+    assert transitions.count("INACTIVE") == 2
+    assert transitions.count("SUCCEEDED") == 2
+    # Checks on the slow run back off while it stays the same
+    slow_checks = [when for when, run_id in fm.requests if run_id == "slow"]
+    assert len(slow_checks) < 200 / watcher.min_interval / 4
+
+
+def test_run_watcher_request_rate(clock):
+    run_ids = [f"run_{i}" for i in range(100)]
+    fm = FakeFlowsManager(clock, {run_id: 30 for run_id in run_ids})
+    watcher = RunWatcher(fm, run_ids, requests_per_second=10, batch_size=10)
+    completed = list(watcher)
+
+    assert len(completed) == 100
+    assert watcher.requests == len(fm.requests)
+    for second in range(int(clock.now) + 1):
+        requests = [w for w, _ in fm.requests if second <= w < second + 1]
+        assert len(requests) <= 10
+
+
+def test_run_watcher_reuses_bounded_threads(clock):
+    run_ids = [f"run_{i}" for i in range(50)]
+    fm = FakeFlowsManager(clock, {run_id: 30 for run_id in run_ids})
+    get_status, threads = fm.get_status, set()
+
+    def thread_get_status(run_id):
+        threads.add(threading.current_thread().name)
+        return get_status(run_id)
+
+    fm.get_status = thread_get_status
+    watcher = RunWatcher(fm, run_ids, batch_size=10, max_workers=3)
+    assert len(list(watcher)) == 50
+    assert len(threads) <= 3
+    assert watcher._executor is None
+
+
+def test_run_watcher_unwatch_and_errors(clock):
+    fm = FakeFlowsManager(clock, {"ok": 5, "removed": 5})
+    get_status = fm.get_status
+    errors = []
+
+    def flaky_get_status(run_id):
+        if run_id == "ok" and not errors:
+            errors.append(run_id)
+            raise ValueError("Temporary failure")
+        return get_status(run_id)
+
+    fm.get_status = flaky_get_status
+    watcher = RunWatcher(fm, ["ok", "removed"])
+    watcher.poll()
+    watcher.unwatch("removed")
+    assert [s["run_id"] for s in watcher] == ["ok"]
+    assert errors == ["ok"]
+
+
+def test_client_watch_runs(logged_in, mock_flows_client, globus_response, clock):
+    cli = MockGladierClient(login_manager=logged_in)
+    mock_flows_client.get_run.return_value = globus_response(
+        mock_data={"run_id": "my_run", "status": "SUCCEEDED", "details": {}}
+    )
+    watcher = cli.watch_runs(["my_run"])
+    assert [s["run_id"] for s in watcher] == ["my_run"]
+
+
+def test_watch_runs_interval_options(logged_in):
+    cli = MockGladierClient(login_manager=logged_in)
+    default = cli.watch_runs(["my_run"])
+    assert default.schedule is not None
+    assert default.max_interval == default.schedule.max_interval
+
+    watcher = cli.watch_runs(["my_run"], min_interval=10, backoff=3)
+    assert watcher.schedule is None
+    assert (watcher.min_interval, watcher.backoff) == (10, 3)
+
+
+def test_run_watcher_clamps_schedule(clock):
+    fm = FakeFlowsManager(clock, {"run": 1000})
+    watcher = RunWatcher(
+        fm,
+        ["run"],
+        min_interval=5,
+        max_interval=20,
+        schedule=PollingSchedule(min_interval=0.1, max_interval=300),
+    )
+    list(watcher)
+    checks = [when for when, _ in fm.requests]
+    intervals = [b - a for a, b in zip(checks, checks[1:])]
+    assert min(intervals) == pytest.approx(5)
+    assert max(intervals) == pytest.approx(20)
+
+
+def test_async_run_watcher(clock):
+    fm = FakeAsyncFlowsManager(clock, {"fast": 5, "slow": 100})
+    transitions = []
+
+    async def callback(status):
+        transitions.append(status["status"])
+
+    watcher = AsyncRunWatcher(fm, ["fast", "slow"], callback=callback)
+    with pytest.raises(TypeError):
+        list(watcher)
+    completed = asyncio.run(collect(watcher))
+
+    assert [s["run_id"] for s in completed] == ["fast", "slow"]
+    assert transitions.count("SUCCEEDED") == 2
+    assert watcher.requests == len(fm.requests)
+
+
+def test_async_client_watch_runs(logged_in, mock_flows_client, globus_response, clock):
+    cli = MockAsyncGladierClient(login_manager=logged_in)
+    mock_flows_client.get_run.return_value = globus_response(
+        mock_data={"run_id": "my_run", "status": "SUCCEEDED", "details": {}}
+    )
+    watcher = cli.watch_runs(["my_run"])
+    assert isinstance(watcher, AsyncRunWatcher)
+    completed = asyncio.run(collect(watcher))
+    assert [s["run_id"] for s in completed] == ["my_run"]
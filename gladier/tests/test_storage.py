@@ -0,0 +1,700 @@
+import os
+import stat
+import subprocess
+import sys
+import configparser
+import multiprocessing
+import threading
+from unittest.mock import Mock
+
+import globus_sdk
+import pytest
+
+from gladier.exc import ConfigException
+from gladier.managers import UserAppLoginManager
+from gladier.storage.backends import (
+    ConfigFileBackend,
+    MemoryBackend,
+    SectionUpdate,
+    ShardedConfigFileBackend,
+    SQLiteBackend,
+    apply_changes,
+)
+from gladier.storage.config import GladierConfig
+from gladier.storage.function_cache import FunctionChecksumCache
+from gladier.storage.profiler import StorageProfiler
+from gladier.storage.run_cache import RunStatusCache
+from gladier.storage.run_index import RunIndex, get_input_hash
+from gladier.storage.tokens import GladierSecretsConfig
+from gladier.tests.test_data.gladier_mocks import MockGladierClient
+
+
+@pytest.fixture
+def count_parses(monkeypatch):
+    """Count the number of times a config file is read and parsed from disk"""
+    mock_read = Mock(wraps=configparser.ConfigParser.read)
+
+    def read(self, *args, **kwargs):
+        return mock_read(self, *args, **kwargs)
+
+    monkeypatch.setattr(configparser.ConfigParser, "read", read)
+    return mock_read
+
+
+def test_get_value_uses_cached_parse(disk_storage, count_parses):
+    cfg = GladierConfig(disk_storage, "my_section")
+    cfg.set_value("foo", "bar")
+    count_parses.reset_mock()
+    for _ in range(10):
+        assert cfg.get_value("foo") == "bar"
+    assert count_parses.call_count == 0
+
+
+def test_get_value_reloads_on_external_change(disk_storage, count_parses):
+    cfg = GladierConfig(disk_storage, "my_section")
+    cfg.set_value("foo", "bar")
+    other = GladierConfig(disk_storage, "my_section")
+    other.set_value("foo", "baz")
+    other.set_value("removed", "yes")
+    assert cfg.get_value("removed") == "yes"
+    other.del_value("removed")
+
+    count_parses.reset_mock()
+    assert cfg.get_value("foo") == "baz"
+    assert cfg.get_value("removed") is None
+    assert count_parses.call_count == 1
+
+
+def test_run_flow_preflight_parse_cost(disk_storage, count_parses, logged_in):
+    class DiskClient(MockGladierClient):
+        secret_config_filename = disk_storage
+
+    # Cold: nothing has been parsed or registered yet
+    count_parses.reset_mock()
+    cli = DiskClient(login_manager=logged_in)
+    cli.run_flow()
+    cold = count_parses.call_count
+
+    # Warm: everything is registered and the config has already been parsed
+    count_parses.reset_mock()
+    cli.run_flow()
+    warm = count_parses.call_count
+
+    assert cold >= 1
+    assert warm == 0
+
+
+def test_secrets_config_uses_cached_parse(disk_storage, count_parses):
+    cfg = GladierSecretsConfig(disk_storage, "my_section", tokens_section="tokens")
+    cfg.write_tokens(
+        {
+            "auth.globus.org": {
+                "scope": "openid",
+                "access_token": "access",
+                "refresh_token": None,
+                "token_type": "Bearer",
+                "expires_at_seconds": 1539984535,
+                "resource_server": "auth.globus.org",
+            }
+        }
+    )
+    count_parses.reset_mock()
+    assert cfg.read_tokens()["auth.globus.org"]["access_token"] == "access"
+    assert count_parses.call_count == 0
+
+
+def _write_keys(filename, worker, count):
+    cfg = GladierConfig(filename, f"section_{worker % 4}")
+    for num in range(count):
+        cfg.set_value(f"worker_{worker}_key_{num}", str(num))
+
+
+def test_concurrent_writes_lose_no_updates(disk_storage):
+    workers, writes = 16, 10
+    ctx = multiprocessing.get_context(
+        "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+    )
+    procs = [
+        ctx.Process(target=_write_keys, args=(disk_storage, w, writes))
+        for w in range(workers)
+    ]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+    assert all(proc.exitcode == 0 for proc in procs)
+
+    cfg = configparser.ConfigParser()
+    cfg.read(disk_storage)
+    written = sum(len(cfg[s]) for s in cfg.sections())
+    lost_updates = workers * writes - written
+    assert lost_updates == 0
+
+
+def test_interleaved_writes_are_merged(disk_storage):
+    first = GladierConfig(disk_storage, "my_section")
+    second = GladierConfig(disk_storage, "my_section")
+    first.set_value("flow_id", "my_flow_id")
+    # The second config has not seen flow_id, and must not clobber it
+    second.set_value("flow_checksum", "my_checksum")
+    second.del_value("never_existed")
+
+    cfg = configparser.ConfigParser()
+    cfg.read(disk_storage)
+    assert dict(cfg["my_section"]) == {
+        "flow_id": "my_flow_id",
+        "flow_checksum": "my_checksum",
+    }
+
+
+def test_config_shared_by_threads(disk_storage):
+    backend = MemoryBackend()
+    shared = GladierConfig("shared", "my_section", backend=backend)
+    other = GladierConfig("other", "my_section", backend=backend)
+    errors = []
+
+    def use_shared(worker):
+        try:
+            for num in range(200):
+                shared.set_value(f"worker_{worker}", str(num))
+                assert shared.get_value(f"worker_{worker}") == str(num)
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=use_shared, args=(w,)) for w in range(8)]
+    for thread in threads:
+        thread.start()
+    # Changes from another config force the shared config to reload as it is used
+    for num in range(200):
+        other.set_value("flow_id", str(num))
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert shared.get_value("flow_id") == "199"
+    assert all(shared.get_value(f"worker_{w}") == "199" for w in range(8))
+
+
+def test_secrets_are_written_with_restricted_permissions(disk_storage):
+    cfg = GladierSecretsConfig(disk_storage, "my_section")
+    cfg.clear_tokens()
+    assert stat.S_IMODE(os.stat(disk_storage).st_mode) == (
+        GladierSecretsConfig.DEFAULT_PERMISSION
+    )
+
+
+@pytest.fixture
+def sqlite_filename(disk_storage):
+    return disk_storage.replace(".cfg", ".sqlite")
+
+
+def test_sqlite_backend_get_set_del(sqlite_filename):
+    backend = SQLiteBackend(sqlite_filename)
+    cfg = GladierConfig(sqlite_filename, "my_section", backend=backend)
+    cfg.set_value("flow_id", "my_flow_id")
+    assert cfg.get_value("flow_id") == "my_flow_id"
+
+    other = GladierConfig(
+        sqlite_filename, "my_section", backend=SQLiteBackend(sqlite_filename)
+    )
+    assert other.get_value("flow_id") == "my_flow_id"
+    other.del_value("flow_id")
+    assert cfg.get_value("flow_id") is None
+
+
+def test_sqlite_backend_only_reads_tracked_sections(sqlite_filename, monkeypatch):
+    backend = SQLiteBackend(sqlite_filename)
+    backend.write({f"client_{n}": {"flow_id": str(n)} for n in range(100)}, [])
+    cfg = GladierConfig(sqlite_filename, "client_1", backend=backend)
+    assert cfg.sections() == ["client_1"]
+    assert cfg.get_value("flow_id") == "1"
+
+    # Writes to other sections do not invalidate this one
+    backend.write({"client_2": {"flow_id": "changed"}}, [])
+    mock_read = Mock(wraps=backend._read)
+    monkeypatch.setattr(backend, "_read", mock_read)
+    assert cfg.get_value("flow_id") == "1"
+    assert mock_read.call_count == 0
+
+
+def test_sqlite_concurrent_writes_lose_no_updates(sqlite_filename):
+    workers, writes = 16, 10
+    ctx = multiprocessing.get_context(
+        "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+    )
+    procs = [
+        ctx.Process(target=_write_sqlite_keys, args=(sqlite_filename, w, writes))
+        for w in range(workers)
+    ]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+    assert all(proc.exitcode == 0 for proc in procs)
+
+    backend = SQLiteBackend(sqlite_filename)
+    data, _ = backend.read([f"section_{n}" for n in range(4)])
+    assert sum(len(values) for values in data.values()) == workers * writes
+
+
+def _write_sqlite_keys(filename, worker, count):
+    cfg = GladierConfig(filename, f"section_{worker % 4}", SQLiteBackend(filename))
+    for num in range(count):
+        cfg.set_value(f"worker_{worker}_key_{num}", str(num))
+
+
+def test_client_sqlite_storage_backend(sqlite_filename, monkeypatch, logged_in):
+    class DiskClient(MockGladierClient):
+        secret_config_filename = sqlite_filename
+
+    monkeypatch.setenv("GLADIER_STORAGE_BACKEND", "sqlite")
+    cli = DiskClient(login_manager=logged_in)
+    assert isinstance(cli.storage.backend, SQLiteBackend)
+    cli.run_flow()
+    assert cli.storage.get_value("flow_id") == "mock_flow_id"
+    assert stat.S_IMODE(os.stat(sqlite_filename).st_mode) == (
+        GladierSecretsConfig.DEFAULT_PERMISSION
+    )
+
+
+def test_sqlite_sidecars_are_written_with_restricted_permissions(sqlite_filename):
+    permission = GladierSecretsConfig.DEFAULT_PERMISSION
+    runs_filename = sqlite_filename.replace(".sqlite", ".runs.sqlite")
+    umask = os.umask(0o022)
+    try:
+        backend = SQLiteBackend(sqlite_filename, permission=permission)
+        GladierConfig(sqlite_filename, "my_section", backend=backend).set_value(
+            "flow_id", "my_flow_id"
+        )
+        cache = RunStatusCache(runs_filename, permission=permission)
+        cache.set("done", {"run_id": "done", "status": "SUCCEEDED"})
+    finally:
+        os.umask(umask)
+    for filename in (sqlite_filename, runs_filename):
+        for name in (filename, f"{filename}-wal", f"{filename}-shm"):
+            assert stat.S_IMODE(os.stat(name).st_mode) == permission
+
+
+def test_client_sqlite_storage_backend_refuses_config_file(
+    disk_storage, monkeypatch, logged_in
+):
+    GladierSecretsConfig(disk_storage, "my_section").set_value("flow_id", "my_flow")
+
+    class DiskClient(MockGladierClient):
+        secret_config_filename = disk_storage
+
+    monkeypatch.setenv("GLADIER_STORAGE_BACKEND", "sqlite")
+    with pytest.raises(ConfigException):
+        DiskClient(login_manager=logged_in)
+    assert GladierSecretsConfig(disk_storage, "my_section").get_value("flow_id") == (
+        "my_flow"
+    )
+    # A new database with a .cfg filename is not its own legacy config
+    new_cfg = disk_storage.replace("gladier.cfg", "new.cfg")
+    assert SQLiteBackend(new_cfg).legacy_config_filename is None
+
+
+def test_client_unknown_storage_backend(monkeypatch, logged_in):
+    monkeypatch.setenv("GLADIER_STORAGE_BACKEND", "potatoes")
+    with pytest.raises(ConfigException):
+        MockGladierClient(login_manager=logged_in)
+
+
+@pytest.fixture
+def count_writes(monkeypatch):
+    """Count the number of times changes are written to storage"""
+    counter = Mock()
+    for backend_cls in (ConfigFileBackend, SQLiteBackend):
+
+        def write(self, *args, original=backend_cls.write, **kwargs):
+            counter()
+            return original(self, *args, **kwargs)
+
+        monkeypatch.setattr(backend_cls, "write", write)
+    return counter
+
+
+def test_transaction_saves_once(disk_storage, count_writes):
+    cfg = GladierConfig(disk_storage, "my_section")
+    writes = count_writes.call_count
+    with cfg.transaction():
+        cfg.set_value("flow_id", "my_flow_id")
+        with cfg.transaction():
+            cfg.set_value("flow_checksum", "my_checksum")
+        cfg.del_value("flow_id")
+        assert count_writes.call_count == writes
+    assert count_writes.call_count == writes + 1
+
+    other = GladierConfig(disk_storage, "my_section")
+    assert other.get_value("flow_checksum") == "my_checksum"
+    assert other.get_value("flow_id") is None
+
+
+def test_transaction_saves_on_error(disk_storage):
+    cfg = GladierConfig(disk_storage, "my_section")
+    with pytest.raises(ValueError):
+        with cfg.transaction():
+            cfg.set_value("flow_id", "my_flow_id")
+            raise ValueError()
+    assert GladierConfig(disk_storage, "my_section").get_value("flow_id")
+
+
+def test_no_write_without_changes(disk_storage, count_writes):
+    cfg = GladierConfig(disk_storage, "my_section")
+    writes = count_writes.call_count
+    with cfg.transaction():
+        cfg.del_value("does_not_exist")
+    assert count_writes.call_count == writes
+
+
+def test_registration_writes_once(
+    disk_storage, count_writes, logged_in, many_function_client
+):
+    DiskClient = many_function_client(3, secret_config_filename=disk_storage)
+    cli = DiskClient(login_manager=logged_in)
+    writes = count_writes.call_count
+    cli.get_compute_function_ids()
+    assert count_writes.call_count == writes + 1
+    assert cli.storage.get_value("func_2_function_id_checksum")
+
+    writes = count_writes.call_count
+    cli.sync_flow()
+    assert count_writes.call_count == writes + 1
+    assert cli.storage.get_value("flow_checksum")
+
+    # Nothing has changed, so nothing is written
+    writes = count_writes.call_count
+    cli.run_flow()
+    assert count_writes.call_count == writes
+
+
+def test_apply_changes_does_not_add_removed_sections():
+    data = {"kept": {"a": "1"}, "removed": {"a": "1"}}
+    apply_changes(
+        data,
+        {
+            "kept": SectionUpdate(a=None, b="2"),
+            "removed": None,
+            "gone": SectionUpdate(a="1"),
+            "new": {"a": "1"},
+        },
+    )
+    assert data == {"kept": {"b": "2"}, "new": {"a": "1"}}
+
+
+@pytest.fixture(params=["config", "sqlite", "sharded", "memory"])
+def any_backend(request, disk_storage):
+    if request.param == "config":
+        return ConfigFileBackend(disk_storage)
+    elif request.param == "sqlite":
+        return SQLiteBackend(disk_storage.replace(".cfg", ".sqlite"))
+    elif request.param == "sharded":
+        return ShardedConfigFileBackend(disk_storage.replace(".cfg", ".d"))
+    return MemoryBackend()
+
+
+def test_concurrently_removed_section_is_not_added_back(any_backend):
+    cfg = GladierConfig("filename", "my_section", backend=any_backend)
+    other = GladierConfig("filename", "my_section", backend=any_backend)
+    cfg.set_value("flow_id", "my_flow_id")
+    assert other.get_value("flow_id") == "my_flow_id"
+
+    with cfg.transaction():
+        cfg.set_value("flow_checksum", "my_checksum")
+        other.remove_section("my_section")
+        other.save()
+    data, _ = any_backend.read(["my_section"])
+    assert "my_section" not in data
+
+    # The section can still be added again
+    assert cfg.get_value("flow_id") is None
+    cfg.set_value("flow_id", "new_flow_id")
+    data, _ = any_backend.read(["my_section"])
+    assert data["my_section"] == {"flow_id": "new_flow_id"}
+    assert other.get_value("flow_id") == "new_flow_id"
+
+
+def test_memory_backend_snapshot_and_export(disk_storage):
+    backend = MemoryBackend(data='{"my_section": {"flow_id": "my_flow_id"}}')
+    cfg = GladierSecretsConfig(None, "my_section", backend=backend)
+    assert cfg.get_value("flow_id") == "my_flow_id"
+    cfg.set_value("flow_checksum", "my_checksum")
+
+    exported = backend.export()
+    assert exported["my_section"] == {
+        "flow_id": "my_flow_id",
+        "flow_checksum": "my_checksum",
+    }
+    seeded = GladierConfig(None, "my_section", backend=MemoryBackend(data=exported))
+    assert seeded.get_value("flow_checksum") == "my_checksum"
+
+
+def test_memory_storage_client_has_no_disk_io(
+    disk_storage, logged_in, mock_compute_client, monkeypatch, tmp_path
+):
+    workdir = tmp_path / "workdir"
+    workdir.mkdir()
+    monkeypatch.setenv("HOME", str(workdir))
+    monkeypatch.chdir(workdir)
+
+    class MemoryClient(MockGladierClient):
+        secret_config_filename = None
+        storage_backend = "memory"
+
+    cli = MemoryClient(login_manager=logged_in)
+    cli.run_flow()
+    assert list(workdir.iterdir()) == []
+    assert mock_compute_client.register_function.call_count == 1
+
+    # A new worker seeded with the exported snapshot does not need to register anything
+    monkeypatch.setenv("GLADIER_STORAGE_SNAPSHOT", cli.storage.backend.export_json())
+    cli = MemoryClient(login_manager=logged_in)
+    cli.get_input()
+    cli.sync_flow()
+    assert list(workdir.iterdir()) == []
+    assert mock_compute_client.register_function.call_count == 1
+    assert cli.storage.get_value("flow_id") == "mock_flow_id"
+    assert not cli.flows_manager.flow_changed()
+
+
+def test_memory_storage_user_app_token_storage(disk_storage):
+    cfg = GladierSecretsConfig(None, "my_section", backend=MemoryBackend())
+    login_manager = UserAppLoginManager("client_id", storage=cfg)
+    assert isinstance(
+        login_manager.token_storage, globus_sdk.token_storage.MemoryTokenStorage
+    )
+
+
+def test_sharded_backend_only_touches_relevant_shards(tmp_path, disk_storage):
+    shards = str(tmp_path / "gladier.d")
+    first = GladierConfig(shards, "first_client", ShardedConfigFileBackend(shards))
+    second = GladierConfig(shards, "second_client", ShardedConfigFileBackend(shards))
+    first.set_value("flow_id", "first_flow_id")
+    second.set_value("flow_id", "second_flow_id")
+
+    backend = ShardedConfigFileBackend(shards)
+    assert set(backend.get_sections()) == {"first_client", "second_client"}
+    first_shard = backend.get_shard("first_client").filename
+    first_signature = backend.get_shard("first_client").get_signature()
+
+    second.set_value("flow_checksum", "second_checksum")
+    assert backend.get_shard("first_client").get_signature() == first_signature
+    with open(first_shard) as f:
+        assert "second" not in f.read()
+    assert first.get_value("flow_id") == "first_flow_id"
+    assert second.get_value("flow_checksum") == "second_checksum"
+
+
+def test_client_sharded_storage_backend(disk_storage, logged_in, monkeypatch):
+    shards = disk_storage.replace(".cfg", ".d")
+
+    class DiskClient(MockGladierClient):
+        secret_config_filename = shards
+        storage_backend = "sharded"
+
+    cli = DiskClient(login_manager=logged_in)
+    cli.run_flow()
+    assert isinstance(cli.storage.backend, ShardedConfigFileBackend)
+    assert set(cli.storage.backend.get_sections()) == {
+        "general",
+        "disk_client",
+        f"tokens_{DiskClient.client_id}",
+    }
+    assert DiskClient(login_manager=logged_in).get_flow_id() == "mock_flow_id"
+
+
+def test_storage_profiler_counts_io(disk_storage):
+    cfg = GladierConfig(disk_storage, "my_section")
+    with StorageProfiler() as profiler:
+        cfg.set_value("foo", "bar")
+        for _ in range(5):
+            cfg.get_value("foo")
+    cfg.get_value("foo")
+
+    total = profiler.report.total
+    assert total.loads == 6
+    assert total.reads == 0
+    assert total.saves == 1
+    assert total.bytes_written == os.path.getsize(disk_storage)
+    assert total.seconds > 0
+    assert set(profiler.report.operations) == {"other"}
+
+
+def test_storage_profiler_attributes_operations(disk_storage, logged_in):
+    class DiskClient(MockGladierClient):
+        secret_config_filename = disk_storage
+
+    with StorageProfiler() as profiler:
+        cli = DiskClient(login_manager=logged_in)
+        cli.run_flow()
+    report = profiler.report
+    ops = report.operations
+    assert ops["ComputeManager.validate_functions"].saves == 0
+    assert ops["GladierBaseClient.get_input"].saves == 1
+    assert ops["FlowsManager.check_flow"].loads >= 1
+    assert ops["FlowsManager.register_flow"].saves == 1
+    assert report.as_dict()["total"]["saves"] == report.total.saves
+
+    # Everything is deployed, nothing should be written or re-read on later runs
+    with StorageProfiler() as profiler:
+        cli.run_flow()
+    assert profiler.report.total.saves == 0
+    assert profiler.report.total.reads == 0
+    assert profiler.report.total.bytes_read == 0
+
+
+def test_storage_profiler_sqlite_bytes(sqlite_filename):
+    backend = SQLiteBackend(sqlite_filename)
+    cfg = GladierConfig(sqlite_filename, "my_section", backend=backend)
+    with StorageProfiler() as profiler:
+        cfg.set_value("foo", "bar")
+    assert profiler.report.total.bytes_written == len(b"foo = bar\n")
+
+
+def test_run_status_cache_only_keeps_finished_runs(tmp_path):
+    cache = RunStatusCache(str(tmp_path / "runs.sqlite"))
+    assert cache.set("active", {"status": "ACTIVE"}) is False
+    assert cache.set("done", {"status": "SUCCEEDED", "details": {"output": 1}})
+    assert cache.get("active") is None
+    assert cache.get("done") == {"status": "SUCCEEDED", "details": {"output": 1}}
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.close()
+
+    # Finished runs are still cached for new processes
+    assert RunStatusCache(str(tmp_path / "runs.sqlite")).get("done")
+
+
+def test_run_status_cache_evicts_least_recently_used():
+    cache = RunStatusCache(max_entries=3)
+    for run_id in ("a", "b", "c"):
+        cache.set(run_id, {"status": "SUCCEEDED"})
+    cache.get("a")
+    cache.set("d", {"status": "FAILED"})
+    assert len(cache) == 3
+    assert cache.get("b") is None
+    assert cache.get("a") and cache.get("d")
+
+    cache.max_bytes = cache.get_size() // 2
+    cache.set("e", {"status": "ENDED"})
+    assert cache.get_size() <= cache.max_bytes
+    assert cache.get("e")
+
+
+def test_client_run_status_cache(disk_storage, logged_in, mock_flows_client):
+    class DiskClient(MockGladierClient):
+        secret_config_filename = disk_storage
+        run_status_cache = True
+
+    cli = DiskClient(login_manager=logged_in)
+    cache = cli.flows_manager.run_cache
+    assert cache.filename == disk_storage.replace(".cfg", ".runs.sqlite")
+    cache.get("my_run")
+    assert stat.S_IMODE(os.stat(cache.filename).st_mode) == 0o600
+
+
+def test_run_index_queries(tmp_path):
+    index = RunIndex(str(tmp_path / "runs.index.sqlite"))
+    for i in range(6):
+        index.add(
+            {
+                "run_id": f"run_{i}",
+                "label": f"dataset-{'x' if i % 2 else 'y'}-{i}",
+                "status": "ACTIVE",
+                "start_time": f"2024-01-0{i + 1}T00:00:00+00:00",
+            },
+            flow_input={"input": {"i": i}},
+            flow_id="my_flow",
+            tags=["nightly"] if i < 3 else ["weekly", "big"],
+        )
+    index.update_status("run_1", "FAILED")
+    index.close()
+
+    index = RunIndex(str(tmp_path / "runs.index.sqlite"))
+    ids = lambda runs: [r["run_id"] for r in runs]  # noqa: E731
+    assert ids(index.query(tag="nightly")) == ["run_2", "run_1", "run_0"]
+    assert ids(index.query(label_prefix="dataset-x")) == ["run_5", "run_3", "run_1"]
+    assert ids(index.query(status="FAILED")) == ["run_1"]
+    assert ids(index.query(status=["FAILED", "ACTIVE"], limit=2)) == ["run_5", "run_4"]
+    assert ids(index.query(since="2024-01-03T00:00:00+00:00", until=1704412800)) == [
+        "run_3",
+        "run_2",
+    ]
+    assert ids(index.query(input_hash=get_input_hash({"input": {"i": 4}}))) == ["run_4"]
+    assert ids(index.query(tag="weekly", label_prefix="dataset-y")) == ["run_4"]
+    assert index.get("run_3")["tags"] == ["big", "weekly"]
+    assert index.get("run_3")["flow_id"] == "my_flow"
+    assert index.get("missing") is None
+
+
+def cached_function():
+    return "cached"
+
+
+def test_function_checksum_cache(tmp_path):
+    filename = str(tmp_path / "functions.sqlite")
+    compute = Mock(return_value="my_checksum")
+    cache = FunctionChecksumCache(filename)
+    assert cache.get_checksum(cached_function, compute) == "my_checksum"
+    assert cache.get_checksum(cached_function, compute) == "my_checksum"
+    assert compute.call_count == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.close()
+
+    # Checksums are kept for other processes, unless they serialize differently
+    assert FunctionChecksumCache(filename).get_checksum(cached_function, compute)
+    assert compute.call_count == 1
+    FunctionChecksumCache(filename, namespace="other").get_checksum(
+        cached_function, compute
+    )
+    assert compute.call_count == 2
+
+
+def test_function_checksum_cache_follows_source(tmp_path, monkeypatch):
+    module_file = tmp_path / "my_compute_module.py"
+    monkeypatch.syspath_prepend(str(tmp_path))
+    cache = FunctionChecksumCache(str(tmp_path / "functions.sqlite"))
+
+    def load(source, mtime):
+        module_file.write_text(source)
+        os.utime(module_file, ns=(mtime, mtime))
+        namespace = {}
+        exec(compile(source, str(module_file), "exec"), namespace)
+        return namespace["my_func"]
+
+    compute = Mock(side_effect=lambda func: func())
+    assert cache.get_checksum(load("def my_func():\n    return 1\n", 1), compute) == 1
+    assert cache.get_checksum(load("def my_func():\n    return 1\n", 1), compute) == 1
+    assert compute.call_count == 1
+    # A comment changes the source, but not the code
+    edited = load("def my_func():\n    # One\n    return 1\n", 2)
+    assert cache.get_checksum(edited, compute) == 1
+    assert compute.call_count == 2
+    assert cache.get_checksum(load("def my_func():\n    return 2\n", 2), compute) == 2
+    # Only the latest version of each function is kept
+    assert len(cache) == 1
+
+    # Functions with no source file are not cached
+    namespace = {}
+    exec("def my_func():\n    return 3\n", namespace)
+    cache.get_checksum(namespace["my_func"], compute)
+    cache.get_checksum(namespace["my_func"], compute)
+    assert compute.call_count == 5
+
+
+def test_code_digest_is_stable_across_processes():
+    script = (
+        "from gladier.storage.function_cache import get_code_digest\n"
+        "def func(x):\n"
+        "    return x in {'alpha', 'beta', 'gamma', 'delta'}, ({'a', 'b'}, 1)\n"
+        "print(get_code_digest(func.__code__))\n"
+    )
+    digests = {
+        subprocess.run(
+            [sys.executable, "-c", script],
+            env=dict(os.environ, PYTHONHASHSEED=seed),
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+        for seed in ("1", "2", "3")
+    }
+    assert len(digests) == 1
@@ -0,0 +1,99 @@
+import http.server
+import threading
+from unittest.mock import Mock
+
+import globus_sdk
+import pytest
+from globus_compute_sdk import Client
+
+from gladier.managers import ComputeManager, compute_manager
+from gladier.utils.transport import PooledTransport
+from gladier.tests.test_data.gladier_mocks import MockGladierClient
+
+
+class JSONHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"{}"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), JSONHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("keep_alive, connections", [(True, 1), (False, 6)])
+def test_pooled_transport_reuses_connections(local_server, keep_alive, connections):
+    transport = PooledTransport(keep_alive=keep_alive)
+    clients = [
+        globus_sdk.BaseClient(base_url=local_server, transport=transport)
+        for _ in range(2)
+    ]
+    for _ in range(3):
+        for client in clients:
+            client.get("/status")
+    assert transport.stats.as_dict() == {
+        "requests": 6,
+        "connections": connections,
+        "reused": 6 - connections,
+    }
+
+
+def test_client_shares_transport(logged_in):
+    class PooledClient(MockGladierClient):
+        transport_pool_size = 4
+
+    cli = PooledClient(login_manager=logged_in)
+    assert cli.transport.pool_size == 4
+    fm = cli.flows_manager
+    assert fm.flows_client.transport is cli.transport
+    assert fm.specific_flow_client.transport is cli.transport
+    assert fm.refresh_specific_flow_client().transport is cli.transport
+    assert cli.compute_manager.transport is cli.transport
+
+
+def test_compute_client_uses_transport():
+    transport = PooledTransport()
+    compute_client = Client(
+        authorizer=globus_sdk.NullAuthorizer(), do_version_check=False
+    )
+    ComputeManager(transport=transport).use_transport(compute_client)
+    for sdk_client in (
+        compute_client._compute_web_client.v2,
+        compute_client._compute_web_client.v3,
+    ):
+        assert sdk_client.transport is transport
+        # The shared transport is not closed along with the compute client
+        assert transport not in sdk_client._resources_to_close
+
+
+def test_compute_client_transport_without_sdk_internals(monkeypatch):
+    transport = PooledTransport()
+    manager = ComputeManager(transport=transport)
+    mock_log = Mock()
+    monkeypatch.setattr(compute_manager, "log", mock_log)
+    # Compute clients without the expected internals keep their default transport
+    manager.use_transport(object())
+    assert mock_log.warning.call_count == 1
+
+    compute_client = Client(
+        authorizer=globus_sdk.NullAuthorizer(), do_version_check=False
+    )
+    sdk_client = compute_client._compute_web_client.v3
+    del sdk_client._resources_to_close
+    manager.use_transport(compute_client)
+    assert sdk_client.transport is transport
@@ -1,21 +1,91 @@
 from __future__ import annotations
 
+import collections
+import hashlib
 import logging
+import threading
+import traceback
 
-from globus_compute_sdk import serialize
+from globus_compute_sdk.serialize import ComputeSerializer
 
 log = logging.getLogger(__name__)
 
 automate_response_keys = {"action_id", "status", "state_name"}
 compute_response_keys = {"result", "status", "exception", "task_id"}
-import traceback
+funcx_response_keys = compute_response_keys
 
-from globus_compute_sdk.serialize import ComputeSerializer
+#: The number of formatted exceptions kept by ``deserialize_exception()``
+EXCEPTION_CACHE_SIZE = 256
 
-log = logging.getLogger(__name__)
+_serializer = None
+_exception_cache: collections.OrderedDict = collections.OrderedDict()
+_exception_cache_lock = threading.Lock()
 
-automate_response_keys = {"action_id", "status", "state_name"}
-funcx_response_keys = {"result", "status", "exception", "task_id"}
+
+class FormattedException(str):
+    """
+    A compute exception from run output, formatted as a traceback. This is a plain string,
+    marked so that output which was already prepared is not deserialized again.
+    """
+
+
+class ComputeDetails(dict):
+    """
+    The details of a compute state response, where a serialized exception is only
+    deserialized and formatted as a traceback when it is first read. Reading the details
+    in any way formats the exception first, including copying them or serializing them
+    as JSON, so they can be used anywhere a plain dict can.
+    """
+
+    def _format(self):
+        exception = dict.get(self, "exception")
+        if isinstance(exception, str) and not isinstance(exception, FormattedException):
+            dict.__setitem__(self, "exception", deserialize_exception(exception))
+
+    def __getitem__(self, key):
+        if key == "exception":
+            self._format()
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        if key == "exception":
+            self._format()
+        return super().get(key, default)
+
+    def pop(self, key, *args):
+        if key == "exception":
+            self._format()
+        return super().pop(key, *args)
+
+    def __iter__(self):
+        # Not the builtin dict iterator, so dict(), update() and ** read values with
+        # __getitem__ instead of directly
+        return super().__iter__()
+
+    def items(self):
+        self._format()
+        return super().items()
+
+    def values(self):
+        self._format()
+        return super().values()
+
+    def copy(self):
+        self._format()
+        return dict(super().items())
+
+    def __eq__(self, other):
+        self._format()
+        return super().__eq__(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        self._format()
+        return super().__repr__()
+
+    def __reduce__(self):
+        return dict, (self.copy(),)
 
 
 def is_automate_response(state_output):
@@ -31,29 +101,69 @@ def is_compute_response(state_output):
 
 
 def get_details(response, state_name=None):
-    if state_name and is_automate_response(
-        response["details"]["output"].get(state_name)
-    ):
-        return response["details"]["output"][state_name]
-
-    if is_compute_response(response["details"]["output"].get(state_name)):
-        resp = response["details"]["output"][state_name]
-        if resp.get("exception"):
-            resp["exception"] = deserialize_exception(resp["exception"])
-        return resp
-
-    for flow_state, data in response["details"]["output"].items():
-        # Reject any output that isn't structured as a response
-        if not is_compute_response(data):
-            continue
-        if isinstance(data["details"], dict) and data["details"].get("exception"):
-            exc = deserialize_exception(data["details"]["exception"])
-            data["details"]["exception"] = exc
+    """
+    Prepare compute state output in a run response, so any exceptions can be read as
+    tracebacks. Exceptions are only deserialized once they are read, and are formatted as
+    plain strings, so the response can still be serialized as JSON.
+
+    :param response: A run status response
+    :param state_name: Only prepare, and return the output for, this state
+    :returns: The output for ``state_name`` if it is a state response, otherwise the
+        full run response
+    """
+    output = response["details"]["output"]
+    if state_name and is_automate_response(output.get(state_name)):
+        return format_exception(output[state_name])
+
+    for data in output.values():
+        format_exception(data)
     return response
 
 
+def format_exception(state_output):
+    """
+    Prepare compute state output so a serialized exception is replaced by its formatted
+    traceback when it is read. Output of any other kind is left unchanged.
+
+    :returns: The state output
+    """
+    # Reject any output that isn't structured as a response
+    if not is_compute_response(state_output):
+        return state_output
+    details = state_output["details"]
+    if isinstance(details, dict) and not isinstance(details, ComputeDetails):
+        state_output["details"] = ComputeDetails(details)
+    return state_output
+
+
+def get_serializer() -> ComputeSerializer:
+    """
+    :returns: A ComputeSerializer shared by all exception deserialization
+    """
+    global _serializer
+    if _serializer is None:
+        _serializer = ComputeSerializer()
+    return _serializer
+
+
 def deserialize_exception(encoded_exc):
+    """
+    Format a serialized compute exception as a traceback. Results are remembered by the
+    hash of the encoded exception, so the same exception is only deserialized once.
+    """
+    key = hashlib.sha256(str(encoded_exc).encode()).hexdigest()
+    with _exception_cache_lock:
+        if key in _exception_cache:
+            _exception_cache.move_to_end(key)
+            return _exception_cache[key]
+
     try:
-        ComputeSerializer().deserialize(encoded_exc).reraise()
+        get_serializer().deserialize(encoded_exc).reraise()
     except Exception:
-        return traceback.format_exc()
+        formatted = FormattedException(traceback.format_exc())
+
+    with _exception_cache_lock:
+        _exception_cache[key] = formatted
+        while len(_exception_cache) > EXCEPTION_CACHE_SIZE:
+            _exception_cache.popitem(last=False)
+    return formatted
@@ -0,0 +1,235 @@
+import copy
+import json
+import hashlib
+import typing as t
+
+# Fields which document a flow, but do not change how it runs
+NON_EXECUTABLE_DEFINITION_FIELDS = ("Comment",)
+# Flow kwargs which only describe a flow, and the values which clear them
+FLOW_METADATA_DEFAULTS = {"subtitle": "", "description": "", "keywords": []}
+NON_EXECUTABLE_FLOW_KWARGS = tuple(FLOW_METADATA_DEFAULTS)
+
+
+class FlowChecksumTree:
+    """
+    A hash tree of a flow, with a digest for each state in the flow definition, and
+    separate digests for the rest of the definition, the flow schema, and flow kwargs. The
+    root digest covers all of them, and changes if any part of the flow changes.
+
+    State digests are cached along with a copy of each state, so re-checking a flow only
+    hashes states which no longer equal the state last hashed under the same name. States
+    may be replaced or modified in place.
+
+    .. code-block:: python
+
+        tree = FlowChecksumTree()
+        tree.update(flow_definition, flow_schema, flow_kwargs)
+        stored = tree.as_dict()
+        ...
+        tree.update(new_flow_definition, flow_schema, flow_kwargs)
+        tree.diff(stored)  # ["MyChangedState"]
+        tree.changed_parts(stored)  # ["schema"]
+    """
+
+    def __init__(self):
+        self.states: t.Dict[str, str] = dict()
+        self.definition: t.Optional[str] = None
+        self.schema: t.Optional[str] = None
+        self.kwargs: t.Optional[str] = None
+        self.root: t.Optional[str] = None
+        # A copy of each state by name, along with its digest
+        self._state_cache: t.Dict[str, t.Tuple[t.Any, str]] = dict()
+
+    @staticmethod
+    def digest(value: t.Any) -> str:
+        return hashlib.sha256(json.dumps(value, sort_keys=True).encode()).hexdigest()
+
+    def digest_state(self, state: dict) -> str:
+        return self.digest(state)
+
+    def digest_definition(self, flow_definition: dict) -> str:
+        """Digest everything in the flow definition except its states"""
+        return self.digest(flow_definition)
+
+    def digest_kwargs(self, flow_kwargs: dict) -> str:
+        return self.digest(flow_kwargs)
+
+    def update(
+        self, flow_definition: dict, flow_schema: dict, flow_kwargs: dict = None
+    ) -> str:
+        """
+        Re-hash the flow, reusing digests for any states which are unchanged.
+
+        :returns: The root digest for the flow
+        """
+        states = dict()
+        if isinstance(flow_definition, dict) and isinstance(
+            flow_definition.get("States"), dict
+        ):
+            states = flow_definition["States"]
+            flow_definition = {
+                k: v for k, v in flow_definition.items() if k != "States"
+            }
+
+        cache = dict()
+        for name, state in states.items():
+            cached = self._state_cache.get(name)
+            if cached is None or cached[0] != state:
+                cached = (copy.deepcopy(state), self.digest_state(state))
+            cache[name] = cached
+            self.states[name] = cached[1]
+        for name in set(self.states) - set(states):
+            del self.states[name]
+        self._state_cache = cache
+
+        self.definition = self.digest_definition(flow_definition)
+        self.schema = self.digest(flow_schema)
+        self.kwargs = self.digest_kwargs(flow_kwargs or dict())
+        self.root = self.digest(self.as_dict())
+        return self.root
+
+    def as_dict(self) -> dict:
+        """
+        :returns: All digests in the tree, in a form which can be stored and later passed
+            to ``diff()``
+        """
+        return {
+            "definition": self.definition,
+            "schema": self.schema,
+            "kwargs": self.kwargs,
+            "states": dict(self.states),
+        }
+
+    def diff(self, other: dict) -> t.List[str]:
+        """
+        Compare flow states against a previous version of the tree from ``as_dict()``.
+
+        :returns: A sorted list of states which were added, removed, or changed
+        """
+        other_states = other.get("states", {})
+        return sorted(
+            name
+            for name in set(self.states) | set(other_states)
+            if self.states.get(name) != other_states.get(name)
+        )
+
+    def changed_parts(self, other: dict) -> t.List[str]:
+        """
+        Compare everything other than flow states against a previous version of the tree.
+
+        :returns: Any of "definition", "schema", or "kwargs" which changed
+        """
+        return [
+            part
+            for part in ("definition", "schema", "kwargs")
+            if getattr(self, part) != other.get(part)
+        ]
+
+
+def _without(value: t.Any, fields: t.Iterable[str]) -> t.Any:
+    if not isinstance(value, dict):
+        return value
+    return {k: v for k, v in value.items() if k not in fields}
+
+
+def _without_rule_fields(rule: t.Any, fields: t.Iterable[str]) -> t.Any:
+    """Remove fields from a Choice rule, and any rules nested in And, Or, or Not"""
+    rule = _without(rule, fields)
+    if not isinstance(rule, dict):
+        return rule
+    for operator in ("And", "Or"):
+        if isinstance(rule.get(operator), list):
+            rule[operator] = [_without_rule_fields(r, fields) for r in rule[operator]]
+    if "Not" in rule:
+        rule["Not"] = _without_rule_fields(rule["Not"], fields)
+    return rule
+
+
+class SemanticFlowChecksumTree(FlowChecksumTree):
+    """
+    A :class:`FlowChecksumTree` which only tracks changes to how a flow runs. Comments on
+    the flow, its states, and Choice rules (including rules nested in ``And``, ``Or``, and
+    ``Not``) are ignored, along with flow kwargs which only describe the flow, such as its
+    description and keywords. Changes to those kwargs are still published by
+    ``FlowsManager.register_flow()``, without sending the flow definition again.
+    """
+
+    def digest_state(self, state):
+        state = _without(state, NON_EXECUTABLE_DEFINITION_FIELDS)
+        if isinstance(state, dict) and isinstance(state.get("Choices"), list):
+            state["Choices"] = [
+                _without_rule_fields(choice, NON_EXECUTABLE_DEFINITION_FIELDS)
+                for choice in state["Choices"]
+            ]
+        return self.digest(state)
+
+    def digest_definition(self, flow_definition):
+        return self.digest(_without(flow_definition, NON_EXECUTABLE_DEFINITION_FIELDS))
+
+    def digest_kwargs(self, flow_kwargs):
+        return self.digest(_without(flow_kwargs, NON_EXECUTABLE_FLOW_KWARGS))
+
+
+class FlowDiff:
+    """
+    Changes between a deployed flow and the current flow. Changes to how the flow runs are
+    tracked separately from changes which only affect non-executable fields, such as
+    comments.
+
+    :param changed_states: States with behavioral changes
+    :param changed_parts: Other parts of the flow with behavioral changes, any of
+        "definition", "schema", or "kwargs"
+    :param ignored_states: States with only non-executable changes
+    :param ignored_parts: Other parts of the flow with only non-executable changes
+    """
+
+    def __init__(
+        self,
+        changed_states: t.Iterable[str] = (),
+        changed_parts: t.Iterable[str] = (),
+        ignored_states: t.Iterable[str] = (),
+        ignored_parts: t.Iterable[str] = (),
+    ):
+        self.changed_states = list(changed_states)
+        self.changed_parts = list(changed_parts)
+        self.ignored_states = list(ignored_states)
+        self.ignored_parts = list(ignored_parts)
+
+    @classmethod
+    def from_trees(
+        cls,
+        tree: FlowChecksumTree,
+        stored_tree: t.Optional[dict],
+        semantic_tree: SemanticFlowChecksumTree,
+        stored_semantic_tree: dict,
+    ) -> "FlowDiff":
+        """
+        Compare current checksum trees against the stored trees for a deployed flow.
+        """
+        changed_states = semantic_tree.diff(stored_semantic_tree)
+        changed_parts = semantic_tree.changed_parts(stored_semantic_tree)
+        ignored_states, ignored_parts = [], []
+        if stored_tree:
+            ignored_states = [
+                s for s in tree.diff(stored_tree) if s not in changed_states
+            ]
+            ignored_parts = [
+                p for p in tree.changed_parts(stored_tree) if p not in changed_parts
+            ]
+        return cls(changed_states, changed_parts, ignored_states, ignored_parts)
+
+    @property
+    def changed(self) -> bool:
+        """True if the flow runs differently than the deployed flow"""
+        return bool(self.changed_states or self.changed_parts)
+
+    def as_dict(self) -> dict:
+        return {
+            "changed_states": self.changed_states,
+            "changed_parts": self.changed_parts,
+            "ignored_states": self.ignored_states,
+            "ignored_parts": self.ignored_parts,
+        }
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.as_dict()}>"
@@ -0,0 +1,155 @@
+import json
+import random
+import logging
+import typing as t
+
+log = logging.getLogger(__name__)
+
+# States which finish almost immediately, and are not worth waiting on
+FAST_STATE_TYPES = ("Pass", "Choice", "ExpressionEval", "Succeed", "Fail")
+
+
+def get_active_state(status: dict) -> t.Optional[str]:
+    """
+    Get the name of the state a run is currently in, from a run status response.
+
+    :returns: The state name, or None if the run is not in a state
+    """
+    details = status.get("details") or {}
+    inner = details.get("details") if isinstance(details.get("details"), dict) else {}
+    return inner.get("state_name") or details.get("state_name")
+
+
+class RunTimer:
+    """
+    Track which state a run is in, when it entered that state, and how many times it has
+    been checked since.
+    """
+
+    def __init__(self):
+        self.state: t.Optional[str] = None
+        self.state_started: t.Optional[float] = None
+        self.unchanged_checks = 0
+
+    def update(self, status: dict, now: float) -> t.Optional[t.Tuple[str, float]]:
+        """
+        Update the timer with the latest status of the run.
+
+        :param status: A run status response
+        :param now: The current time, from ``time.monotonic()``
+        :returns: A tuple of (state_name, seconds) if the run just left a state
+        """
+        state = get_active_state(status)
+        if state == self.state and self.state_started is not None:
+            self.unchanged_checks += 1
+            return None
+        finished = None
+        if self.state is not None:
+            finished = self.state, now - self.state_started
+        self.state, self.state_started, self.unchanged_checks = state, now, 0
+        return finished
+
+
+class PollingSchedule:
+    """
+    Decide how long to wait between status checks of a run, based on the state the run is
+    in. Checks start at ``min_interval`` and back off exponentially while the run stays in
+    the same state, capped by ``max_interval``. The state definition can lower or raise
+    that:
+
+    * Wait states are first checked once their ``Seconds`` have elapsed
+    * Action states are capped at a tenth of their ``WaitTime``
+    * States which finish quickly, such as Pass and ExpressionEval, use ``min_interval``
+
+    Durations observed for each state are kept as a moving average. Once a state has been
+    seen finishing before, the first check is made around when it is next expected to
+    finish. A random jitter is added to each interval, so many runs started together do
+    not all poll at the same moment.
+
+    :param flow_definition: The deployed flow definition
+    :param durations: Previously observed durations in seconds, by state name
+    :param min_interval: The shortest time to wait between checks
+    :param max_interval: The longest time to wait between checks
+    :param backoff: The factor the interval grows by each time the run is unchanged
+    :param jitter: The fraction an interval may randomly vary by
+    """
+
+    #: The weight given to the newest observation in the moving average of durations
+    smoothing = 0.3
+
+    def __init__(
+        self,
+        flow_definition: t.Optional[dict] = None,
+        durations: t.Optional[t.Mapping[str, float]] = None,
+        min_interval: float = 1.0,
+        max_interval: float = 300.0,
+        backoff: float = 2.0,
+        jitter: float = 0.1,
+    ):
+        states = (flow_definition or {}).get("States")
+        self.states: t.Dict[str, dict] = states if isinstance(states, dict) else {}
+        self.durations: t.Dict[str, float] = dict(durations or {})
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.jitter = jitter
+        self.changed = False
+
+    def record(self, state: str, duration: float) -> None:
+        """Record the observed duration of a state"""
+        previous = self.durations.get(state)
+        if previous is not None:
+            duration = previous + self.smoothing * (duration - previous)
+        self.durations[state] = duration
+        self.changed = True
+
+    def get_cap(self, state: t.Optional[str]) -> float:
+        """
+        :returns: The longest time to wait between checks of a run in ``state``
+        """
+        definition = self.states.get(state) or {}
+        if definition.get("Type") in FAST_STATE_TYPES:
+            return self.min_interval
+        wait_time = definition.get("WaitTime")
+        if isinstance(wait_time, (int, float)) and wait_time > 0:
+            return min(self.max_interval, max(self.min_interval, wait_time / 10))
+        return self.max_interval
+
+    def get_interval(self, timer: RunTimer, now: float) -> float:
+        """
+        :param timer: The timer for the run which was just checked
+        :param now: The current time, from ``time.monotonic()``
+        :returns: Seconds to wait before checking the run again
+        """
+        definition = self.states.get(timer.state) or {}
+        elapsed = now - timer.state_started if timer.state_started is not None else 0
+        expected = self.durations.get(timer.state)
+        wait_seconds = None
+        if definition.get("Type") == "Wait" and "Seconds" in definition:
+            wait_seconds = definition["Seconds"] - elapsed
+
+        if wait_seconds is not None and wait_seconds > self.min_interval:
+            interval = wait_seconds
+        elif expected is not None and expected - elapsed > self.min_interval:
+            interval = min(expected - elapsed, self.max_interval)
+        else:
+            interval = self.min_interval * self.backoff**timer.unchanged_checks
+            interval = min(interval, self.get_cap(timer.state))
+        return interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def dumps(self) -> str:
+        """
+        :returns: Observed state durations as a JSON string
+        """
+        return json.dumps(self.durations, sort_keys=True)
+
+    @staticmethod
+    def loads(value: t.Optional[str]) -> t.Dict[str, float]:
+        """
+        :returns: State durations from a JSON string produced by ``dumps()``
+        """
+        try:
+            return json.loads(value) if value else {}
+        except ValueError:
+            log.warning("Ignoring malformed state durations in storage")
+            return {}
@@ -0,0 +1,112 @@
+import logging
+import threading
+import typing as t
+
+import requests.adapters
+import urllib3
+from globus_sdk.transport import RequestsTransport
+
+log = logging.getLogger(__name__)
+
+
+class TransportStats:
+    """
+    Counts of requests sent and connections opened by a :class:`PooledTransport`. Each
+    request which did not need a new connection reused one from the pool.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+
+    def add(self, requests: int = 0, connections: int = 0) -> None:
+        with self._lock:
+            self.requests += requests
+            self.connections += connections
+
+    @property
+    def reused(self) -> int:
+        return max(self.requests - self.connections, 0)
+
+    def as_dict(self) -> t.Dict[str, int]:
+        return {
+            "requests": self.requests,
+            "connections": self.connections,
+            "reused": self.reused,
+        }
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.as_dict()}>"
+
+
+class _CountingConnectionMixin:
+    stats: TransportStats
+
+    def connect(self):
+        self.stats.add(connections=1)
+        return super().connect()
+
+
+class _CountingPoolMixin:
+    stats: TransportStats
+
+    def _make_request(self, *args, **kwargs):
+        self.stats.add(requests=1)
+        return super()._make_request(*args, **kwargs)
+
+
+class PooledTransport(RequestsTransport):
+    """
+    A Globus SDK transport which can be shared by every service client, so connections
+    to Globus services are pooled and reused instead of each client making its own. Use
+    ``stats`` to see how often connections were reused.
+
+    .. code-block:: python
+
+        transport = PooledTransport(pool_size=20)
+        flows_client = globus_sdk.FlowsClient(authorizer=authorizer, transport=transport)
+
+    :param pool_size: The number of connections kept open to each host. This should be
+        at least the number of requests made at once, such as with ``run_flows()``.
+    :param keep_alive: Keep connections open between requests. If False, a new
+        connection is made for every request.
+    :param kwargs: Options for ``globus_sdk.transport.RequestsTransport``
+    """
+
+    def __init__(self, pool_size: int = 10, keep_alive: bool = True, **kwargs):
+        super().__init__(**kwargs)
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.stats = TransportStats()
+
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size
+        )
+        adapter.poolmanager.pool_classes_by_scheme = {
+            "http": self._get_pool_class(urllib3.HTTPConnectionPool),
+            "https": self._get_pool_class(urllib3.HTTPSConnectionPool),
+        }
+        for prefix in ("https://", "http://"):
+            self.session.mount(prefix, adapter)
+        if not keep_alive:
+            self.headers["Connection"] = "close"
+
+    def _get_pool_class(self, pool_cls: type) -> type:
+        """Subclass a connection pool, so its requests and connections are counted"""
+        connection_cls = type(
+            f"Counting{pool_cls.ConnectionCls.__name__}",
+            (_CountingConnectionMixin, pool_cls.ConnectionCls),
+            {"stats": self.stats},
+        )
+        return type(
+            f"Counting{pool_cls.__name__}",
+            (_CountingPoolMixin, pool_cls),
+            {"stats": self.stats, "ConnectionCls": connection_cls},
+        )
+
+    def __repr__(self):
+        return (
+            f"<{self.__class__.__name__} pool_size={self.pool_size} "
+            f"keep_alive={self.keep_alive} {self.stats.as_dict()}>"
+        )